@@ -53,6 +53,14 @@ def make_celery(app=None):
             "task": "app.modules.saving_plan.tasks.check_overdue_savings_plans",
             "schedule": crontab(hour=0, minute=0),  # Run daily at midnight
         },
+        "process-dirty-budgets": {
+            "task": "process_dirty_budgets",
+            "schedule": crontab(minute="*/1"),  # Picks up anything a drain missed
+        },
+        "cleanup-report-jobs": {
+            "task": "cleanup_report_jobs",
+            "schedule": crontab(minute=0),  # Hourly
+        },
         "send-savings-reminders": {
             "task": "app.modules.saving_plan.tasks.check_savings_progress",
             "schedule": crontab(hour=22, minute=0),  # Run daily at 10 PM
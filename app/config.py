@@ -26,3 +26,10 @@ class Config:
     OTP_LENGTH = os.getenv("OTP_LENGTH")
     TOKEN_VALIDITY_SECONDS = os.getenv("TOKEN_VALIDITY_SECONDS")
     RATE_LIMIT_MESSAGE = os.getenv("RATE_LIMIT_MESSAGE")
+    # Gzip JSON responses at least this many bytes long; 0 disables compression
+    RESPONSE_COMPRESSION_MIN_SIZE = int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE", 0))
+    # Where rendered report artifacts are kept; the backend is a dotted class path
+    REPORT_STORAGE_BACKEND = os.getenv(
+        "REPORT_STORAGE_BACKEND", "app.core.storage.LocalReportStorage"
+    )
+    REPORT_STORAGE_DIR = os.getenv("REPORT_STORAGE_DIR")
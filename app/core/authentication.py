@@ -1,8 +1,12 @@
+import uuid
 from functools import wraps
 from flask import request, g
 from flask_jwt_extended import jwt_required, get_jwt
 from app.extensions import db
 from app.modules.auth.models import ActiveAccessToken
+from app.modules.user.models import User
+from app.core.tokens import AccessTokenCache
+from app.core.lookups import get_cached, cache_instance
 from .logger import logger
 
 
@@ -12,17 +16,27 @@ def authenticated_user(f):
     def decorated(*args, **kwargs):
         auth_header = request.headers.get("Authorization", "")
         token = auth_header.split(" ")[1]
-        token_record = ActiveAccessToken.query.filter_by(token=token).first()
+        claims = get_jwt()
+        jti = claims.get("jti")
+
+        # Served from the token cache when possible, otherwise from the database
+        user_id = AccessTokenCache.get_user_id(jti)
+        if user_id:
+            user = get_cached(User, uuid.UUID(user_id))
+        else:
+            token_record = ActiveAccessToken.query.filter_by(token=token).first()
 
-        if not token_record:
-            logger.warning(f"Invalid or revoked token: {token[:10]}...")
-            return {"error": "Invalid or revoked token!"}, 401
+            if not token_record:
+                logger.warning(f"Invalid or revoked token: {token[:10]}...")
+                return {"error": "Invalid or revoked token!"}, 401
+
+            user = cache_instance(token_record.user)
+            if user:
+                AccessTokenCache.set(jti, user.id, claims.get("exp"))
 
-        user = token_record.user
         if not user:
             logger.warning(f"User not found")
             return {"error": "User not found!"}, 401
-        claims = get_jwt()
         role_value = claims.get("role")
         g.role = role_value
         g.current_user = user
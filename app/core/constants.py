@@ -2,6 +2,25 @@ from enum import Enum
 
 REDIS_VALID_TTL = 300  # 5 minutes
 REDIS_RATE_LIMIT_TTL = 600  # 10 minutes
+ACCESS_TOKEN_CACHE_TTL = 300  # 5 minutes
+ACCESS_TOKEN_LOCAL_CACHE_TTL = 5  # seconds
+ACCESS_TOKEN_LOCAL_CACHE_SIZE = 1024
+PERMISSION_CACHE_TTL = 300  # 5 minutes
+REPORT_EXPORT_CHUNK_SIZE = 1000
+REPORT_PDF_TABLE_ROWS = 40  # roughly one letter page
+REPORT_CACHE_TTL = 300  # 5 minutes
+REPORT_JOB_REUSE_TTL = 86400  # completed artifacts are shared for a day
+REPORT_JOB_TIMEOUT = 1800  # pending/running jobs older than this are failed
+RECURRING_TRANSACTION_BATCH_SIZE = 500
+TRANSACTION_IMPORT_BATCH_SIZE = 1000
+TRANSACTION_IMPORT_MAX_ERRORS = 100
+RESPONSE_GZIP_LEVEL = 6
+SAVING_PLAN_SWEEP_BATCH_SIZE = 1000
+SENDGRID_MAX_PERSONALIZATIONS = 1000  # SendGrid v3 limit per request
+SENDGRID_POOL_SIZE = 10
+SENDGRID_TIMEOUT = 10  # seconds
+SENDGRID_BATCH_RETRIES = 3  # batch task retries after transport errors
+SENDGRID_RETRY_BACKOFF = 60  # seconds, doubled on every retry
 MIN_NAME_LENGTH = 2
 MAX_NAME_LENGTH = 100
 MIN_USERNAME_LENGTH = 4
@@ -16,6 +35,10 @@ BUDGET_WARNING_THRESHOLD = 80
 BUDGET_EXCEEDED_THRESHOLD = 100
 BUDGET_EXCEEDED_KEYWORD = "exceeded"
 BUDGET_WARNING_KEYWORD = "warning"
+BUDGET_BULK_MAX_ITEMS = 100
+BUDGET_THRESHOLD_BATCH_SIZE = 500
+BUDGET_THRESHOLD_COALESCE_SECONDS = 5
+BUDGET_THRESHOLD_LEASE_SECONDS = 300  # unfinished drain batches are requeued after this
 MIN_YEAR = 1900
 MAX_YEAR = 2100
 
@@ -38,6 +61,13 @@ class SavingPlanStatus(Enum):
     PAUSED = "PAUSED"
 
 
+class ReportJobStatus(Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
 class Frequency(Enum):
     DAILY = "DAILY"
     WEEKLY = "WEEKLY"
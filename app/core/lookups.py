@@ -0,0 +1,41 @@
+from flask import g, has_app_context
+
+# Marks ids already looked up and not found, so misses are not queried twice
+_MISSING = object()
+
+
+def _lookup_cache():
+    """Per-request (or per-task) cache stored on flask.g"""
+    if "lookup_cache" not in g:
+        g.lookup_cache = {}
+    return g.lookup_cache
+
+
+def _cache_key(model, instance_id):
+    return (model.__name__, str(instance_id))
+
+
+def get_cached(model, instance_id):
+    """
+    Return the model instance with the given id, querying the database at most
+    once per request. Returns None if it does not exist.
+    """
+    if not instance_id:
+        return None
+    if not has_app_context():
+        return model.query.get(instance_id)
+
+    cache = _lookup_cache()
+    key = _cache_key(model, instance_id)
+    instance = cache.get(key)
+    if instance is None:
+        instance = model.query.get(instance_id)
+        cache[key] = instance if instance is not None else _MISSING
+    return None if instance is _MISSING else instance
+
+
+def cache_instance(instance):
+    """Remember an instance loaded elsewhere so later lookups reuse it"""
+    if instance is not None and has_app_context():
+        _lookup_cache()[_cache_key(type(instance), instance.id)] = instance
+    return instance
@@ -100,17 +100,121 @@
 from app.core.logger import logger
 import os
 import base64
+import threading
 from typing import Dict, Any, Optional, List, Tuple
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import (
-    Mail,
-    Attachment,
-    FileContent,
-    FileName,
-    FileType,
-    Disposition,
+import requests
+from requests.adapters import HTTPAdapter
+from app.core.constants import (
+    SENDGRID_MAX_PERSONALIZATIONS,
+    SENDGRID_POOL_SIZE,
+    SENDGRID_RETRY_BACKOFF,
+    SENDGRID_TIMEOUT,
 )
-from python_http_client.exceptions import BadRequestsError
+from app.core.representations import dumps
+
+SENDGRID_API_HOST = os.environ.get("SENDGRID_API_HOST", "https://api.sendgrid.com")
+
+
+class MailDeliveryError(Exception):
+    """SendGrid rejected or could not be reached for a mail request"""
+
+    def __init__(self, message, status_code=None, body=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+
+    @property
+    def rejected(self):
+        """SendGrid answered and refused the request; timeouts and connection
+        errors leave it unknown whether the mail went out"""
+        return self.status_code is not None
+
+
+class MailDispatcher:
+    """
+    Sends SendGrid v3 mail requests over one pooled HTTP session per process.
+    Template messages are grouped per template into requests of up to
+    SENDGRID_MAX_PERSONALIZATIONS recipients; messages with attachments are
+    sent on their own because attachments apply to the whole request.
+    SENDGRID_API_HOST can point the dispatcher at a local fake server.
+    """
+
+    _session = None
+    _session_pid = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def session(cls):
+        # Celery forks workers; each process needs its own connection pool
+        with cls._lock:
+            if cls._session is None or cls._session_pid != os.getpid():
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=SENDGRID_POOL_SIZE
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update(
+                    {
+                        "Authorization": f"Bearer {os.environ.get('SENDGRID_API_KEY')}",
+                        "Content-Type": "application/json",
+                    }
+                )
+                cls._session = session
+                cls._session_pid = os.getpid()
+            return cls._session
+
+    @classmethod
+    def post(cls, payload):
+        """POST one mail request, raising MailDeliveryError unless it is accepted"""
+        try:
+            response = cls.session().post(
+                f"{SENDGRID_API_HOST}/v3/mail/send",
+                data=dumps(payload),
+                timeout=SENDGRID_TIMEOUT,
+            )
+        except requests.RequestException as e:
+            raise MailDeliveryError(f"SendGrid request failed: {str(e)}")
+
+        if response.status_code >= 300:
+            raise MailDeliveryError(
+                f"SendGrid returned {response.status_code}",
+                status_code=response.status_code,
+                body=response.text,
+            )
+        return response
+
+    @staticmethod
+    def personalization(to_email, subject, template_data=None):
+        # Dynamic templates read the subject from the template data
+        template_data = dict(template_data or {})
+        template_data["subject"] = subject
+        return {"to": [{"email": to_email}], "dynamic_template_data": template_data}
+
+    @staticmethod
+    def payload(template_id, personalizations, attachments=None):
+        from_email = os.environ.get("FROM_EMAIL")
+        if not from_email:
+            raise ValueError("FROM_EMAIL environment variable not set")
+
+        payload = {
+            "from": {"email": from_email},
+            "template_id": template_id,
+            "personalizations": personalizations,
+        }
+        if attachments:
+            payload["attachments"] = [
+                {
+                    "content": base64.b64encode(
+                        content.encode() if isinstance(content, str) else content
+                    ).decode(),
+                    "type": mime_type,
+                    "filename": filename,
+                    "disposition": "attachment",
+                }
+                for filename, mime_type, content in attachments
+            ]
+        return payload
 
 
 def send_email(
@@ -137,56 +241,29 @@ def send_email(
 
     Raises:
         ValueError: If required parameters are missing
-        BadRequestsError: If SendGrid API rejects the request
+        MailDeliveryError: If SendGrid rejects the request
     """
     if not to_email:
         raise ValueError("Recipient email is required")
 
     try:
-        from_email = os.environ.get("FROM_EMAIL")
-        if not from_email:
-            raise ValueError("FROM_EMAIL environment variable not set")
-
-        message = Mail(from_email=from_email, to_emails=to_email)
-
-        # Handle dynamic template case
-        if template_id:
-            if not template_data:
-                template_data = {}
-            # Ensure subject is in template_data for dynamic templates
-            template_data["subject"] = subject
-            message.template_id = template_id
-            message.dynamic_template_data = template_data
-            logger.debug(
-                f"Sending dynamic template email: template_id={template_id}, data={template_data}"
-            )
-        # Handle plain text case
-        else:
+        if not template_id:
             raise ValueError("Either template_id or body must be provided")
 
-        # Add attachments if provided
-        if attachments:
-            for filename, mime_type, content in attachments:
-                encoded_file = base64.b64encode(
-                    content.encode() if isinstance(content, str) else content
-                ).decode()
-
-                attachment = Attachment(
-                    file_content=FileContent(encoded_file),
-                    file_type=FileType(mime_type),
-                    file_name=FileName(filename),
-                    disposition=Disposition("attachment"),
-                )
-                message.add_attachment(attachment)
-
-        # Send email
-        sg = SendGridAPIClient(os.environ.get("SENDGRID_API_KEY"))
-        response = sg.send(message)
+        payload = MailDispatcher.payload(
+            template_id,
+            [MailDispatcher.personalization(to_email, subject, template_data)],
+            attachments,
+        )
+        logger.debug(
+            f"Sending dynamic template email: template_id={template_id}, data={template_data}"
+        )
+        response = MailDispatcher.post(payload)
 
         logger.info(f"Email sent to {to_email} with status {response.status_code}")
         return True
 
-    except BadRequestsError as e:
+    except MailDeliveryError as e:
         logger.error(
             f"SendGrid API error sending email to {to_email}: {str(e)} - Response: {e.body}"
         )
@@ -194,3 +271,84 @@ def send_email(
     except Exception as e:
         logger.error(f"Failed to send email to {to_email}: {str(e)}")
         raise
+
+
+def retry_countdown(retries: int) -> int:
+    """Seconds to wait before retrying a mail batch for the given attempt"""
+    return SENDGRID_RETRY_BACKOFF * 2**retries
+
+
+def send_emails(messages: List[Dict[str, Any]]) -> Tuple[List[int], List[int]]:
+    """
+    Send many emails with as few SendGrid requests as possible.
+
+    Args:
+        messages: send_email keyword arguments, one dict per email
+
+    Returns:
+        Tuple[List[int], List[int]]: Positions of the messages SendGrid
+        rejected or that are invalid, which callers retry individually, and
+        positions of the messages deferred by a timeout or connection error,
+        which callers retry as a batch after a backoff. Once SendGrid cannot
+        be reached the remaining requests are deferred without being sent.
+
+    A timeout can hit a request SendGrid already accepted, so retrying a
+    deferred batch may deliver up to SENDGRID_MAX_PERSONALIZATIONS emails
+    twice. Notifications are preferred duplicated over lost.
+    """
+    failed = []
+    deferred = []
+    by_template = {}
+    for index, message in enumerate(messages):
+        if not message.get("to_email") or not message.get("template_id"):
+            logger.error(f"Skipping email without recipient or template: {message}")
+            failed.append(index)
+        elif message.get("attachments"):
+            if deferred:
+                deferred.append(index)
+                continue
+            try:
+                send_email(**message)
+            except MailDeliveryError as e:
+                (failed if e.rejected else deferred).append(index)
+            except Exception:
+                failed.append(index)
+        else:
+            by_template.setdefault(message["template_id"], []).append(index)
+
+    requests_sent = 0
+    for template_id, indexes in by_template.items():
+        for start in range(0, len(indexes), SENDGRID_MAX_PERSONALIZATIONS):
+            chunk = indexes[start : start + SENDGRID_MAX_PERSONALIZATIONS]
+            if deferred:
+                deferred.extend(chunk)
+                continue
+            personalizations = [
+                MailDispatcher.personalization(
+                    messages[index]["to_email"],
+                    messages[index].get("subject"),
+                    messages[index].get("template_data"),
+                )
+                for index in chunk
+            ]
+            try:
+                MailDispatcher.post(
+                    MailDispatcher.payload(template_id, personalizations)
+                )
+                requests_sent += 1
+            except MailDeliveryError as e:
+                # SendGrid accepts or rejects a request as a whole
+                logger.error(
+                    f"Failed to send {len(chunk)} emails with template {template_id}: {str(e)}"
+                )
+                (failed if e.rejected else deferred).extend(chunk)
+            except Exception as e:
+                logger.error(
+                    f"Failed to send {len(chunk)} emails with template {template_id}: {str(e)}"
+                )
+                failed.extend(chunk)
+
+    logger.info(
+        f"Sent {len(messages) - len(failed) - len(deferred)} of {len(messages)} emails in {requests_sent} batched requests, deferred {len(deferred)}"
+    )
+    return sorted(failed), sorted(deferred)
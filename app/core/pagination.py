@@ -94,8 +94,21 @@
 
 #     # Return formatted result
 #     return paginated_result.to_dict(schema, endpoint, **kwargs)
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
 from flask import request, url_for
-from sqlalchemy.orm import Query
+from marshmallow import ValidationError, fields
+from sqlalchemy import inspect, text, tuple_
+from sqlalchemy.orm import Query, joinedload, selectinload
+from app.extensions import db
+from app.core.serializers import fast_dump
+
+CURSOR_NEXT = "next"
+CURSOR_PREVIOUS = "previous"
+COUNT_EXACT = "exact"
+COUNT_APPROXIMATE = "approximate"
 
 
 class PaginatedResult:
@@ -122,7 +135,7 @@ class PaginatedResult:
         return self.pagination.total
 
     def to_dict(self, schema, endpoint=None, **kwargs):
-        serialized_items = schema.dump(self.items)
+        serialized_items = fast_dump(schema, self.items)
 
         # Build response with count and items
         result = {
@@ -166,6 +179,31 @@ class PaginatedResult:
         return result
 
 
+def eager_load_for_schema(query, schema):
+    """
+    Eager-load the relationships a schema dumps as nested fields, so a page
+    is serialized with a fixed number of queries instead of one per row.
+    Many-to-one relationships are joined, collections use a selectin load.
+    """
+    model = query.column_descriptions[0]["entity"]
+    if model is None:
+        return query
+
+    relationships = inspect(model).relationships
+    options = []
+    for name, field in schema.dump_fields.items():
+        attribute = field.attribute or name
+        if not isinstance(field, fields.Nested) or attribute not in relationships:
+            continue
+        relationship = getattr(model, attribute)
+        if relationships[attribute].uselist:
+            options.append(selectinload(relationship))
+        else:
+            options.append(joinedload(relationship))
+
+    return query.options(*options) if options else query
+
+
 def paginate(query, schema, endpoint=None, **kwargs):
     # Get pagination parameters from request or use defaults
     page = kwargs.pop("page", request.args.get("page", 1, type=int))
@@ -175,7 +213,150 @@ def paginate(query, schema, endpoint=None, **kwargs):
     per_page = min(max(per_page, 1), 100)  # Between 1 and 100
 
     # Create paginated result
+    query = eager_load_for_schema(query, schema)
     paginated_result = PaginatedResult(query, page, per_page)
 
     # Return formatted result
     return paginated_result.to_dict(schema, endpoint, **kwargs)
+
+
+class CursorPaginatedResult:
+    """
+    Keyset pagination over (created_at, id), newest first.
+    Cursors are opaque tokens encoding the boundary row and the direction,
+    so every page costs one indexed range scan regardless of depth.
+    """
+
+    def __init__(self, query, model, cursor=None, per_page=10, count_mode=None):
+        self.query = query
+        self.model = model
+        self.per_page = per_page
+        self.count_mode = count_mode
+        self.direction, boundary = self.decode_cursor(cursor)
+
+        created_at, row_id = model.created_at, model.id
+        ordered = query.order_by(None)
+        if boundary and self.direction == CURSOR_PREVIOUS:
+            ordered = ordered.filter(tuple_(created_at, row_id) > tuple_(*boundary))
+            ordered = ordered.order_by(created_at.asc(), row_id.asc())
+        else:
+            if boundary:
+                ordered = ordered.filter(
+                    tuple_(created_at, row_id) < tuple_(*boundary)
+                )
+            ordered = ordered.order_by(created_at.desc(), row_id.desc())
+
+        rows = ordered.limit(per_page + 1).all()
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+
+        if self.direction == CURSOR_PREVIOUS:
+            rows.reverse()
+            self.has_previous = has_more
+            self.has_next = bool(boundary)
+        else:
+            self.has_next = has_more
+            self.has_previous = bool(boundary)
+
+        self._items = rows
+
+    @property
+    def items(self):
+        """Get current page items"""
+        return self._items
+
+    @property
+    def total(self):
+        """Get total number of items, exact, approximate or None"""
+        if self.count_mode == COUNT_EXACT:
+            return self.query.order_by(None).count()
+        if self.count_mode == COUNT_APPROXIMATE:
+            return approximate_count(self.model)
+        return None
+
+    @staticmethod
+    def encode_cursor(item, direction):
+        payload = {
+            "c": item.created_at.isoformat(),
+            "i": str(item.id),
+            "d": direction,
+        }
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """Return (direction, (created_at, id)) for a cursor, rejecting bad input."""
+        if not cursor:
+            return CURSOR_NEXT, None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            direction = payload["d"]
+            if direction not in (CURSOR_NEXT, CURSOR_PREVIOUS):
+                raise ValueError(direction)
+            return direction, (
+                datetime.fromisoformat(payload["c"]),
+                UUID(payload["i"]),
+            )
+        except (ValueError, KeyError, TypeError):
+            raise ValidationError({"cursor": "Invalid pagination cursor"})
+
+    def to_dict(self, schema, endpoint=None, **kwargs):
+        serialized_items = fast_dump(schema, self.items)
+
+        result = {
+            "count": self.total,
+            "next": None,
+            "previous": None,
+            "items": serialized_items,
+        }
+        if self.count_mode == COUNT_APPROXIMATE:
+            # Planner estimate for the whole table, including deleted rows
+            result["count_is_estimate"] = True
+
+        if endpoint and self.items:
+            params = kwargs.copy()
+            params["per_page"] = self.per_page
+
+            if self.has_next:
+                params["cursor"] = self.encode_cursor(self.items[-1], CURSOR_NEXT)
+                result["next"] = self._build_url(endpoint, params)
+
+            if self.has_previous:
+                params["cursor"] = self.encode_cursor(self.items[0], CURSOR_PREVIOUS)
+                result["previous"] = self._build_url(endpoint, params)
+
+        return result
+
+    @staticmethod
+    def _build_url(endpoint, params):
+        try:
+            return url_for(endpoint, **params, _external=True)
+        except Exception:
+            # Fallback to a basic URL format
+            query_args = "&".join([f"{k}={v}" for k, v in params.items()])
+            return f"{request.base_url}?{query_args}"
+
+
+def approximate_count(model):
+    """Planner row estimate for a model's table, cheap on very large tables"""
+    estimate = db.session.execute(
+        text("SELECT reltuples FROM pg_class WHERE relname = :table"),
+        {"table": model.__tablename__},
+    ).scalar()
+    return max(int(estimate or 0), 0)
+
+
+def cursor_paginate(query, schema, model, endpoint=None, count_mode=None, **kwargs):
+    # Get pagination parameters from request or use defaults
+    cursor = kwargs.pop("cursor", request.args.get("cursor"))
+    per_page = kwargs.pop("per_page", request.args.get("per_page", 10, type=int))
+
+    # Ensure reasonable limits for pagination
+    per_page = min(max(per_page, 1), 100)  # Between 1 and 100
+
+    query = eager_load_for_schema(query, schema)
+    paginated_result = CursorPaginatedResult(
+        query, model, cursor, per_page, count_mode=count_mode
+    )
+
+    return paginated_result.to_dict(schema, endpoint, **kwargs)
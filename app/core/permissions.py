@@ -1,9 +1,18 @@
+import redis
 from functools import wraps
-from flask import g, jsonify, request
-from app.core.constants import UserRole
+from flask import g, jsonify, request, abort
+from app.core.constants import UserRole, PERMISSION_CACHE_TTL
+from app.core.logger import logger
+from app.extensions import redis_client
+from app.core.lookups import get_cached
 from app.modules.user.models import User, UserRelationship
 from app.modules.category.models import Category
 
+ACCESS_ALLOWED = "allowed"
+ACCESS_DENIED = "denied"
+ACCESS_PARENT_READ_ONLY = "parent_read_only"
+ACCESS_USER_NOT_FOUND = "user_not_found"
+
 
 def admin_only(f):
     """Decorator to allow only admin users to access an endpoint"""
@@ -62,7 +71,7 @@ def prevent_child_creation(model_name):
                 parent_id = kwargs.get("user_id")
 
                 if parent_id:
-                    parent_user = User.query.get(parent_id)
+                    parent_user = get_cached(User, parent_id)
                     if not parent_user:
                         return {"error": "Parent user not found"}, 404
 
@@ -87,6 +96,132 @@ def prevent_child_creation(model_name):
     return decorator
 
 
+class PermissionCache:
+    """
+    Caches access decisions for (actor, target user, method class) in Redis
+    with a TTL, backed by a per-request copy on flask.g. Entries for a user are
+    tracked in a Redis set so they can be evicted when relationships or the
+    user's deleted flag change. Redis failures fall back to the database.
+    """
+
+    @staticmethod
+    def _key(actor_id, target_user_id, method_class):
+        return f"permission:{actor_id}:{target_user_id}:{method_class}"
+
+    @staticmethod
+    def _index_key(user_id):
+        return f"permission_keys:{user_id}"
+
+    @staticmethod
+    def _request_cache():
+        if not hasattr(g, "permission_decisions"):
+            g.permission_decisions = {}
+        return g.permission_decisions
+
+    @staticmethod
+    def get(actor_id, target_user_id, method_class):
+        key = PermissionCache._key(actor_id, target_user_id, method_class)
+        request_cache = PermissionCache._request_cache()
+        if key in request_cache:
+            return request_cache[key]
+        if redis_client is None:
+            return None
+        try:
+            decision = redis_client.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"Permission cache unavailable, using database: {str(e)}")
+            return None
+        if decision:
+            request_cache[key] = decision
+        return decision
+
+    @staticmethod
+    def set(actor_id, target_user_id, method_class, decision):
+        key = PermissionCache._key(actor_id, target_user_id, method_class)
+        PermissionCache._request_cache()[key] = decision
+        if redis_client is None:
+            return
+        try:
+            pipe = redis_client.pipeline()
+            pipe.setex(key, PERMISSION_CACHE_TTL, decision)
+            for user_id in (actor_id, target_user_id):
+                index_key = PermissionCache._index_key(user_id)
+                pipe.sadd(index_key, key)
+                pipe.expire(index_key, PERMISSION_CACHE_TTL)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Failed to cache permission decision: {str(e)}")
+
+    @staticmethod
+    def evict_user(*user_ids):
+        """Evict every cached decision where one of the users is actor or target."""
+        if hasattr(g, "permission_decisions"):
+            g.permission_decisions.clear()
+        if redis_client is None:
+            return
+        try:
+            for user_id in user_ids:
+                index_key = PermissionCache._index_key(user_id)
+                keys = redis_client.smembers(index_key)
+                redis_client.delete(index_key, *keys)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to evict permission decisions: {str(e)}")
+
+
+def _method_class(method, allow_parent_write):
+    """Group request methods by the access rules that apply to them."""
+    if method == "GET":
+        return "read"
+    return "parent_write" if allow_parent_write else "write"
+
+
+def _access_decision(current_user, target_user_id, method_class):
+    """Decide whether current_user may act on target_user_id's resources."""
+    # Users can always access their own resources
+    if str(current_user.id) == str(target_user_id):
+        return ACCESS_ALLOWED
+
+    decision = PermissionCache.get(current_user.id, target_user_id, method_class)
+    if decision:
+        return decision
+
+    target_user = get_cached(User, target_user_id)
+    if not target_user:
+        decision = ACCESS_USER_NOT_FOUND
+    # Admin can access any user's resources
+    elif current_user.role == UserRole.ADMIN:
+        decision = ACCESS_ALLOWED
+    else:
+        # Check if current user is parent of target user
+        relationship = UserRelationship.query.filter_by(
+            parent_id=current_user.id,
+            child_id=target_user_id,
+            is_deleted=False,
+        ).first()
+
+        if not relationship:
+            decision = ACCESS_DENIED
+        # Parent can always read child resources, and write only if allowed
+        elif method_class in ("read", "parent_write"):
+            decision = ACCESS_ALLOWED
+        else:
+            decision = ACCESS_PARENT_READ_ONLY
+
+    PermissionCache.set(current_user.id, target_user_id, method_class, decision)
+    return decision
+
+
+def get_permitted_resource(resource_model, resource_id):
+    """
+    Return the resource already loaded by permission_required for this request,
+    falling back to a lookup (404 if missing).
+    """
+    resource = get_cached(resource_model, resource_id)
+    if resource is None:
+        abort(404)
+    return resource
+
+
 def permission_required(
     resource_model=None,
     resource_param=None,
@@ -123,88 +258,51 @@ def permission_required(
                 if special_check_result:
                     return special_check_result
 
+            # Load the resource once; it is reused by the checks and the handler
+            resource = None
+            if resource_model and resource_param and resource_param in kwargs:
+                resource_id = kwargs.get(resource_param)
+                if not resource_id:
+                    return {"error": f"Resource ID ({resource_param}) is required"}, 400
+                resource = get_cached(resource_model, resource_id)
+
             # Special handling for predefined categories - allow read access to any user
             if (
-                resource_model
-                and resource_model == Category
-                and resource_param in kwargs
+                resource_model == Category
+                and resource
+                and str(resource.user_id) == str(target_user_id)
+                and resource.is_predefined
             ):
-                category_id = kwargs.get(resource_param)
-                print(category_id)
-                if category_id:
-                    category = Category.query.filter_by(
-                        id=category_id, user_id=kwargs.get("user_id")
-                    ).first()
-                    print(category)
-                    if (
-                        category
-                        and hasattr(category, "is_predefined")
-                        and category.is_predefined
-                    ):
-                        # Allow read access to predefined categories
-                        if request.method == "GET":
-                            return f(*args, **kwargs)
-                        # Only admins can modify predefined categories
-                        elif g.current_user.role != UserRole.ADMIN:
-                            return {"error": "Cannot modify predefined categories"}, 403
-
-            # Get target user_id from URL parameters
-            target_user_id = kwargs.get("user_id")
-            if not target_user_id:
-                return {"error": "User ID is required"}, 400
-
-            # Get target user
-            target_user = User.query.get(target_user_id)
-            if not target_user:
-                return {"error": "User not found"}, 404
+                # Allow read access to predefined categories
+                if request.method == "GET":
+                    return f(*args, **kwargs)
+                # Only admins can modify predefined categories
+                elif g.current_user.role != UserRole.ADMIN:
+                    return {"error": "Cannot modify predefined categories"}, 403
 
             # Determine request type
             method = request.method
-            is_read_operation = method == "GET"
             is_write_operation = method in ["POST", "PUT", "PATCH", "DELETE"]
 
             # Access control logic based on user relationships
-            can_access = False
-
-            # Admin can access any user's resources
-            if g.current_user.role == UserRole.ADMIN:
-                can_access = True
-            # User can access their own resources
-            elif str(g.current_user.id) == str(target_user_id):
-                can_access = True
-            # Parent-child relationship check
-            else:
-                # Check if current user is parent of target user
-                relationship = UserRelationship.query.filter_by(
-                    parent_id=g.current_user.id,
-                    child_id=target_user_id,
-                    is_deleted=False,
-                ).first()
-
-                if relationship:
-                    # Parent can always read child resources
-                    if is_read_operation:
-                        can_access = True
-                    # Parents can write child resources only if explicitly allowed
-                    elif is_write_operation and allow_parent_write:
-                        can_access = True
+            decision = _access_decision(
+                g.current_user,
+                target_user_id,
+                _method_class(method, allow_parent_write),
+            )
 
             # If access denied, return appropriate error
-            if not can_access:
-                if relationship and is_write_operation and not allow_parent_write:
-                    return {
-                        "error": "Parents can view but not modify their child's resources"
-                    }, 403
-                else:
-                    return {"error": "Resource Not Found"}, 404
+            if decision == ACCESS_USER_NOT_FOUND:
+                return {"error": "User not found"}, 404
+            if decision == ACCESS_PARENT_READ_ONLY:
+                return {
+                    "error": "Parents can view but not modify their child's resources"
+                }, 403
+            if decision != ACCESS_ALLOWED:
+                return {"error": "Resource Not Found"}, 404
 
             if resource_model and resource_param and resource_param in kwargs:
-                resource_id = kwargs.get(resource_param)
-                if not resource_id:
-                    return {"error": f"Resource ID ({resource_param}) is required"}, 400
-
-                # Get the specific resource and check if it's not soft-deleted
-                resource = resource_model.query.get(resource_id)
+                # Check the specific resource is not soft-deleted
                 if not resource or (
                     hasattr(resource, "is_deleted") and resource.is_deleted
                 ):
@@ -0,0 +1,67 @@
+import gzip
+import json
+from decimal import Decimal
+from enum import Enum
+from uuid import UUID
+from datetime import date, datetime
+from flask import current_app, make_response, request
+from app.core.constants import RESPONSE_GZIP_LEVEL
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library encoder
+    orjson = None
+
+
+def _default(value):
+    """Encode types the JSON encoders do not handle natively"""
+    if isinstance(value, Decimal):
+        # Keep the exact amount rather than rounding through float
+        return str(value)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(data):
+    """Serialize data to JSON bytes with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(
+            data, default=_default, option=orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(data, default=_default).encode("utf-8")
+
+
+def output_json(data, code, headers=None):
+    """
+    Flask-RESTful JSON representation using the fast encoder.
+    Bodies above RESPONSE_COMPRESSION_MIN_SIZE are gzipped when the client
+    accepts it; a min size of 0 turns compression off.
+    """
+    body = dumps(data) + b"\n"
+    response = make_response(body, code)
+    response.headers.extend(headers or {})
+    response.mimetype = "application/json"
+
+    min_size = current_app.config.get("RESPONSE_COMPRESSION_MIN_SIZE") or 0
+    if (
+        min_size
+        and len(body) >= min_size
+        and "gzip" in request.accept_encodings
+        and "Content-Encoding" not in response.headers
+    ):
+        response.set_data(gzip.compress(body, compresslevel=RESPONSE_GZIP_LEVEL))
+        response.headers["Content-Encoding"] = "gzip"
+        response.vary.add("Accept-Encoding")
+
+    return response
+
+
+def use_fast_json(api):
+    """Register the fast JSON representation on a Flask-RESTful Api"""
+    api.representations["application/json"] = output_json
+    return api
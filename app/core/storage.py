@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+from flask import current_app
+from werkzeug.utils import import_string
+
+
+class ReportStorage:
+    """
+    Interface for storing rendered report artifacts. Backends are selected
+    with the REPORT_STORAGE_BACKEND setting, so a blob store can replace the
+    local disk without touching the report jobs.
+    """
+
+    def open_write(self, name):
+        """Binary file object to write an artifact to"""
+        raise NotImplementedError
+
+    def open_read(self, name):
+        """Binary file object to read an artifact from"""
+        raise NotImplementedError
+
+    def exists(self, name):
+        raise NotImplementedError
+
+    def delete(self, name):
+        raise NotImplementedError
+
+
+class LocalReportStorage(ReportStorage):
+    """Stores artifacts under REPORT_STORAGE_DIR (a temp directory by default)"""
+
+    def __init__(self, root=None):
+        self.root = root or os.path.join(tempfile.gettempdir(), "reports")
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, name):
+        # Artifact names are generated by the jobs, never taken from requests
+        return os.path.join(self.root, os.path.basename(name))
+
+    def open_write(self, name):
+        return _AtomicFile(self._path(name))
+
+    def open_read(self, name):
+        return open(self._path(name), "rb")
+
+    def exists(self, name):
+        return os.path.exists(self._path(name))
+
+    def delete(self, name):
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:
+            pass
+
+
+class _AtomicFile:
+    """Writes to a temporary file renamed into place on success"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(path), delete=False
+        )
+
+    def __enter__(self):
+        return self.file
+
+    def __exit__(self, exc_type, exc, tb):
+        self.file.close()
+        if exc_type is None:
+            shutil.move(self.file.name, self.path)
+        else:
+            os.remove(self.file.name)
+
+
+def get_report_storage():
+    """Report artifact storage configured for the current app"""
+    backend = import_string(current_app.config["REPORT_STORAGE_BACKEND"])
+    return backend(current_app.config.get("REPORT_STORAGE_DIR"))
@@ -1,12 +1,22 @@
 import os
+import time
+import hashlib
 import secrets
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
+import redis
 from flask import current_app
 from flask_jwt_extended import create_access_token, create_refresh_token, decode_token
 from itsdangerous import URLSafeTimedSerializer
 from app.modules.auth.models import ActiveAccessToken
 from app.extensions import db, redis_client
 from app.core.logger import logger
+from app.core.constants import (
+    ACCESS_TOKEN_CACHE_TTL,
+    ACCESS_TOKEN_LOCAL_CACHE_TTL,
+    ACCESS_TOKEN_LOCAL_CACHE_SIZE,
+)
 from app.config import (
     JWT_ACCESS_TOKEN_EXPIRES,
     JWT_REFRESH_TOKEN_EXPIRES,
@@ -15,6 +25,126 @@ from app.config import (
 )
 
 
+class AccessTokenCache:
+    """
+    Cache of validated access tokens keyed by a hash of the JWT jti.
+    Redis holds the shared entries; a small in-process LRU with a short TTL
+    sits in front of it. Any Redis failure falls back to the database.
+    Invalidation leaves a revocation marker, and entries are only written
+    while no marker exists, so a request that validated a token just before
+    it was revoked cannot put it back into the cache.
+    """
+
+    _local = OrderedDict()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _key(jti):
+        return f"access_token:{hashlib.sha256(jti.encode('utf-8')).hexdigest()}"
+
+    @staticmethod
+    def _revoked_key(key):
+        return f"{key}:revoked"
+
+    @staticmethod
+    def _jti_from_token(token):
+        """Extract the jti claim from an encoded token, ignoring expiry."""
+        try:
+            return decode_token(token, allow_expired=True).get("jti")
+        except Exception as e:
+            logger.warning(f"Could not decode token for cache invalidation: {str(e)}")
+            return None
+
+    @classmethod
+    def get_user_id(cls, jti):
+        """Return the cached user ID for a jti, or None on a miss."""
+        if not jti:
+            return None
+        key = cls._key(jti)
+
+        with cls._lock:
+            entry = cls._local.get(key)
+            if entry:
+                user_id, expires_at = entry
+                if expires_at > time.monotonic():
+                    cls._local.move_to_end(key)
+                    return user_id
+                del cls._local[key]
+
+        if redis_client is None:
+            return None
+        try:
+            user_id = redis_client.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"Token cache unavailable, using database: {str(e)}")
+            return None
+
+        if user_id:
+            cls._set_local(key, user_id)
+        return user_id
+
+    @classmethod
+    def set(cls, jti, user_id, expires_at=None):
+        """Cache a validated token until it expires, capped at the cache TTL."""
+        if not jti:
+            return
+        key = cls._key(jti)
+        ttl = ACCESS_TOKEN_CACHE_TTL
+        if expires_at:
+            ttl = min(ttl, int(expires_at - time.time()))
+        if ttl <= 0:
+            return
+
+        if redis_client is None:
+            cls._set_local(key, str(user_id))
+            return
+        revoked_key = cls._revoked_key(key)
+        try:
+            with redis_client.pipeline() as pipe:
+                # The write is dropped if the token is revoked before EXEC
+                pipe.watch(revoked_key)
+                if pipe.exists(revoked_key):
+                    return
+                pipe.multi()
+                pipe.setex(key, ttl, str(user_id))
+                pipe.execute()
+        except redis.WatchError:
+            return
+        except redis.RedisError as e:
+            logger.warning(f"Failed to cache access token: {str(e)}")
+            return
+        cls._set_local(key, str(user_id))
+
+    @classmethod
+    def invalidate(cls, token):
+        """Drop the cache entry for an encoded access token."""
+        jti = cls._jti_from_token(token)
+        if not jti:
+            return
+        key = cls._key(jti)
+
+        with cls._lock:
+            cls._local.pop(key, None)
+        if redis_client is None:
+            return
+        try:
+            pipe = redis_client.pipeline()
+            # Marker first, so an in-flight revalidation cannot re-cache the token
+            pipe.setex(cls._revoked_key(key), ACCESS_TOKEN_CACHE_TTL, 1)
+            pipe.delete(key)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Failed to invalidate cached access token: {str(e)}")
+
+    @classmethod
+    def _set_local(cls, key, user_id):
+        with cls._lock:
+            cls._local[key] = (user_id, time.monotonic() + ACCESS_TOKEN_LOCAL_CACHE_TTL)
+            cls._local.move_to_end(key)
+            while len(cls._local) > ACCESS_TOKEN_LOCAL_CACHE_SIZE:
+                cls._local.popitem(last=False)
+
+
 class TokenUtils:
     """Utility class to handle all token-related operations."""
 
@@ -54,6 +184,7 @@ class TokenUtils:
         if token_entry:
             db.session.delete(token_entry)
             db.session.commit()
+            AccessTokenCache.invalidate(token)
             logger.info(
                 f"Logout successfully and Invalidated token for user: {token_entry.user.username}"
             )
@@ -66,6 +197,8 @@ class TokenUtils:
             for token in tokens:
                 db.session.delete(token)
             db.session.commit()
+            for token in tokens:
+                AccessTokenCache.invalidate(token.token)
             logger.info(f"Invalidated all access tokens for user_id: {user_id}")
             return True
         logger.info(f"No active tokens found to invalidate for user_id: {user_id}")
@@ -4,7 +4,7 @@ import re
 from flask import request, g
 from flask_restful import Resource
 from app.core.logger import logger
-from app.core.pagination import paginate
+from app.core.pagination import paginate, cursor_paginate, COUNT_APPROXIMATE
 
 
 def is_valid_email(email):
@@ -44,12 +44,19 @@ class BaseListResource(Resource):
     - schema: The marshmallow schema for serialization
     - endpoint: The API endpoint name
     - type_enum: Optional enum class for type filtering (if applicable)
+    Subclasses may set:
+    - cursor_pagination: Allow keyset pagination on (created_at, id) when the
+      client sends a cursor parameter (an empty one starts from the newest)
+    - count_mode: "exact", "approximate" or None for the cursor page count;
+      an approximate count is dropped when a type filter is applied
     """
 
     model = None
     schema = None
     endpoint = None
     type_enum = None
+    cursor_pagination = False
+    count_mode = None
 
     def get_queryset(self, **kwargs):
         """Base queryset - override in subclass if needed."""
@@ -64,11 +71,17 @@ class BaseListResource(Resource):
         if not self.type_enum:
             return queryset
 
-        type_value = request.args.get("type")
-        if type_value and type_value in self.type_enum.__members__:
-            return queryset.filter(self.model.type == type_value)
+        if self.type_filter_applied():
+            return queryset.filter(self.model.type == request.args.get("type"))
         return queryset
 
+    def type_filter_applied(self):
+        """Whether the request filters the listing by a valid type."""
+        type_value = request.args.get("type")
+        return bool(
+            self.type_enum and type_value and type_value in self.type_enum.__members__
+        )
+
     def get(self, **kwargs):
         """Handle GET request with pagination and filtering."""
         if not all([self.model, self.schema, self.endpoint]):
@@ -85,11 +98,24 @@ class BaseListResource(Resource):
         queryset = self.apply_type_filter(queryset)
 
         # Paginate results
-        result = paginate(
-            query=queryset,
-            schema=self.schema,
-            endpoint=self.endpoint,
-        )
+        if self.cursor_pagination and "cursor" in request.args:
+            count_mode = self.count_mode
+            # The table estimate cannot account for a type filter
+            if count_mode == COUNT_APPROXIMATE and self.type_filter_applied():
+                count_mode = None
+            result = cursor_paginate(
+                query=queryset,
+                schema=self.schema,
+                model=self.model,
+                endpoint=self.endpoint,
+                count_mode=count_mode,
+            )
+        else:
+            result = paginate(
+                query=queryset,
+                schema=self.schema,
+                endpoint=self.endpoint,
+            )
 
         logger.info(
             f"{self.model.__name__.lower()}s retrieved successfully for user: {g.current_user.id}"
@@ -11,6 +11,7 @@ from app.modules.auth.tasks import send_password_reset_email, send_verification_
 from app.modules.user.models import UserRelationship
 import json
 from app.modules.user.schemas import UserSchema
+from app.core.permissions import PermissionCache
 
 
 class RegistrationService:
@@ -127,6 +128,8 @@ class RegistrationService:
                 )
 
             db.session.commit()
+            if "parent_id" in user_data_dict:
+                PermissionCache.evict_user(parent_id, new_user.id)
 
             # Clean up Redis keys
             redis_client.delete(verification_token_key)
@@ -2,6 +2,7 @@
 from flask import Blueprint
 from app.extensions import api
 from flask_restful import Api
+from app.core.representations import use_fast_json
 from app.modules.auth.resources import (
     SignupResource,
     LoginResource,
@@ -17,7 +18,7 @@ from app.modules.auth.resources import (
 auth_bp = Blueprint("auth", __name__)
 
 # Create an API instance tied to the Blueprint
-auth_api = Api(auth_bp)  # Instead of using the global `api`
+auth_api = use_fast_json(Api(auth_bp))  # Instead of using the global `api`
 
 # Add resources to the new API instance
 auth_api.add_resource(SignupResource, "/auth/signup", endpoint="auth_signup")
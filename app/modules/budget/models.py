@@ -28,6 +28,16 @@ class Budget(BaseModel):
     category = db.relationship(
         "Category", backref=db.backref("budgets", lazy="dynamic")
     )
+    __table_args__ = (
+        db.Index(
+            "ix_budgets_user_id_category_id_year_month",
+            "user_id",
+            "category_id",
+            "year",
+            "month",
+            postgresql_where=db.text("NOT is_deleted"),
+        ),
+    )
 
     @property
     def remaining(self):
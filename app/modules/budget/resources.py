@@ -4,10 +4,17 @@ from marshmallow import ValidationError
 
 from app.extensions import db
 from .models import Budget
-from .schemas import BudgetSchema, BudgetUpdateSchema
+from .schemas import (
+    BudgetSchema,
+    BudgetUpdateSchema,
+    BudgetBulkCreateSchema,
+    BudgetCopyForwardSchema,
+)
 from .services import (
     get_user_budgets,
     create_budget,
+    create_budgets,
+    copy_budgets_forward,
     update_budget,
 )
 from app.core.permissions import permission_required, admin_only
@@ -24,6 +31,8 @@ from app.core.utils import BaseListResource
 budget_schema = BudgetSchema()
 budgets_schema = BudgetSchema(many=True)
 budget_update_schema = BudgetUpdateSchema()
+budget_bulk_create_schema = BudgetBulkCreateSchema()
+budget_copy_forward_schema = BudgetCopyForwardSchema()
 
 
 class AllBudgetListResource(BaseListResource):
@@ -78,6 +87,55 @@ class BudgetListResource(Resource):
         return budget_schema.dump(budget), 201
 
 
+class BudgetBulkResource(Resource):
+    """Resource for creating many budgets in one request"""
+
+    method_decorators = [
+        handle_errors,
+        permission_required(Budget),
+        authenticated_user,
+    ]
+
+    def post(self, user_id):
+        """
+        Create several budgets at once.
+        """
+        data = request.get_json() or {}
+        logger.info(f"Creating budgets in bulk for user {user_id}")
+        budget_bulk_create_schema.context["user_id"] = user_id
+        data = budget_bulk_create_schema.load(data)
+        budgets = create_budgets(user_id, data["budgets"])
+        if isinstance(budgets, tuple) and len(budgets) == 2:
+            return budgets
+
+        return {"budgets": budgets_schema.dump(budgets)}, 201
+
+
+class BudgetCopyForwardResource(Resource):
+    """Resource for copying last month's budgets into a new month"""
+
+    method_decorators = [
+        handle_errors,
+        permission_required(Budget),
+        authenticated_user,
+    ]
+
+    def post(self, user_id):
+        """
+        Copy the previous month's budgets into the given month.
+        """
+        data = request.get_json() or {}
+        data = budget_copy_forward_schema.load(data)
+        logger.info(
+            f"Copying budgets forward to {data['month']}/{data['year']} for user {user_id}"
+        )
+        budgets = copy_budgets_forward(user_id, data["month"], data["year"])
+        if isinstance(budgets, tuple) and len(budgets) == 2:
+            return budgets
+
+        return {"budgets": budgets_schema.dump(budgets)}, 201
+
+
 class BudgetDetailResource(Resource):
     method_decorators = [
         handle_errors,
@@ -1,15 +1,22 @@
 from marshmallow import fields, validates, validates_schema, ValidationError, EXCLUDE
-from marshmallow.validate import Range
+from marshmallow.validate import Range, Length
+from sqlalchemy import tuple_
 from app.extensions import ma
 from app.modules.budget.models import Budget
 from app.modules.category.models import Category
 from app.modules.user.models import User
-from app.core.constants import UserRole, MIN_AMOUNT, MAX_AMOUNT
+from app.core.constants import (
+    UserRole,
+    MIN_AMOUNT,
+    MAX_AMOUNT,
+    BUDGET_BULK_MAX_ITEMS,
+)
 from flask import g
 from decimal import Decimal
 import datetime
 from app.core.schemas import BaseSchema
 from app.core.validators import validate_amount
+from app.core.lookups import get_cached
 from app.modules.category.schemas import CategorySchema
 
 
@@ -94,6 +101,94 @@ class BudgetUpdateSchema(BaseSchema):
     )
 
 
+class BudgetBulkItemSchema(ma.Schema):
+    """One budget of a bulk create request"""
+
+    class Meta:
+        unknown = EXCLUDE
+
+    category_id = fields.UUID(required=True)
+    amount = fields.Decimal(
+        required=True, places=2, as_string=True, validate=validate_amount
+    )
+    month = fields.Integer(required=True, validate=Range(min=1, max=12))
+    year = fields.Integer(required=True)
+
+    @validates("year")
+    def validate_year(self, value):
+        """Validate year is not in the past"""
+        current_year = datetime.datetime.now().year
+        if value < current_year:
+            raise ValidationError("Year cannot be in the past", "year")
+        return value
+
+
+class BudgetBulkCreateSchema(ma.Schema):
+    """Validates a bulk create request with one query per check, not per budget"""
+
+    class Meta:
+        unknown = EXCLUDE
+
+    budgets = fields.List(
+        fields.Nested(BudgetBulkItemSchema),
+        required=True,
+        validate=Length(min=1, max=BUDGET_BULK_MAX_ITEMS),
+    )
+
+    @validates_schema
+    def validate_budgets(self, data, **kwargs):
+        """Validate categories and uniqueness for every budget at once"""
+        user_id = self.context["user_id"]
+        budgets = data.get("budgets", [])
+
+        category_ids = {budget["category_id"] for budget in budgets}
+        categories = Category.query.filter(
+            Category.id.in_(category_ids),
+            Category.user_id == user_id,
+            Category.is_deleted == False,
+        ).all()
+        missing = category_ids - {category.id for category in categories}
+        if missing:
+            raise ValidationError(
+                f"Categories not found: {', '.join(sorted(map(str, missing)))}",
+                "budgets",
+            )
+
+        buckets = [
+            (budget["category_id"], budget["month"], budget["year"])
+            for budget in budgets
+        ]
+        if len(set(buckets)) != len(buckets):
+            raise ValidationError(
+                "Each category can only have one budget per month and year",
+                "budgets",
+            )
+
+        if find_existing_budgets(user_id, buckets):
+            raise ValidationError(
+                "A budget already exists for this user, category, month and year",
+                "month_year",
+            )
+
+
+class BudgetCopyForwardSchema(ma.Schema):
+    """Target month for copying the previous month's budgets forward"""
+
+    class Meta:
+        unknown = EXCLUDE
+
+    month = fields.Integer(required=True, validate=Range(min=1, max=12))
+    year = fields.Integer(required=True)
+
+    @validates("year")
+    def validate_year(self, value):
+        """Validate year is not in the past"""
+        current_year = datetime.datetime.now().year
+        if value < current_year:
+            raise ValidationError("Year cannot be in the past", "year")
+        return value
+
+
 def validate_category(category_id, user_id=None):
     """
     Validate category exists, is not deleted, and optionally belongs to user
@@ -105,7 +200,7 @@ def validate_category(category_id, user_id=None):
     Raises:
         ValidationError: If validation fails
     """
-    category = Category.query.get(category_id)
+    category = get_cached(Category, category_id)
     if not category or category.is_deleted:
         raise ValidationError("Category not found", "category_id")
 
@@ -135,3 +230,20 @@ def check_existing_budget(user_id, category_id, month, year):
             "A budget already exists for this user, category, month and year",
             "month_year",
         )
+
+
+def find_existing_budgets(user_id, buckets):
+    """
+    Return the budgets that already exist for any of the given
+    (category_id, month, year) buckets of a user, in one query.
+    """
+    buckets = set(buckets)
+    if not buckets:
+        return []
+
+    return Budget.query.filter(
+        Budget.user_id == user_id,
+        Budget.category_id.in_({category_id for category_id, _, _ in buckets}),
+        Budget.is_deleted == False,
+        tuple_(Budget.category_id, Budget.month, Budget.year).in_(list(buckets)),
+    ).all()
@@ -4,13 +4,17 @@ from app.core.logger import logger
 from app.extensions import db
 
 # from app.services.common import fetch_standard_resources
-from datetime import datetime
+import uuid
+from datetime import datetime, timedelta
 from decimal import Decimal
 from marshmallow import ValidationError
-from sqlalchemy import extract
-from app.modules.transaction.models import Transaction
+from sqlalchemy import func, insert, tuple_
+from sqlalchemy.orm import joinedload
+from app.modules.transaction.models import TransactionRollup
 from app.core.constants import TransactionType, MIN_YEAR, MAX_YEAR
-from .tasks import check_budget_thresholds
+from app.modules.category.models import Category
+from .schemas import find_existing_budgets
+from .tasks import mark_budgets_dirty
 
 
 def get_user_budgets(user_id, query_params=None):
@@ -90,7 +94,7 @@ def create_budget(budget):
         )
 
         # Queue Celery task to check if budget already exceeding thresholds
-        check_budget_thresholds.delay(budget.id)
+        mark_budgets_dirty(budget.id)
 
         return budget
 
@@ -100,6 +104,94 @@ def create_budget(budget):
         return {"error": f"Failed to create budget: {str(e)}"}, 500
 
 
+def create_budgets(user_id, budgets_data):
+    """
+    Create many budgets at once. Initial spent amounts come from one grouped
+    query, the rows are inserted in one statement and a single batched
+    threshold check is queued.
+    """
+    try:
+        spendings = calculate_month_spendings(
+            user_id,
+            [(data["category_id"], data["month"], data["year"]) for data in budgets_data],
+        )
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "category_id": data["category_id"],
+                "amount": data["amount"],
+                "month": data["month"],
+                "year": data["year"],
+                "spent_amount": spendings[
+                    (data["category_id"], data["month"], data["year"])
+                ],
+            }
+            for data in budgets_data
+        ]
+        if rows:
+            db.session.execute(insert(Budget), rows)
+        db.session.commit()
+
+        budget_ids = [row["id"] for row in rows]
+        logger.info(f"Created {len(budget_ids)} budgets for {user_id}")
+
+        # Queue a single threshold check for every new budget
+        if budget_ids:
+            mark_budgets_dirty(*budget_ids)
+
+        return (
+            Budget.query.options(joinedload(Budget.category))
+            .filter(Budget.id.in_(budget_ids))
+            .order_by(Budget.year, Budget.month)
+            .all()
+        )
+
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error creating budgets: {str(e)}")
+        return {"error": f"Failed to create budgets: {str(e)}"}, 500
+
+
+def copy_budgets_forward(user_id, month, year):
+    """
+    Copy the previous month's budgets into the given month, skipping
+    categories that are deleted or already have a budget there.
+    """
+    previous = month_bounds(month, year)[0] - timedelta(days=1)
+    source_budgets = (
+        Budget.query.join(Category, Budget.category_id == Category.id)
+        .filter(
+            Budget.user_id == user_id,
+            Budget.month == previous.month,
+            Budget.year == previous.year,
+            Budget.is_deleted == False,
+            Category.is_deleted == False,
+        )
+        .all()
+    )
+    existing = {
+        budget.category_id
+        for budget in find_existing_budgets(
+            user_id, [(budget.category_id, month, year) for budget in source_budgets]
+        )
+    }
+    budgets_data = [
+        {
+            "category_id": budget.category_id,
+            "amount": budget.amount,
+            "month": month,
+            "year": year,
+        }
+        for budget in source_budgets
+        if budget.category_id not in existing
+    ]
+    logger.info(
+        f"Copying {len(budgets_data)} budgets from {previous.month}/{previous.year} to {month}/{year}"
+    )
+    return create_budgets(user_id, budgets_data)
+
+
 def update_budget(updated_budget, old_budget):
     """Update a budget amount"""
     try:
@@ -125,7 +217,7 @@ def update_budget(updated_budget, old_budget):
 
         # Check thresholds if amount changed
         if new_amount != old_budget.amount:
-            check_budget_thresholds.delay(updated_budget.id)
+            mark_budgets_dirty(updated_budget.id)
 
         return updated_budget
 
@@ -135,6 +227,16 @@ def update_budget(updated_budget, old_budget):
         return {"error": f"Failed to update budget: {str(e)}"}, 500
 
 
+def month_bounds(month, year):
+    """
+    Half-open [start, end) datetime range covering a month, so filters on
+    transaction_at can use its index instead of extracting date parts.
+    """
+    start = datetime(year, month, 1)
+    end = datetime(year + month // 12, month % 12 + 1, 1)
+    return start, end
+
+
 def calculate_month_spending(user_id, category_id, month, year):
     """
     Calculate total spending for a specific month/year/category
@@ -148,19 +250,54 @@ def calculate_month_spending(user_id, category_id, month, year):
     Returns:
         Decimal: Total spending amount
     """
-    # Query for transactions in the given month/year for this category and user
-    transactions = Transaction.query.filter(
-        Transaction.user_id == user_id,
-        Transaction.category_id == category_id,
-        extract("month", Transaction.transaction_at) == month,
-        extract("year", Transaction.transaction_at) == year,
-        Transaction.is_deleted == False,
-        Transaction.type == TransactionType.DEBIT,  # Only count expense transactions
-    ).all()
-
-    # Sum up the amounts
-    total = Decimal("0.00")
-    for transaction in transactions:
-        total += transaction.amount
-
-    return total
+    return calculate_month_spendings(user_id, [(category_id, month, year)])[
+        (category_id, month, year)
+    ]
+
+
+def calculate_month_spendings(user_id, buckets):
+    """
+    Calculate spending for many (category_id, month, year) buckets of a user
+    from the monthly transaction rollups in one grouped query.
+
+    Args:
+        user_id: User ID
+        buckets: Iterable of (category_id, month, year) tuples
+
+    Returns:
+        dict: Total spending per (category_id, month, year), zero when none
+    """
+    buckets = set(buckets)
+    totals = {bucket: Decimal("0.00") for bucket in buckets}
+    if not buckets:
+        return totals
+
+    rows = (
+        db.session.query(
+            TransactionRollup.category_id,
+            TransactionRollup.month,
+            TransactionRollup.year,
+            func.sum(TransactionRollup.total).label("total"),
+        )
+        .filter(
+            TransactionRollup.user_id == user_id,
+            tuple_(
+                TransactionRollup.category_id,
+                TransactionRollup.month,
+                TransactionRollup.year,
+            ).in_(buckets),
+            TransactionRollup.is_deleted == False,
+            TransactionRollup.type == TransactionType.DEBIT,  # Only count expenses
+        )
+        .group_by(
+            TransactionRollup.category_id,
+            TransactionRollup.month,
+            TransactionRollup.year,
+        )
+        .all()
+    )
+
+    for row in rows:
+        bucket = (row.category_id, row.month, row.year)
+        totals[bucket] = Decimal(row.total).quantize(Decimal("0.01"))
+    return totals
@@ -1,23 +1,39 @@
 import os
+import time
+import uuid
+import redis
 from app.core.logger import logger
+from app.extensions import db, redis_client
 from app.celery_app import celery
 from app.modules.budget.models import Budget
 from app.modules.category.models import Category
 from app.modules.user.models import User
 from decimal import Decimal
 import calendar
-from app.core.mail import send_email
-from python_http_client.exceptions import BadRequestsError
+from app.core.mail import (
+    send_email,
+    send_emails,
+    retry_countdown,
+    MailDeliveryError,
+)
 from app.core.constants import (
     BUDGET_WARNING_THRESHOLD,
     BUDGET_EXCEEDED_THRESHOLD,
     BUDGET_EXCEEDED_KEYWORD,
     BUDGET_WARNING_KEYWORD,
+    BUDGET_THRESHOLD_BATCH_SIZE,
+    BUDGET_THRESHOLD_COALESCE_SECONDS,
+    BUDGET_THRESHOLD_LEASE_SECONDS,
+    SENDGRID_BATCH_RETRIES,
 )
 
 
 BUDGET_WARNING_TEMPLATE_ID = os.getenv("BUDGET_WARNING_TEMPLATE_ID")
 BUDGET_EXCEEDED_TEMPLATE_ID = os.getenv("BUDGET_EXCEEDED_TEMPLATE_ID")
+BUDGET_DIRTY_SET_KEY = "budget_thresholds:dirty"
+BUDGET_DRAIN_SCHEDULED_KEY = "budget_thresholds:scheduled"
+# Batches being checked, by claim time; each batch lives in its own set
+BUDGET_PROCESSING_KEY = "budget_thresholds:processing"
 
 
 def _retry_if_possible(task, exception: Exception) -> None:
@@ -26,32 +42,280 @@ def _retry_if_possible(task, exception: Exception) -> None:
         task.retry(exc=exception, countdown=60 * (task.request.retries + 1))
 
 
+def mark_budgets_dirty(*budget_ids) -> None:
+    """
+    Queue budgets for a coalesced threshold check.
+    Ids are collected in a Redis set and drained in batches by
+    process_dirty_budgets; without Redis they are checked right away.
+    """
+    budget_ids = [str(budget_id) for budget_id in budget_ids if budget_id]
+    if not budget_ids:
+        return
+
+    if redis_client is not None:
+        try:
+            pipe = redis_client.pipeline()
+            pipe.sadd(BUDGET_DIRTY_SET_KEY, *budget_ids)
+            # Only the first write of a burst schedules the drain
+            pipe.set(
+                BUDGET_DRAIN_SCHEDULED_KEY,
+                1,
+                nx=True,
+                ex=BUDGET_THRESHOLD_COALESCE_SECONDS,
+            )
+            _, scheduled = pipe.execute()
+            if scheduled:
+                process_dirty_budgets.apply_async(
+                    countdown=BUDGET_THRESHOLD_COALESCE_SECONDS
+                )
+            return
+        except redis.RedisError as e:
+            logger.warning(f"Redis error marking budgets dirty: {str(e)}")
+
+    check_budget_thresholds_batch.delay(budget_ids)
+
+
+@celery.task(name="process_dirty_budgets", bind=True, max_retries=3)
+def process_dirty_budgets(self) -> int:
+    """
+    Drain the dirty budget set in batches.
+    Each batch is moved to its own processing set and only dropped once its
+    check has committed, so ids of a worker that dies mid-batch are put back
+    by a later drain after BUDGET_THRESHOLD_LEASE_SECONDS.
+    """
+    if redis_client is None:
+        return 0
+
+    checked = 0
+    try:
+        _requeue_abandoned_batches()
+        while True:
+            batch_key = f"{BUDGET_PROCESSING_KEY}:{uuid.uuid4()}"
+            budget_ids = _claim_dirty_batch(batch_key)
+            if not budget_ids:
+                break
+            try:
+                _check_budgets(budget_ids)
+            except Exception:
+                # Put the batch back so the next drain picks it up
+                _release_batch(batch_key, requeue=True)
+                raise
+            _release_batch(batch_key)
+            checked += len(budget_ids)
+
+    except Exception as e:
+        logger.error(f"Error processing dirty budgets: {str(e)}")
+        _retry_if_possible(self, e)
+
+    logger.info(f"Checked thresholds for {checked} budgets")
+    return checked
+
+
+def _claim_dirty_batch(batch_key: str) -> list:
+    """Move up to a batch of dirty budget ids into the given processing set"""
+    candidates = redis_client.srandmember(
+        BUDGET_DIRTY_SET_KEY, BUDGET_THRESHOLD_BATCH_SIZE
+    )
+    if not candidates:
+        return []
+
+    # Register the batch first so a crash right after the move is recovered
+    redis_client.zadd(BUDGET_PROCESSING_KEY, {batch_key: time.time()})
+    pipe = redis_client.pipeline()
+    for budget_id in candidates:
+        pipe.smove(BUDGET_DIRTY_SET_KEY, batch_key, budget_id)
+    moved = pipe.execute()
+    # Ids another drain moved first are not ours
+    budget_ids = [budget_id for budget_id, ok in zip(candidates, moved) if ok]
+    if not budget_ids:
+        redis_client.zrem(BUDGET_PROCESSING_KEY, batch_key)
+    return budget_ids
+
+
+def _release_batch(batch_key: str, requeue: bool = False) -> None:
+    """Drop a processing set, putting its ids back in the dirty set if asked"""
+    pipe = redis_client.pipeline()
+    if requeue:
+        pipe.sunionstore(BUDGET_DIRTY_SET_KEY, [BUDGET_DIRTY_SET_KEY, batch_key])
+    pipe.delete(batch_key)
+    pipe.zrem(BUDGET_PROCESSING_KEY, batch_key)
+    pipe.execute()
+
+
+def _requeue_abandoned_batches() -> None:
+    """Put back the ids of batches claimed longer than the lease ago"""
+    expired = redis_client.zrangebyscore(
+        BUDGET_PROCESSING_KEY, 0, time.time() - BUDGET_THRESHOLD_LEASE_SECONDS
+    )
+    for batch_key in expired:
+        logger.warning(f"Requeuing abandoned budget threshold batch {batch_key}")
+        _release_batch(batch_key, requeue=True)
+
+
 @celery.task(name="check_budget_thresholds", bind=True, max_retries=3)
 def check_budget_thresholds(self, budget_id: int) -> bool:
     try:
-        budget = Budget.query.get(budget_id)
-        if not budget:
-            logger.warning(f"Budget not found for threshold check: {budget_id}")
-            return False
+        return bool(_check_budgets([budget_id]))
 
+    except Exception as e:
+        logger.error(f"Error checking budget thresholds for ID {budget_id}: {str(e)}")
+        _retry_if_possible(self, e)
+        return False
+
+
+@celery.task(name="check_budget_thresholds_batch", bind=True, max_retries=3)
+def check_budget_thresholds_batch(self, budget_ids: list) -> int:
+    """Check thresholds for many budgets loaded in one query."""
+    try:
+        return _check_budgets(budget_ids)
+
+    except Exception as e:
+        logger.error(f"Error checking budget thresholds for batch: {str(e)}")
+        _retry_if_possible(self, e)
+        return 0
+
+
+def _check_budgets(budget_ids: list) -> int:
+    """
+    Evaluate thresholds for a batch of budgets.
+    Budgets, users and categories are loaded with one query, stale flags are
+    reset with bulk UPDATEs and the notifications go to the mailer as one task.
+    Returns the number of notifications queued.
+    """
+    rows = (
+        db.session.query(Budget, User, Category)
+        .join(User, Budget.user_id == User.id)
+        .join(Category, Budget.category_id == Category.id)
+        .filter(Budget.id.in_(budget_ids), Budget.is_deleted == False)
+        .all()
+    )
+
+    reset_warning_ids = []
+    reset_exceeded_ids = []
+    notifications = []
+    for budget, user, category in rows:
         percentage_used = budget.percentage_used
-        budget.reset_notification_flags(percentage_used)  # Reset flags if needed
-        notification_type = _determine_notification_type(percentage_used, budget)
 
-        if not notification_type:
-            return False
+        # Same rules as Budget.reset_notification_flags, applied in bulk below
+        warning_sent = budget.warning_notification_sent
+        exceeded_sent = budget.exceeded_notification_sent
+        if percentage_used < 90 and warning_sent:
+            reset_warning_ids.append(budget.id)
+            warning_sent = False
+        if percentage_used < 100 and exceeded_sent:
+            reset_exceeded_ids.append(budget.id)
+            exceeded_sent = False
+
+        notification_type = _notification_type_for(
+            percentage_used, warning_sent, exceeded_sent
+        )
+        if not notification_type or not user.email:
+            continue
 
         logger.info(
             f"Budget {budget.id} {notification_type} threshold reached: {percentage_used}%"
         )
+        email_data = _prepare_base_email_data(
+            budget, user, category, calendar.month_name[budget.month]
+        )
+        _customize_email_data(
+            email_data, notification_type, budget, category, percentage_used
+        )
+        notifications.append(
+            {
+                "budget_id": str(budget.id),
+                "notification_type": notification_type,
+                "percentage": percentage_used,
+                "email_data": email_data,
+            }
+        )
 
-        send_budget_notification.delay(budget.id, notification_type, percentage_used)
-        return True
+    if reset_warning_ids:
+        Budget.query.filter(Budget.id.in_(reset_warning_ids)).update(
+            {"warning_notification_sent": False}, synchronize_session=False
+        )
+    if reset_exceeded_ids:
+        Budget.query.filter(Budget.id.in_(reset_exceeded_ids)).update(
+            {"exceeded_notification_sent": False}, synchronize_session=False
+        )
+    db.session.commit()
 
-    except Exception as e:
-        logger.error(f"Error checking budget thresholds for ID {budget_id}: {str(e)}")
-        _retry_if_possible(self, e)
-        return False
+    if notifications:
+        send_budget_notifications.delay(notifications)
+    return len(notifications)
+
+
+@celery.task(
+    name="send_budget_notifications",
+    bind=True,
+    max_retries=SENDGRID_BATCH_RETRIES,
+)
+def send_budget_notifications(self, notifications: list) -> int:
+    """
+    Send a batch of prepared budget notifications in batched SendGrid
+    requests and mark the sent ones with one UPDATE per notification type.
+    Rejected messages are retried individually through
+    send_budget_notification; messages deferred by transport errors are
+    retried as a batch with backoff.
+    """
+    messages = []
+    failed = []
+    for index, notification in enumerate(notifications):
+        try:
+            messages.append((index, _email_message(**notification["email_data"])))
+        except ValueError as e:
+            logger.error(
+                f"Invalid {notification['notification_type']} notification for budget {notification['budget_id']}: {str(e)}"
+            )
+            failed.append(index)
+
+    failed_messages, deferred_messages = send_emails(
+        [message for _, message in messages]
+    )
+    failed.extend(messages[position][0] for position in failed_messages)
+    deferred = {messages[position][0] for position in deferred_messages}
+
+    if deferred and self.request.retries >= self.max_retries:
+        # Out of batch retries; let each message retry on its own
+        logger.warning(
+            f"Handing {len(deferred)} deferred budget notifications to individual retries"
+        )
+        failed.extend(deferred)
+        deferred = set()
+
+    failed = set(failed)
+    sent = {BUDGET_WARNING_KEYWORD: [], BUDGET_EXCEEDED_KEYWORD: []}
+    for index, notification in enumerate(notifications):
+        if index in deferred:
+            continue
+        if index not in failed:
+            sent[notification["notification_type"]].append(notification["budget_id"])
+            continue
+        send_budget_notification.delay(
+            notification["budget_id"],
+            notification["notification_type"],
+            notification["percentage"],
+        )
+
+    if sent[BUDGET_WARNING_KEYWORD]:
+        Budget.query.filter(Budget.id.in_(sent[BUDGET_WARNING_KEYWORD])).update(
+            {"warning_notification_sent": True}, synchronize_session=False
+        )
+    if sent[BUDGET_EXCEEDED_KEYWORD]:
+        Budget.query.filter(Budget.id.in_(sent[BUDGET_EXCEEDED_KEYWORD])).update(
+            {"exceeded_notification_sent": True}, synchronize_session=False
+        )
+    db.session.commit()
+
+    count = sum(len(budget_ids) for budget_ids in sent.values())
+    logger.info(f"Sent {count} budget notifications")
+    if deferred:
+        raise self.retry(
+            args=[[notifications[index] for index in sorted(deferred)]],
+            exc=MailDeliveryError(f"Deferred {len(deferred)} budget notifications"),
+            countdown=retry_countdown(self.request.retries),
+        )
+    return count
 
 
 @celery.task(name="send_budget_notification", bind=True, max_retries=3)
@@ -88,20 +352,12 @@ def send_budget_notification(
 
 
 def send_email_data(recipient: str, subject: str, template: str, **kwargs) -> None:
-    if not all([recipient, subject, template]):
-        raise ValueError("Recipient, subject, and template are required")
-
-    template_data = kwargs  # Pass all kwargs as template data
+    message = _email_message(recipient, subject, template, **kwargs)
 
     try:
-        send_email(
-            to_email=recipient,
-            subject=subject,
-            template_id=_get_template_id(template),
-            template_data=template_data,
-        )
+        send_email(**message)
         logger.debug(f"Email sent to {recipient} with subject: {subject}")
-    except BadRequestsError as e:
+    except MailDeliveryError as e:
         logger.error(f"SendGrid API error sending email to {recipient}: {str(e)}")
         raise
     except Exception as e:
@@ -109,16 +365,28 @@ def send_email_data(recipient: str, subject: str, template: str, **kwargs) -> No
         raise
 
 
-def _determine_notification_type(percentage_used: float, budget: Budget) -> str | None:
-    """Determine the type of notification based on percentage used and flags."""
-    if (
-        percentage_used >= BUDGET_EXCEEDED_THRESHOLD
-        and not budget.exceeded_notification_sent
-    ):
+def _email_message(recipient: str, subject: str, template: str, **kwargs) -> dict:
+    """send_email arguments for a prepared budget email"""
+    if not all([recipient, subject, template]):
+        raise ValueError("Recipient, subject, and template are required")
+
+    return {
+        "to_email": recipient,
+        "subject": subject,
+        "template_id": _get_template_id(template),
+        "template_data": kwargs,  # Pass all kwargs as template data
+    }
+
+
+def _notification_type_for(
+    percentage_used: float, warning_sent: bool, exceeded_sent: bool
+) -> str | None:
+    """Notification due for a usage percentage given the flags already sent."""
+    if percentage_used >= BUDGET_EXCEEDED_THRESHOLD and not exceeded_sent:
         return BUDGET_EXCEEDED_KEYWORD
     elif (
         BUDGET_WARNING_THRESHOLD <= percentage_used < BUDGET_EXCEEDED_THRESHOLD
-        and not budget.warning_notification_sent
+        and not warning_sent
     ):
         return BUDGET_WARNING_KEYWORD
     return None
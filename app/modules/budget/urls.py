@@ -1,13 +1,28 @@
 from flask import Blueprint
 from flask_restful import Api
-from .resources import BudgetListResource, BudgetDetailResource, AllBudgetListResource
+from app.core.representations import use_fast_json
+from .resources import (
+    BudgetListResource,
+    BudgetDetailResource,
+    AllBudgetListResource,
+    BudgetBulkResource,
+    BudgetCopyForwardResource,
+)
 
 budget_bp = Blueprint("budget", __name__)
-budget_api = Api(budget_bp)
+budget_api = use_fast_json(Api(budget_bp))
 
 # Register endpoints
 budget_api.add_resource(AllBudgetListResource, "/budgets", endpoint="all-budgets")
 budget_api.add_resource(BudgetListResource, "/<user_id>/budgets", endpoint="budgets")
+budget_api.add_resource(
+    BudgetBulkResource, "/<user_id>/budgets/bulk", endpoint="budgets-bulk"
+)
+budget_api.add_resource(
+    BudgetCopyForwardResource,
+    "/<user_id>/budgets/copy-forward",
+    endpoint="budgets-copy-forward",
+)
 budget_api.add_resource(
     BudgetDetailResource, "/<user_id>/budgets/<budget_id>", endpoint="budget-detail"
 )
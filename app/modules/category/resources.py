@@ -15,6 +15,7 @@ from app.core.pagination import paginate
 from app.core.constants import UserRole
 from app.modules.user.models import User
 from app.core.utils import BaseListResource
+from app.modules.transaction_summary_report.services import ReportCache
 
 # Initialize schemas once
 category_schema = CategorySchema()
@@ -104,7 +105,10 @@ class CategoryDetailResource(Resource):
         data = request.get_json()
         # Validate and update
         category_update_schema.load(data, instance=existing_category, partial=True)
+        report_user_ids = CategoryService.report_user_ids(existing_category)
         db.session.commit()
+        # Reports show category names
+        ReportCache.bump(*report_user_ids)
         logger.info(f"Category updated successfully: {category_id}")
         return category_schema.dump(existing_category), 200
 
@@ -25,3 +25,16 @@ class CategoryService:
         if has_transactions or has_budgets or has_recurring_transactions:
             return False
         return True
+
+    @staticmethod
+    def report_user_ids(category):
+        """Users whose reports show this category"""
+        if not category.is_predefined:
+            return [category.user_id]
+        # Predefined categories are shared, so every user with transactions in it
+        return [
+            user_id
+            for (user_id,) in db.session.query(Transaction.user_id)
+            .filter(Transaction.category_id == category.id)
+            .distinct()
+        ]
@@ -1,5 +1,6 @@
 from flask import Blueprint
 from flask_restful import Api
+from app.core.representations import use_fast_json
 from app.modules.category.resources import (
     CategoryListResource,
     CategoryDetailResource,
@@ -9,7 +10,7 @@ import uuid
 
 # Create a blueprint for the users module
 category_bp = Blueprint("categories", __name__)
-category_api = Api(category_bp)
+category_api = use_fast_json(Api(category_bp))
 
 # Add resources to the API
 category_api.add_resource(
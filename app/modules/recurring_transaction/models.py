@@ -1,7 +1,7 @@
 from app.core.models import BaseModel
 from app.extensions import db
 from app.core.constants import Frequency, TransactionType
-from datetime import datetime
+from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 import calendar
 
@@ -43,6 +43,48 @@ class RecurringTransaction(BaseModel):
         "SavingPlan",
         backref=db.backref("recurring_transactions", lazy=True, cascade="all, delete"),
     )
+    __table_args__ = (
+        db.Index(
+            "ix_recurring_transactions_next_transaction_at",
+            "next_transaction_at",
+            postgresql_where=db.text("NOT is_deleted"),
+        ),
+    )
+
+    def get_due_run_dates(self, until):
+        """
+        Return every run date from next_transaction_at up to until (and ends_at),
+        computed directly instead of stepping get_next_run_date once per tick.
+        """
+        current_date = self.next_transaction_at
+        if self.ends_at and self.ends_at < until:
+            until = self.ends_at
+        if current_date > until:
+            return []
+
+        if self.frequency in (Frequency.DAILY, Frequency.WEEKLY):
+            step = timedelta(days=1 if self.frequency == Frequency.DAILY else 7)
+            count = (until - current_date) // step + 1
+            return [current_date + step * i for i in range(count)]
+
+        if self.frequency == Frequency.MONTHLY:
+            months = (until.year - current_date.year) * 12 + (
+                until.month - current_date.month
+            )
+            run_dates = [current_date] + [
+                self._monthly_run_date(current_date, i) for i in range(1, months + 1)
+            ]
+        elif self.frequency == Frequency.YEARLY:
+            # After the first step a February 29th run date stays on the 28th
+            first_run = self._calculate_yearly_next_run(current_date)
+            run_dates = [current_date] + [
+                first_run + relativedelta(years=i)
+                for i in range(until.year - current_date.year)
+            ]
+        else:
+            return [current_date]
+
+        return [run_date for run_date in run_dates if run_date <= until]
 
     def get_next_run_date(self, current_date):
         """Calculate the next run date based on frequency"""
@@ -61,7 +103,11 @@ class RecurringTransaction(BaseModel):
         Calculate next monthly run date while preserving the original day when possible.
         Falls back to last day of month if original day doesn't exist in target month.
         """
-        next_month = current_date + relativedelta(months=1)
+        return self._monthly_run_date(current_date, 1)
+
+    def _monthly_run_date(self, current_date, months):
+        """Run date the given number of months after current_date"""
+        next_month = current_date + relativedelta(months=months)
         last_day_of_month = calendar.monthrange(next_month.year, next_month.month)[1]
 
         # Use the day from starts_at date, but don't exceed month's last day
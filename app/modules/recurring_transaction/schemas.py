@@ -3,6 +3,7 @@ from marshmallow import fields, validates, validates_schema, ValidationError
 from app.core.validators import validate_amount
 from app.core.constants import Frequency, TransactionType
 from app.core.schemas import BaseSchema
+from app.core.lookups import get_cached
 from app.modules.user.models import User
 from app.modules.category.models import Category
 from app.modules.saving_plan.models import SavingPlan
@@ -31,19 +32,16 @@ class BaseRecurringTransactionSchema(BaseSchema):
 
     def _get_user(self, user_id):
         """Helper method to get user by ID."""
-        user = User.query.filter_by(id=user_id, is_deleted=False).first()
-        if not user:
+        user = get_cached(User, user_id)
+        if not user or user.is_deleted:
             raise ValidationError("User not found")
         return user
 
     def _get_category(self, category_id, user_id):
         """Helper method to get category by ID."""
-        category = Category.query.filter(
-            Category.id == category_id,
-            Category.is_deleted == False,
-        ).first()
+        category = get_cached(Category, category_id)
 
-        if not category:
+        if not category or category.is_deleted:
             raise ValidationError("Category not found")
         if not category.is_predefined and category.user_id != user_id:
             raise ValidationError("Category does not belong to the user")
@@ -52,11 +50,13 @@ class BaseRecurringTransactionSchema(BaseSchema):
 
     def _get_saving_plan(self, saving_plan_id, user_id):
         """Helper method to get and validate saving plan."""
-        saving_plan = SavingPlan.query.filter_by(
-            id=saving_plan_id, user_id=user_id, is_deleted=False
-        ).first()
+        saving_plan = get_cached(SavingPlan, saving_plan_id)
 
-        if not saving_plan:
+        if (
+            not saving_plan
+            or saving_plan.is_deleted
+            or str(saving_plan.user_id) != str(user_id)
+        ):
             raise ValidationError("Saving plan not found")
 
         if saving_plan.status in ["COMPLETED", "PAUSED"]:
@@ -1,22 +1,35 @@
 import os
+import uuid
+from collections import defaultdict
 from app.celery_app import celery
 from datetime import datetime
 from decimal import Decimal
-from sqlalchemy import func
+from sqlalchemy import func, insert
+from sqlalchemy.orm import selectinload
 from app.extensions import db
 from app.core.logger import logger
 from app.modules.transaction.models import Transaction
 from app.modules.recurring_transaction.models import RecurringTransaction
 from app.modules.saving_plan.models import SavingPlan
-from app.modules.budget.tasks import check_budget_thresholds
-from app.core.mail import send_email
-from typing import Dict, Any
+from app.modules.budget.tasks import mark_budgets_dirty
+from app.modules.transaction_summary_report.services import ReportCache
 from app.modules.transaction.services import (
-    update_budget_on_transaction_created,
-    update_saving_plan_on_transaction_created,
+    LedgerService,
+    TransactionRollupService,
 )
+from app.core.mail import (
+    send_email,
+    send_emails,
+    retry_countdown,
+    MailDeliveryError,
+)
+from typing import Dict, Any, List
 from datetime import timezone
-from app.core.constants import TransactionType
+from app.core.constants import (
+    TransactionType,
+    RECURRING_TRANSACTION_BATCH_SIZE,
+    SENDGRID_BATCH_RETRIES,
+)
 
 SENDGRID_SAVINGS_PLAN_COMPLETION_TEMPLATE_ID = os.getenv("SAVING_PLAN_COMPLETED")
 SENDGRID_RECURRING_TRANSACTION_TEMPLATE_ID = os.getenv(
@@ -45,77 +58,117 @@ def send_transaction_notification(
         raise self.retry(exc=e)  # Use self.retry for bound task
 
 
+@celery.task(
+    name="send_transaction_notifications",
+    bind=True,
+    max_retries=SENDGRID_BATCH_RETRIES,
+)
+def send_transaction_notifications(self, notifications: List[Dict[str, Any]]) -> None:
+    """Send the notifications of one processed batch.
+
+    Messages go out in batched SendGrid requests; rejected messages are
+    handed to send_transaction_notification so they are retried individually
+    without resending the rest of the batch. Messages deferred by timeouts
+    or connection errors are retried as a batch with backoff.
+    """
+    failed, deferred = send_emails(
+        [
+            {
+                "to_email": notification["user_email"],
+                "subject": notification["subject"],
+                "template_data": notification["template_data"],
+                "template_id": notification["template_id"],
+            }
+            for notification in notifications
+        ]
+    )
+    if deferred and self.request.retries >= self.max_retries:
+        # Out of batch retries; let each message retry on its own
+        logger.warning(
+            f"Handing {len(deferred)} deferred transaction notifications to individual retries"
+        )
+        failed, deferred = sorted(failed + deferred), []
+
+    for index in failed:
+        notification = notifications[index]
+        send_transaction_notification.delay(
+            notification["user_email"],
+            notification["subject"],
+            notification["template_data"],
+            notification["template_id"],
+        )
+    if deferred:
+        raise self.retry(
+            args=[[notifications[index] for index in deferred]],
+            exc=MailDeliveryError(f"Deferred {len(deferred)} transaction notifications"),
+            countdown=retry_countdown(self.request.retries),
+        )
+
+
 @celery.task(bind=True)
 def process_recurring_transactions(self):
-    """Process daily recurring transactions - Runs once per day"""
+    """Process due recurring transactions in locked batches.
+
+    Each batch is claimed with FOR UPDATE SKIP LOCKED and committed at once,
+    so several workers can drain the due set without posting a rule twice.
+    A failing batch is retried rule by rule; rules that still fail, or that
+    were claimed but not advanced, are skipped for the rest of the run and
+    picked up again on the next one.
+    """
     try:
         now = datetime.now(timezone.utc)
+        logger.info(f"Current time: {now}")
+        # Run dates are stored as naive UTC datetimes; claiming and posting
+        # must agree on the cutoff whatever the session time zone is
+        until = now.replace(tzinfo=None)
 
-        recurring_transactions = (
-            RecurringTransaction.query.join(RecurringTransaction.user)
-            .join(RecurringTransaction.category, isouter=True)
-            .join(RecurringTransaction.saving_plan, isouter=True)
-            .filter(
-                RecurringTransaction.next_transaction_at <= now,
-                RecurringTransaction.is_deleted == False,
-            )
-            .all()
-        )
+        processed = 0
+        failed_ids = set()
+        while True:
+            recurring_transactions = _claim_due_batch(until, failed_ids)
+            if not recurring_transactions:
+                break
 
-        logger.info(f"Current time: {now}")
-        logger.info(f"Found {len(recurring_transactions)} recurring transactions")
-        for rec_txn in recurring_transactions:
-            logger.info(
-                f"Transaction ID: {rec_txn.id}, Next run: {rec_txn.next_transaction_at}"
-            )
+            batch_ids = [rec_txn.id for rec_txn in recurring_transactions]
             try:
-                if not _is_transaction_valid(rec_txn):
-                    rec_txn.is_deleted = True
-                    db.session.commit()
-                    continue
-
-                # Create new transaction
-                new_transaction = _create_transaction(rec_txn)
-                db.session.add(new_transaction)
-                db.session.flush()
-
-                # Update budget
-
-                # Handle category or savings plan
-                if rec_txn.category_id and rec_txn.type == TransactionType.DEBIT.value:
-                    check_budget_thresholds.delay(new_transaction.id)
-                    update_budget_on_transaction_created(new_transaction)
-                elif rec_txn.saving_plan_id:
-                    update_saving_plan_on_transaction_created(rec_txn, new_transaction)
-
-                # Update next run date
-                rec_txn.next_transaction_at = rec_txn.get_next_run_date(
-                    rec_txn.next_transaction_at
+                budget_ids, notifications, stalled_ids = _process_batch(
+                    recurring_transactions, until
                 )
+                # Read before the commit expires the batch
+                user_ids = {rec_txn.user_id for rec_txn in recurring_transactions}
                 db.session.commit()
-
-                # Send notification
-                send_transaction_notification.delay(
-                    rec_txn.user.email,
-                    "Recurring Transaction Created",
-                    {
-                        "subject": "Recurring Transaction",
-                        "transaction_amount": f"{float(rec_txn.amount):.2f}",
-                        "transaction_date": rec_txn.next_transaction_at.strftime(
-                            "%Y-%m-%d"
-                        ),
-                        "description": rec_txn.description or "No description provided",
-                    },
-                    SENDGRID_RECURRING_TRANSACTION_TEMPLATE_ID,
-                )
-
+                batch_processed = len(batch_ids)
             except Exception as e:
                 db.session.rollback()
                 logger.error(
-                    f"Error processing recurring transaction {rec_txn.id}: {str(e)}",
+                    f"Error processing recurring transaction batch, retrying rule by rule: {str(e)}",
                     exc_info=True,
                 )
-                continue  # Continue to next transaction instead of failing the whole task
+                budget_ids, notifications, user_ids, rule_failures, stalled_ids = (
+                    _process_rules_individually(batch_ids, until)
+                )
+                failed_ids.update(rule_failures)
+                batch_processed = len(batch_ids) - len(rule_failures)
+
+            if stalled_ids:
+                # Never claim a rule that did not move forward again this run
+                logger.warning(
+                    f"Recurring transactions claimed but not advanced: {sorted(map(str, stalled_ids))}"
+                )
+                failed_ids.update(stalled_ids)
+                batch_processed -= len(stalled_ids)
+
+            processed += batch_processed
+            mark_budgets_dirty(*budget_ids)
+            ReportCache.bump(*user_ids)
+            if notifications:
+                send_transaction_notifications.delay(notifications)
+
+        if failed_ids:
+            logger.error(
+                f"Skipped {len(failed_ids)} failing recurring transactions: {sorted(map(str, failed_ids))}"
+            )
+        logger.info(f"Processed {processed} recurring transactions")
 
     except Exception as e:
         logger.error(
@@ -124,6 +177,147 @@ def process_recurring_transactions(self):
         raise self.retry(exc=e)  # Retry the entire task on fatal error
 
 
+def _due_query(until: datetime):
+    return RecurringTransaction.query.options(
+        selectinload(RecurringTransaction.user),
+        selectinload(RecurringTransaction.category),
+        selectinload(RecurringTransaction.saving_plan),
+    ).filter(
+        RecurringTransaction.next_transaction_at <= until,
+        RecurringTransaction.is_deleted == False,
+    )
+
+
+def _claim_due_batch(until: datetime, exclude_ids=()) -> List[RecurringTransaction]:
+    """Lock the next batch of due recurring transactions for this worker"""
+    query = _due_query(until)
+    if exclude_ids:
+        query = query.filter(RecurringTransaction.id.notin_(exclude_ids))
+    return (
+        query.order_by(RecurringTransaction.next_transaction_at)
+        .limit(RECURRING_TRANSACTION_BATCH_SIZE)
+        .with_for_update(skip_locked=True, of=RecurringTransaction)
+        .all()
+    )
+
+
+def _process_rules_individually(rule_ids, until: datetime):
+    """
+    Process a failed batch one rule per transaction so a single bad rule
+    does not hold back the others.
+    Returns budget ids, notifications, user ids, the ids that failed and
+    the ids that were not advanced.
+    """
+    budget_ids, notifications, user_ids, failed, stalled = [], [], set(), [], []
+    for rule_id in rule_ids:
+        try:
+            rec_txn = (
+                _due_query(until)
+                .filter(RecurringTransaction.id == rule_id)
+                .with_for_update(skip_locked=True, of=RecurringTransaction)
+                .first()
+            )
+            if rec_txn is None:
+                continue
+            user_id = rec_txn.user_id
+            rule_budget_ids, rule_notifications, rule_stalled = _process_batch(
+                [rec_txn], until
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(
+                f"Error processing recurring transaction {rule_id}: {str(e)}",
+                exc_info=True,
+            )
+            failed.append(rule_id)
+            continue
+
+        budget_ids.extend(rule_budget_ids)
+        notifications.extend(rule_notifications)
+        user_ids.add(user_id)
+        stalled.extend(rule_stalled)
+    return budget_ids, notifications, user_ids, failed, stalled
+
+
+def _process_batch(
+    recurring_transactions: List[RecurringTransaction], until: datetime
+):
+    """
+    Post every occurrence due up to until (naive UTC) for the claimed
+    recurring transactions.
+    Returns the ids of the budgets that changed, the notifications to send
+    and the ids of the rules that were neither advanced nor removed.
+    """
+    transactions = []
+    budget_deltas = defaultdict(Decimal)
+    saving_plan_deltas = defaultdict(Decimal)
+    rollup_deltas = defaultdict(lambda: (Decimal("0"), 0))
+    notifications = []
+    stalled_ids = []
+
+    for rec_txn in recurring_transactions:
+        if not _is_transaction_valid(rec_txn):
+            rec_txn.is_deleted = True
+            continue
+
+        # Catch up on every missed occurrence at once
+        run_dates = rec_txn.get_due_run_dates(until)
+        for transaction_at in run_dates:
+            transactions.append(_transaction_values(rec_txn, transaction_at))
+
+            rollup_key = (
+                rec_txn.user_id,
+                transaction_at.year,
+                transaction_at.month,
+                rec_txn.category_id,
+                rec_txn.saving_plan_id,
+                rec_txn.type,
+            )
+            amount, count = rollup_deltas[rollup_key]
+            rollup_deltas[rollup_key] = (amount + rec_txn.amount, count + 1)
+
+            # Handle category or savings plan
+            if rec_txn.category_id and rec_txn.type == TransactionType.DEBIT:
+                key = (
+                    rec_txn.user_id,
+                    rec_txn.category_id,
+                    transaction_at.year,
+                    transaction_at.month,
+                )
+                budget_deltas[key] += rec_txn.amount
+            elif rec_txn.saving_plan_id:
+                saving_plan_deltas[rec_txn.saving_plan_id] += rec_txn.amount
+
+            notifications.append(
+                {
+                    "user_email": rec_txn.user.email,
+                    "subject": "Recurring Transaction Created",
+                    "template_data": {
+                        "subject": "Recurring Transaction",
+                        "transaction_amount": f"{float(rec_txn.amount):.2f}",
+                        "transaction_date": transaction_at.strftime("%Y-%m-%d"),
+                        "description": rec_txn.description
+                        or "No description provided",
+                    },
+                    "template_id": SENDGRID_RECURRING_TRANSACTION_TEMPLATE_ID,
+                }
+            )
+
+        # Update next run date
+        if run_dates:
+            rec_txn.next_transaction_at = rec_txn.get_next_run_date(run_dates[-1])
+        else:
+            stalled_ids.append(rec_txn.id)
+
+    if transactions:
+        db.session.execute(insert(Transaction), transactions)
+    TransactionRollupService.apply_deltas(rollup_deltas)
+    budget_ids = LedgerService.apply_budget_deltas(budget_deltas)
+    LedgerService.apply_saving_plan_deltas(saving_plan_deltas)
+    return budget_ids, notifications, stalled_ids
+
+
 def _is_transaction_valid(rec_txn: RecurringTransaction) -> bool:
     """Check if the recurring transaction is valid for processing"""
     return (
@@ -134,17 +328,20 @@ def _is_transaction_valid(rec_txn: RecurringTransaction) -> bool:
     )
 
 
-def _create_transaction(rec_txn: RecurringTransaction) -> Transaction:
-    """Create a new transaction for the recurring transaction"""
-    return Transaction(
-        user_id=rec_txn.user_id,
-        category_id=rec_txn.category_id,
-        saving_plan_id=rec_txn.saving_plan_id,
-        type=rec_txn.type,
-        amount=rec_txn.amount,
-        transaction_at=rec_txn.next_transaction_at,
-        description=rec_txn.description,
-    )
+def _transaction_values(
+    rec_txn: RecurringTransaction, transaction_at: datetime
+) -> Dict[str, Any]:
+    """Column values of the transaction posted for one occurrence"""
+    return {
+        "id": uuid.uuid4(),
+        "user_id": rec_txn.user_id,
+        "category_id": rec_txn.category_id,
+        "saving_plan_id": rec_txn.saving_plan_id,
+        "type": rec_txn.type,
+        "amount": rec_txn.amount,
+        "transaction_at": transaction_at,
+        "description": rec_txn.description,
+    }
 
 
 # def _process_savings_plan(
@@ -1,5 +1,6 @@
 from flask import Blueprint
 from flask_restful import Api
+from app.core.representations import use_fast_json
 from .resources import (
     RecurringTransactionListResource,
     RecurringTransactionResource,
@@ -8,7 +9,7 @@ from .resources import (
 
 # Create a blueprint for the users module
 recurring_transaction_bp = Blueprint("recurring_transactions", __name__)
-recurring_transaction_api = Api(recurring_transaction_bp)
+recurring_transaction_api = use_fast_json(Api(recurring_transaction_bp))
 
 # Add resources to the API
 recurring_transaction_api.add_resource(
@@ -11,6 +11,7 @@ from app.core.responses import validation_error_response
 from functools import wraps
 from app.core.decorators import handle_errors
 from app.core.utils import BaseListResource
+from app.modules.transaction_summary_report.services import ReportCache
 
 saving_plans_schemas = SavingPlanSchema(many=True)
 
@@ -81,6 +82,8 @@ class SavingPlanResource(Resource):
         self.update_schema.context["instance"] = saving_plan
         saving_plan = self.update_schema.load(data, instance=saving_plan, partial=True)
         db.session.commit()
+        # Reports show saving plan names
+        ReportCache.bump(user_id)
         return self.schema.dump(saving_plan), 200
 
     @authenticated_user
@@ -90,4 +93,6 @@ class SavingPlanResource(Resource):
         saving_plan = SavingPlan.query.get_or_404(saving_plan_id)
         saving_plan.is_deleted = True
         db.session.commit()
+        # Reports leave out deleted saving plans
+        ReportCache.bump(user_id)
         return {}, 204
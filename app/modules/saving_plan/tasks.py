@@ -4,11 +4,22 @@ from celery import shared_task
 from app.extensions import db
 from app.modules.saving_plan.models import SavingPlan
 from app.modules.user.models import User
-from app.core.mail import send_email
+from app.core.mail import (
+    send_email,
+    send_emails,
+    retry_countdown,
+    MailDeliveryError,
+)
 from app.modules.transaction.models import Transaction
-from app.core.constants import Frequency, SavingPlanStatus
+from app.core.constants import (
+    Frequency,
+    SavingPlanStatus,
+    SAVING_PLAN_SWEEP_BATCH_SIZE,
+    SENDGRID_BATCH_RETRIES,
+)
+from app.core.logger import logger
 from app.celery_app import celery
-from sqlalchemy import func
+from sqlalchemy import and_, case, func
 from decimal import Decimal
 
 TEMPLATE_ID = os.environ.get("CURRENT_EMAIL_TEMPLATE_ID")
@@ -16,43 +27,112 @@ SAVING_PLAN_COMPLETED = os.environ.get("SAVING_PLAN_COMPLETED")
 SAVINGS_PLAN_CREATED = os.environ.get("SAVINGS_PLAN_CREATED")
 SAVINGS_PLAN_DATE_EXTENDED = os.environ.get("SAVINGS_PLAN_DATE_EXTENDED")
 
+# Days an overdue plan is pushed back by; other frequencies get a year
+AUTO_EXTEND_DAYS = {Frequency.MONTHLY: 30, Frequency.WEEKLY: 7}
+
 
 @celery.task
 def check_overdue_savings_plans():
-    """Check for overdue savings plans and apply the hybrid auto-extension approach."""
+    """
+    Check for overdue savings plans and apply the hybrid auto-extension approach.
+    Plans are swept in id order in batches: one grouped query gives the saved
+    totals of a batch, completions and extensions are applied as bulk UPDATEs
+    and the emails are handed to send_saving_plan_notifications.
+    """
     today = datetime.today().date()
 
-    # Query overdue active plans
-    overdue_plans = SavingPlan.query.filter(
-        SavingPlan.current_deadline < today,
-        SavingPlan.is_deleted == False,
-        SavingPlan.status == SavingPlanStatus.ACTIVE,
-    ).all()
+    swept = 0
+    last_id = None
+    while True:
+        plans = _overdue_plans_batch(today, last_id)
+        if not plans:
+            break
+        last_id = plans[-1].id
+
+        try:
+            _sweep_overdue_batch(plans)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error sweeping overdue savings plans after {last_id}: {str(e)}")
+            continue
+        swept += len(plans)
+
+    logger.info(f"Swept {swept} overdue savings plans")
+    return swept
+
+
+def _overdue_plans_batch(today, last_id=None):
+    """Next batch of overdue active plans with their owner, ordered by id"""
+    query = (
+        db.session.query(
+            SavingPlan.id,
+            SavingPlan.name,
+            SavingPlan.amount,
+            SavingPlan.current_deadline,
+            SavingPlan.frequency,
+            User.name.label("user_name"),
+            User.email.label("user_email"),
+        )
+        .join(User, SavingPlan.user_id == User.id)
+        .filter(
+            SavingPlan.current_deadline < today,
+            SavingPlan.is_deleted == False,
+            SavingPlan.status == SavingPlanStatus.ACTIVE,
+        )
+    )
+    if last_id is not None:
+        query = query.filter(SavingPlan.id > last_id)
+    return query.order_by(SavingPlan.id).limit(SAVING_PLAN_SWEEP_BATCH_SIZE).all()
+
+
+def _saved_totals(plan_ids):
+    """Total saved per plan for the given ids, in one grouped query"""
+    rows = (
+        db.session.query(Transaction.saving_plan_id, func.sum(Transaction.amount))
+        .filter(
+            Transaction.saving_plan_id.in_(plan_ids),
+            Transaction.is_deleted == False,
+        )
+        .group_by(Transaction.saving_plan_id)
+        .all()
+    )
+    return {plan_id: total or Decimal("0") for plan_id, total in rows}
 
-    for plan in overdue_plans:
-        # Calculate total saved amount
-        total_saved = db.session.query(func.sum(Transaction.amount)).filter(
-            Transaction.saving_plan_id == plan.id
-        ).scalar() or Decimal("0")
+
+def _sweep_overdue_batch(plans):
+    """Complete or extend one batch of overdue plans and queue their emails"""
+    totals = _saved_totals([plan.id for plan in plans])
+
+    completed_ids = []
+    extended_ids = {}
+    notifications = []
+    for plan in plans:
+        total_saved = totals.get(plan.id, Decimal("0"))
 
         # Check if target reached
         if total_saved >= plan.amount:
-            plan.status = SavingPlanStatus.COMPLETED
-            db.session.commit()
-            send_savings_plan_completion_notification.delay(plan.id)
+            completed_ids.append(plan.id)
+            notifications.append(
+                {
+                    "to_email": plan.user_email,
+                    "subject": "Savings has been completed",
+                    "template_id": SAVING_PLAN_COMPLETED,
+                    "template_data": {
+                        "target_amount": float(plan.amount),
+                        "total_saved": float(total_saved),
+                        "user_name": plan.user_name,
+                    },
+                }
+            )
             continue
 
         # Determine extension period
-        auto_extend_days = (
-            30
-            if plan.frequency == Frequency.MONTHLY
-            else 7 if plan.frequency == Frequency.WEEKLY else 365
-        )
+        auto_extend_days = AUTO_EXTEND_DAYS.get(plan.frequency, 365)
+        extended_ids.setdefault(auto_extend_days, []).append(plan.id)
         new_deadline = plan.current_deadline + timedelta(days=auto_extend_days)
 
-        # Send notification email
         template_data = {
-            "user_name": plan.user.name,
+            "user_name": plan.user_name,
             "plan_name": plan.name,
             "deadline": plan.current_deadline.strftime("%Y-%m-%d"),
             "new_deadline": new_deadline.strftime("%Y-%m-%d"),
@@ -61,81 +141,198 @@ def check_overdue_savings_plans():
             "remaining_amount": f"{float(plan.amount - total_saved):,.2f}",
             "message": f"Your savings plan deadline has passed, and we are extending it automatically to {new_deadline.strftime('%Y-%m-%d')}.",
         }
+        notifications.append(
+            {
+                "to_email": plan.user_email,
+                "subject": f"Your Savings Plan {plan.name} Deadline Passed - Auto-Extension in Progress",
+                "template_id": SAVINGS_PLAN_DATE_EXTENDED,
+                "template_data": template_data,
+            }
+        )
 
-        send_email(
-            to_email=plan.user.email,
-            subject=f"Your Savings Plan {plan.name} Deadline Passed - Auto-Extension in Progress",
-            template_id=SAVINGS_PLAN_DATE_EXTENDED,
-            template_data=template_data,
+    if completed_ids:
+        SavingPlan.query.filter(
+            SavingPlan.id.in_(completed_ids),
+            SavingPlan.status == SavingPlanStatus.ACTIVE,
+        ).update({"status": SavingPlanStatus.COMPLETED}, synchronize_session=False)
+
+    # One UPDATE per extension length
+    for days, plan_ids in extended_ids.items():
+        SavingPlan.query.filter(
+            SavingPlan.id.in_(plan_ids),
+            SavingPlan.status == SavingPlanStatus.ACTIVE,
+        ).update(
+            {"current_deadline": SavingPlan.current_deadline + days},
+            synchronize_session=False,
         )
+    db.session.commit()
+
+    if notifications:
+        send_saving_plan_notifications.delay(notifications)
+
 
-        # Update deadline
-        plan.current_deadline = new_deadline
-        db.session.commit()
+@celery.task(
+    name="send_saving_plan_notifications",
+    bind=True,
+    max_retries=SENDGRID_BATCH_RETRIES,
+)
+def send_saving_plan_notifications(self, notifications):
+    """
+    Send a batch of prepared saving plan emails through batched SendGrid
+    requests. Rejected messages are retried individually through
+    send_saving_plan_email; messages deferred by transport errors are
+    retried as a batch with backoff.
+    """
+    failed, deferred = send_emails(notifications)
+    sent = len(notifications) - len(failed) - len(deferred)
+    logger.info(f"Sent {sent} saving plan emails")
+
+    if deferred and self.request.retries >= self.max_retries:
+        # Out of batch retries; let each message retry on its own
+        logger.warning(
+            f"Handing {len(deferred)} deferred saving plan emails to individual retries"
+        )
+        failed, deferred = sorted(failed + deferred), []
+
+    for index in failed:
+        send_saving_plan_email.delay(notifications[index])
+    if deferred:
+        raise self.retry(
+            args=[[notifications[index] for index in deferred]],
+            exc=MailDeliveryError(f"Deferred {len(deferred)} saving plan emails"),
+            countdown=retry_countdown(self.request.retries),
+        )
+    return sent
+
+
+@celery.task(name="send_saving_plan_email", bind=True, max_retries=3)
+def send_saving_plan_email(self, notification):
+    """Send a single prepared saving plan email with retries"""
+    try:
+        send_email(**notification)
+    except Exception as e:
+        logger.error(
+            f"Error sending saving plan email to {notification['to_email']}: {str(e)}"
+        )
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
+        raise
 
 
 @celery.task
 def check_savings_progress():
-    """Monitor savings progress and send alerts if behind schedule."""
+    """
+    Monitor savings progress and send alerts if behind schedule.
+    Lifetime and current-period totals of every active plan come from one
+    grouped query; reminders are queued in batches for the mail stage.
+    """
     today = datetime.today().date()
+    tomorrow = today + timedelta(days=1)
 
-    active_plans = SavingPlan.query.filter(
-        SavingPlan.is_deleted == False,
-        SavingPlan.status == SavingPlanStatus.ACTIVE,
-        SavingPlan.current_deadline >= today,
-    ).all()
-
-    for plan in active_plans:
-        total_saved = db.session.query(func.sum(Transaction.amount)).filter(
-            Transaction.saving_plan_id == plan.id
-        ).scalar() or Decimal("0")
+    # Period boundaries are the same for every plan of a frequency
+    period_start = case(
+        (SavingPlan.frequency == Frequency.MONTHLY, today.replace(day=1)),
+        (
+            SavingPlan.frequency == Frequency.WEEKLY,
+            today - timedelta(days=today.weekday()),
+        ),
+        else_=today,
+    )
+    total_saved = func.coalesce(func.sum(Transaction.amount), 0)
+    period_savings = func.coalesce(
+        func.sum(Transaction.amount).filter(
+            Transaction.transaction_at >= period_start,
+            Transaction.transaction_at < tomorrow,
+        ),
+        0,
+    )
 
-        remaining_amount = plan.amount - total_saved
-        days_remaining = (plan.current_deadline - today).days
+    rows = (
+        db.session.query(
+            SavingPlan.name,
+            SavingPlan.amount,
+            SavingPlan.current_deadline,
+            SavingPlan.frequency,
+            User.name.label("user_name"),
+            User.email.label("user_email"),
+            total_saved.label("total_saved"),
+            period_savings.label("period_savings"),
+        )
+        .join(User, SavingPlan.user_id == User.id)
+        .outerjoin(
+            Transaction,
+            and_(
+                Transaction.saving_plan_id == SavingPlan.id,
+                Transaction.is_deleted == False,
+            ),
+        )
+        .filter(
+            SavingPlan.is_deleted == False,
+            SavingPlan.status == SavingPlanStatus.ACTIVE,
+            SavingPlan.current_deadline >= today,
+        )
+        .group_by(SavingPlan.id, User.id)
+        .execution_options(yield_per=SAVING_PLAN_SWEEP_BATCH_SIZE)
+    )
 
-        if days_remaining <= 0 or remaining_amount <= 0:
+    queued = 0
+    notifications = []
+    for plan in rows:
+        notification = _progress_reminder(plan, today)
+        if notification is None:
             continue
+        notifications.append(notification)
+        if len(notifications) >= SAVING_PLAN_SWEEP_BATCH_SIZE:
+            send_saving_plan_notifications.delay(notifications)
+            queued += len(notifications)
+            notifications = []
 
-        # Calculate required savings per period
-        if plan.frequency == Frequency.MONTHLY:
-            remaining_periods = max((days_remaining + 29) // 30, 1)
-            period_start = today.replace(day=1)
-        elif plan.frequency == Frequency.WEEKLY:
-            remaining_periods = max((days_remaining + 6) // 7, 1)
-            period_start = today - timedelta(days=today.weekday())
-        else:
-            remaining_periods = max(days_remaining, 1)
-            period_start = today
-
-        required_per_period = remaining_amount / remaining_periods
-
-        # Calculate current period savings
-        period_savings = db.session.query(func.sum(Transaction.amount)).filter(
-            Transaction.saving_plan_id == plan.id,
-            Transaction.transaction_at >= period_start,
-            Transaction.transaction_at <= today,
-        ).scalar() or Decimal("0")
-
-        if period_savings < required_per_period:
-            template_data = {
-                "user_name": plan.user.name,
-                "plan_name": plan.name,
-                "target_amount": f"{float(plan.amount):,.2f}",
-                "total_saved": f"{float(total_saved):,.2f}",
-                "remaining_amount": f"{float(remaining_amount):,.2f}",
-                "required_per_period": f"{float(required_per_period):,.2f}",
-                "saved_this_period": f"{float(period_savings):,.2f}",
-                "frequency": plan.frequency.value.lower(),
-                "days_remaining": days_remaining,
-                "message": f"You need to save {required_per_period:.2f} per {plan.frequency.value.lower()} to meet your goal by {plan.current_deadline}",
-            }
+    if notifications:
+        send_saving_plan_notifications.delay(notifications)
+        queued += len(notifications)
 
-            send_email(
-                to_email=plan.user.email,
-                subject=f"Reminder: You need to save {required_per_period:.2f} for {plan.name}",
-                template_id=TEMPLATE_ID,
-                template_data=template_data,
-            )
+    logger.info(f"Queued {queued} savings progress reminders")
+    return queued
+
+
+def _progress_reminder(plan, today):
+    """Reminder email for a plan behind schedule, or None if it is on track"""
+    remaining_amount = plan.amount - plan.total_saved
+    days_remaining = (plan.current_deadline - today).days
+
+    if days_remaining <= 0 or remaining_amount <= 0:
+        return None
+
+    # Calculate required savings per period
+    if plan.frequency == Frequency.MONTHLY:
+        remaining_periods = max((days_remaining + 29) // 30, 1)
+    elif plan.frequency == Frequency.WEEKLY:
+        remaining_periods = max((days_remaining + 6) // 7, 1)
+    else:
+        remaining_periods = max(days_remaining, 1)
+
+    required_per_period = remaining_amount / remaining_periods
+    if plan.period_savings >= required_per_period:
+        return None
+
+    template_data = {
+        "user_name": plan.user_name,
+        "plan_name": plan.name,
+        "target_amount": f"{float(plan.amount):,.2f}",
+        "total_saved": f"{float(plan.total_saved):,.2f}",
+        "remaining_amount": f"{float(remaining_amount):,.2f}",
+        "required_per_period": f"{float(required_per_period):,.2f}",
+        "saved_this_period": f"{float(plan.period_savings):,.2f}",
+        "frequency": plan.frequency.value.lower(),
+        "days_remaining": days_remaining,
+        "message": f"You need to save {required_per_period:.2f} per {plan.frequency.value.lower()} to meet your goal by {plan.current_deadline}",
+    }
+    return {
+        "to_email": plan.user_email,
+        "subject": f"Reminder: You need to save {required_per_period:.2f} for {plan.name}",
+        "template_id": TEMPLATE_ID,
+        "template_data": template_data,
+    }
 
 
 @celery.task(name="send_savings_plan_completion_notification", bind=True, max_retries=3)
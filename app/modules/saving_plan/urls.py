@@ -1,5 +1,6 @@
 from flask import Blueprint
 from flask_restful import Api
+from app.core.representations import use_fast_json
 from app.modules.saving_plan.resources import (
     SavingPlanListResource,
     SavingPlanResource,
@@ -8,7 +9,7 @@ from app.modules.saving_plan.resources import (
 
 # Create a blueprint for the users module
 saving_plan_bp = Blueprint("saving_plans", __name__)
-saving_plan_api = Api(saving_plan_bp)
+saving_plan_api = use_fast_json(Api(saving_plan_bp))
 
 # Add resources to the API
 saving_plan_api.add_resource(
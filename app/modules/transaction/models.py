@@ -1,4 +1,4 @@
-from app.core.models import BaseModel
+from app.core.models import BaseModel, get_utc_now
 from app.extensions import db
 from app.core.constants import TransactionType
 from app.modules.saving_plan.models import SavingPlan
@@ -6,6 +6,8 @@ from app.modules.saving_plan.models import SavingPlan
 
 class Transaction(BaseModel):
     __tablename__ = "transactions"
+    # Keyset pagination orders by (created_at, id), so it must never be NULL
+    created_at = db.Column(db.DateTime, nullable=False, default=get_utc_now)
     amount = db.Column(db.Numeric(10, 2), nullable=False)
     description = db.Column(db.String(255), nullable=True)
     type = db.Column(db.Enum(TransactionType), nullable=False)
@@ -36,6 +38,82 @@ class Transaction(BaseModel):
         "SavingPlan",
         backref=db.backref("transactions", lazy=True, cascade="all, delete"),
     )
+    __table_args__ = (
+        db.Index(
+            "ix_transactions_user_id_transaction_at",
+            "user_id",
+            "transaction_at",
+            postgresql_where=db.text("NOT is_deleted"),
+        ),
+        db.Index(
+            "ix_transactions_user_id_created_at",
+            "user_id",
+            "created_at",
+            postgresql_where=db.text("NOT is_deleted"),
+        ),
+        db.Index(
+            "ix_transactions_user_id_category_id_type_transaction_at",
+            "user_id",
+            "category_id",
+            "type",
+            "transaction_at",
+            postgresql_where=db.text("NOT is_deleted"),
+        ),
+        db.Index(
+            "ix_transactions_saving_plan_id_transaction_at",
+            "saving_plan_id",
+            "transaction_at",
+            postgresql_where=db.text("saving_plan_id IS NOT NULL AND NOT is_deleted"),
+        ),
+        db.Index(
+            "ix_transactions_category_id",
+            "category_id",
+            postgresql_where=db.text("category_id IS NOT NULL AND NOT is_deleted"),
+        ),
+    )
 
     def __str__(self):
         return f"Transaction(type={self.type}, amount={self.amount})"
+
+
+class TransactionRollup(BaseModel):
+    """Monthly sum and count of a user's transactions per category, plan and type."""
+
+    __tablename__ = "transaction_rollups"
+    year = db.Column(db.Integer, nullable=False)
+    month = db.Column(db.Integer, nullable=False)
+    type = db.Column(db.Enum(TransactionType), nullable=False)
+    total = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    user_id = db.Column(
+        db.UUID(as_uuid=True),
+        db.ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    category_id = db.Column(
+        db.UUID(as_uuid=True),
+        db.ForeignKey("categories.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    saving_plan_id = db.Column(
+        db.UUID(as_uuid=True),
+        db.ForeignKey("saving_plans.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    __table_args__ = (
+        # Upsert target; NULL category/plan ids are one bucket (PostgreSQL 15+)
+        db.Index(
+            "uq_transaction_rollups_bucket",
+            "user_id",
+            "year",
+            "month",
+            "category_id",
+            "saving_plan_id",
+            "type",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    def __str__(self):
+        return f"TransactionRollup({self.year}-{self.month:02d}, total={self.total})"
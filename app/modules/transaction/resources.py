@@ -1,16 +1,31 @@
+import csv
+import io
+import json
 from flask import request, g
 from flask_restful import Resource
 from app.extensions import db
 from app.modules.transaction.models import Transaction
-from app.modules.transaction.schemas import TransactionSchema, TransactionUpdateSchema
+from app.modules.transaction.schemas import (
+    TransactionSchema,
+    TransactionUpdateSchema,
+    TransactionValidator,
+)
 from app.core.authentication import authenticated_user
-from app.core.permissions import permission_required, admin_only
+from app.core.permissions import (
+    permission_required,
+    admin_only,
+    get_permitted_resource,
+)
 from app.core.logger import logger
-from app.core.pagination import paginate
+from app.core.pagination import paginate, cursor_paginate, COUNT_APPROXIMATE
 from app.modules.transaction.services import (
     SavingPlanTransactionService,
     BudgetTransactionService,
+    TransactionRollupService,
+    TransactionImportService,
 )
+from app.modules.budget.tasks import mark_budgets_dirty
+from app.modules.transaction_summary_report.services import ReportCache
 from app.core.constants import TransactionType
 from app.core.decorators import handle_errors
 from copy import deepcopy
@@ -33,6 +48,8 @@ class AllTransactionsResource(BaseListResource):
     schema = transactions_schema
     endpoint = "transactions.all_transactions"
     type_enum = TransactionType
+    cursor_pagination = True
+    count_mode = COUNT_APPROXIMATE
 
 
 class TransactionListResource(Resource):
@@ -53,11 +70,22 @@ class TransactionListResource(Resource):
         transaction_type = request.args.get("type")
         if transaction_type and transaction_type in TransactionType.__members__:
             queryset = queryset.filter(Transaction.type == transaction_type)
-        result = paginate(
-            query=queryset,
-            schema=transactions_schema,
-            endpoint="transactions.transactions",
-        )
+        # Keyset pagination is opt-in: clients start a walk with ?cursor=
+        if "cursor" in request.args:
+            result = cursor_paginate(
+                query=queryset,
+                schema=transactions_schema,
+                model=Transaction,
+                endpoint="transactions.transactions",
+                user_id=user_id,
+            )
+        else:
+            result = paginate(
+                query=queryset,
+                schema=transactions_schema,
+                endpoint="transactions.transactions",
+                user_id=user_id,
+            )
         logger.info(
             f"Transactions retrieved successfully for user: {g.current_user.id}"
         )
@@ -70,18 +98,71 @@ class TransactionListResource(Resource):
         data["user_id"] = user_id
         transaction_schema.context["user_id"] = user_id
         transaction = transaction_schema.load(data)
+
+        # Ledger adjustments and the insert are committed together
         SavingPlanTransactionService.update_saving_plan_on_transaction_created(
             transaction
         )
-
-        if transaction.type == TransactionType.DEBIT:
-            BudgetTransactionService.update_budget_on_transaction_created(transaction)
+        budget_ids = BudgetTransactionService.update_budget_on_transaction_created(
+            transaction
+        )
+        TransactionRollupService.update_rollup_on_transaction_created(transaction)
         db.session.add(transaction)
         db.session.commit()
+        mark_budgets_dirty(*budget_ids)
+        ReportCache.bump(transaction.user_id)
         logger.info(f"Transaction created successfully: {transaction.id}")
         return transaction_schema.dump(transaction), 201
 
 
+class TransactionImportResource(Resource):
+    method_decorators = [
+        handle_errors,
+        permission_required(Transaction),
+        authenticated_user,
+    ]
+
+    def post(self, user_id):
+        """Import transactions from an uploaded CSV/JSON file or a JSON array."""
+        rows = _read_import_rows()
+        if rows is None:
+            return {
+                "error": "Upload a CSV or JSON file, or send a JSON array of transactions"
+            }, 400
+
+        target_user = TransactionValidator.get_user(user_id)
+        TransactionValidator.validate_user_permissions(g.current_user, target_user)
+
+        logger.info(f"Importing transactions for user: {user_id}")
+        report = TransactionImportService(user_id).run(rows)
+        if report["imported"]:
+            ReportCache.bump(user_id)
+        return report, 201 if report["imported"] else 400
+
+
+def _read_import_rows():
+    """
+    Rows of an import request. CSV input is streamed row by row; JSON input
+    is an array of objects, optionally wrapped in {"transactions": [...]}.
+    """
+    upload = request.files.get("file")
+    if upload:
+        if upload.mimetype == "application/json" or upload.filename.endswith(".json"):
+            data = json.load(upload.stream)
+        else:
+            return csv.DictReader(io.TextIOWrapper(upload.stream, encoding="utf-8-sig"))
+    elif request.mimetype == "text/csv":
+        return csv.DictReader(io.TextIOWrapper(request.stream, encoding="utf-8-sig"))
+    else:
+        data = request.get_json(silent=True)
+
+    if isinstance(data, dict):
+        data = data.get("transactions")
+    if not isinstance(data, list):
+        return None
+    return data
+
+
 class TransactionDetailResource(Resource):
     method_decorators = [
         handle_errors,
@@ -91,14 +172,14 @@ class TransactionDetailResource(Resource):
 
     def get(self, user_id, transaction_id):
         """Retrieve a specific transaction."""
-        transaction = Transaction.query.get_or_404(transaction_id)
+        transaction = get_permitted_resource(Transaction, transaction_id)
         logger.info(f"Transaction retrieved successfully: {transaction_id}")
         return transaction_schema.dump(transaction), 200
 
     def patch(self, user_id, transaction_id):
         """Update a specific transaction."""
 
-        transaction = Transaction.query.get_or_404(transaction_id)
+        transaction = get_permitted_resource(Transaction, transaction_id)
         logger.info(f"Updating transaction: {transaction_id}")
         data = request.get_json()
 
@@ -111,25 +192,35 @@ class TransactionDetailResource(Resource):
         SavingPlanTransactionService.update_saving_plan_on_transaction_updated(
             updated_transaction, old_transaction
         )
-        BudgetTransactionService.update_budget_on_transaction_updated(
+        budget_ids = BudgetTransactionService.update_budget_on_transaction_updated(
+            updated_transaction, old_transaction
+        )
+        TransactionRollupService.update_rollup_on_transaction_updated(
             updated_transaction, old_transaction
         )
         db.session.commit()
+        mark_budgets_dirty(*budget_ids)
+        ReportCache.bump(transaction.user_id)
         logger.info(f"Transaction updated successfully: {transaction_id}")
         return transaction_schema.dump(updated_transaction), 200
 
     def delete(self, user_id, transaction_id):
         """Soft-delete a specific transaction and update associated saving plan."""
-        transaction = Transaction.query.get_or_404(transaction_id)
+        transaction = get_permitted_resource(Transaction, transaction_id)
 
         # Update saving plan and budget
         SavingPlanTransactionService.update_saving_plan_on_transaction_deleted(
             transaction
         )
-        BudgetTransactionService.update_budget_on_transaction_deleted(transaction)
+        budget_ids = BudgetTransactionService.update_budget_on_transaction_deleted(
+            transaction
+        )
+        TransactionRollupService.update_rollup_on_transaction_deleted(transaction)
         transaction.is_deleted = True
 
         # Commit the transaction
         db.session.commit()
+        mark_budgets_dirty(*budget_ids)
+        ReportCache.bump(transaction.user_id)
         logger.info(f"Transaction deleted successfully: {transaction_id}")
         return {}, 204
@@ -1,6 +1,17 @@
 from datetime import datetime
-from marshmallow import fields, validates, validates_schema, ValidationError, post_load
+from marshmallow import (
+    fields,
+    validates,
+    validates_schema,
+    ValidationError,
+    post_load,
+    pre_load,
+    EXCLUDE,
+)
+from marshmallow.validate import Length
+from app.extensions import ma
 from app.core.validators import is_valid_uuid
+from app.core.lookups import get_cached
 from app.core.constants import UserRole
 from app.core.schemas import BaseSchema
 from app.modules.transaction.models import Transaction
@@ -19,31 +30,28 @@ class TransactionValidator:
 
     @staticmethod
     def get_user(user_id):
-        return User.query.filter_by(id=user_id).first()
+        return get_cached(User, user_id)
 
     @staticmethod
     def get_saving_plan(saving_plan_id, user_id):
-        return SavingPlan.query.filter(
-            SavingPlan.id == saving_plan_id,
-            SavingPlan.is_deleted == False,
-            SavingPlan.user_id == user_id,
-        ).first()
+        saving_plan = get_cached(SavingPlan, saving_plan_id)
+        if (
+            saving_plan
+            and not saving_plan.is_deleted
+            and str(saving_plan.user_id) == str(user_id)
+        ):
+            return saving_plan
+        return None
 
     @staticmethod
     def get_category(category_id, user_id):
-        user_category = Category.query.filter(
-            Category.id == category_id,
-            Category.is_deleted == False,
-            Category.user_id == user_id,
-        ).first()
-        return (
-            user_category
-            or Category.query.filter(
-                Category.id == category_id,
-                Category.is_predefined == True,
-                Category.is_deleted == False,
-            ).first()
-        )
+        category = get_cached(Category, category_id)
+        if not category or category.is_deleted:
+            return None
+        # Users can use their own categories and any predefined one
+        if str(category.user_id) == str(user_id) or category.is_predefined:
+            return category
+        return None
 
     @staticmethod
     def validate_user_permissions(current_user, target_user):
@@ -226,6 +234,35 @@ class TransactionUpdateSchema(BaseTransactionSchema):
             raise ValidationError({"type": "Cannot use DEBIT with saving plan"})
 
 
+class TransactionImportRowSchema(ma.Schema):
+    """
+    Field-level validation for one imported row. References and business
+    rules are checked per batch by TransactionImportService.
+    """
+
+    class Meta:
+        unknown = EXCLUDE
+
+    category_id = fields.UUID(required=False, allow_none=True)
+    saving_plan_id = fields.UUID(required=False, allow_none=True)
+    type = fields.Enum(TransactionType, by_value=True, required=True)
+    amount = fields.Decimal(required=True, validate=validate_amount, as_string=True)
+    transaction_at = fields.DateTime(required=True, format="%Y-%m-%d %H:%M:%S")
+    description = fields.Str(
+        required=False, allow_none=True, validate=Length(max=255)
+    )
+
+    @pre_load
+    def blank_to_none(self, data, **kwargs):
+        """CSV cells are empty strings when a value is missing"""
+        if not isinstance(data, dict):
+            return data
+        return {
+            key: (None if isinstance(value, str) and not value.strip() else value)
+            for key, value in data.items()
+        }
+
+
 # from datetime import datetime
 # from marshmallow import fields, validates, validates_schema, ValidationError, post_load
 # from app.core.validators import is_valid_uuid
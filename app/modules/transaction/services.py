@@ -1,14 +1,105 @@
+import uuid
+from collections import defaultdict
+from types import SimpleNamespace
 from app import db
-from app.modules.transaction.models import Transaction
+from app.modules.transaction.models import Transaction, TransactionRollup
 from app.modules.saving_plan.models import SavingPlan
 from decimal import Decimal
-from sqlalchemy import extract
+from sqlalchemy import (
+    extract,
+    func,
+    cast,
+    literal,
+    Integer,
+    select,
+    insert,
+    update,
+    or_,
+    text,
+)
+from marshmallow import ValidationError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.modules.budget.models import Budget
 from .models import Transaction
+from .schemas import TransactionImportRowSchema
 from app.core.logger import logger
 from app.extensions import db
-from app.modules.budget.tasks import check_budget_thresholds
-from app.core.constants import TransactionType
+from app.core.constants import (
+    TransactionType,
+    TRANSACTION_IMPORT_BATCH_SIZE,
+    TRANSACTION_IMPORT_MAX_ERRORS,
+)
+from app.modules.category.models import Category
+from app.modules.budget.tasks import mark_budgets_dirty
+from app.core.models import get_utc_now
+
+
+class LedgerService:
+    """
+    Applies amount deltas to budgets and saving plans with single
+    UPDATE ... SET x = x + delta statements. Nothing is committed here, so the
+    adjustments share the caller's database transaction.
+    """
+
+    @staticmethod
+    def budget_key(transaction):
+        """Budget bucket a transaction counts towards, or None for non-expenses"""
+        if not transaction.category_id:
+            return None
+        if TransactionType(transaction.type) != TransactionType.DEBIT:
+            return None
+        return (
+            transaction.user_id,
+            transaction.category_id,
+            transaction.transaction_at.year,
+            transaction.transaction_at.month,
+        )
+
+    @staticmethod
+    def apply_budget_deltas(budget_deltas):
+        """
+        Add summed amounts to the matching budgets, one UPDATE per budget.
+        Args:
+            budget_deltas: Mapping of budget_key to amount delta
+        Returns:
+            list: Ids of the budgets that changed
+        """
+        budget_ids = []
+        for (user_id, category_id, year, month), delta in budget_deltas.items():
+            if not delta:
+                continue
+            result = db.session.execute(
+                update(Budget)
+                .where(
+                    Budget.user_id == user_id,
+                    Budget.category_id == category_id,
+                    Budget.year == year,
+                    Budget.month == month,
+                    Budget.is_deleted == False,
+                )
+                .values(spent_amount=Budget.spent_amount + delta)
+                .returning(Budget.id)
+                .execution_options(synchronize_session=False)
+            )
+            budget_ids.extend(result.scalars().all())
+        return budget_ids
+
+    @staticmethod
+    def apply_saving_plan_deltas(saving_plan_deltas):
+        """
+        Add summed amounts to saving plans, one UPDATE per plan.
+        Args:
+            saving_plan_deltas: Mapping of saving plan id to amount delta
+        """
+        for saving_plan_id, delta in saving_plan_deltas.items():
+            if not delta:
+                continue
+            db.session.execute(
+                update(SavingPlan)
+                .where(SavingPlan.id == saving_plan_id)
+                .values(saved_amount=SavingPlan.saved_amount + delta)
+                .execution_options(synchronize_session=False)
+            )
 
 
 class SavingPlanTransactionService:
@@ -26,23 +117,15 @@ class SavingPlanTransactionService:
         Args:
             transaction: Created Transaction object
         """
-        try:
-            if not transaction.saving_plan_id:
-                return
+        if not transaction.saving_plan_id:
+            return
 
-            saving_plan = SavingPlanTransactionService.get_saving_plan(
-                transaction.saving_plan_id
-            )
-            if saving_plan:
-                saving_plan.saved_amount += transaction.amount
-                db.session.commit()
-                logger.info(
-                    f"Updated saving plan {saving_plan.id} saved_amount after transaction created"
-                )
-        except Exception as e:
-            db.session.rollback()
-            logger.error(f"Error updating saving plan on transaction created: {str(e)}")
-            raise e
+        LedgerService.apply_saving_plan_deltas(
+            {transaction.saving_plan_id: transaction.amount}
+        )
+        logger.info(
+            f"Updated saving plan {transaction.saving_plan_id} saved_amount after transaction created"
+        )
 
     @staticmethod
     def update_saving_plan_on_transaction_updated(transaction, old_transaction):
@@ -52,41 +135,21 @@ class SavingPlanTransactionService:
             transaction: Updated Transaction object
             old_transaction: Transaction object with pre-update values
         """
-        try:
-            # Check if saving plan or amount changed
-            amount_changed = transaction.amount != old_transaction.amount
-            plan_changed = transaction.saving_plan_id != old_transaction.saving_plan_id
+        # Check if saving plan or amount changed
+        amount_changed = transaction.amount != old_transaction.amount
+        plan_changed = transaction.saving_plan_id != old_transaction.saving_plan_id
 
-            if not (amount_changed or plan_changed):
-                return
+        if not (amount_changed or plan_changed):
+            return
 
-            # Handle old saving plan
-            if old_transaction.saving_plan_id:
-                old_plan = SavingPlanTransactionService.get_saving_plan(
-                    old_transaction.saving_plan_id
-                )
-                if old_plan:
-                    old_plan.saved_amount -= old_transaction.amount
-                    logger.info(
-                        f"Reduced old saving plan {old_plan.id} saved_amount by {old_transaction.amount}"
-                    )
-
-            # Handle new saving plan
-            if transaction.saving_plan_id:
-                current_plan = SavingPlanTransactionService.get_saving_plan(
-                    transaction.saving_plan_id
-                )
-                if current_plan:
-                    current_plan.saved_amount += transaction.amount
-                    logger.info(
-                        f"Increased current saving plan {current_plan.id} saved_amount by {transaction.amount}"
-                    )
+        deltas = defaultdict(Decimal)
+        if old_transaction.saving_plan_id:
+            deltas[old_transaction.saving_plan_id] -= old_transaction.amount
+        if transaction.saving_plan_id:
+            deltas[transaction.saving_plan_id] += transaction.amount
 
-            db.session.commit()
-        except Exception as e:
-            db.session.rollback()
-            logger.error(f"Error updating saving plan on transaction updated: {str(e)}")
-            raise e
+        LedgerService.apply_saving_plan_deltas(deltas)
+        logger.info(f"Adjusted saving plans after transaction updated: {dict(deltas)}")
 
     @staticmethod
     def update_saving_plan_on_transaction_deleted(transaction):
@@ -95,26 +158,23 @@ class SavingPlanTransactionService:
         Args:
             transaction: Deleted Transaction object
         """
-        try:
-            if not transaction.saving_plan_id:
-                return
+        if not transaction.saving_plan_id:
+            return
 
-            saving_plan = SavingPlanTransactionService.get_saving_plan(
-                transaction.saving_plan_id
-            )
-            if saving_plan:
-                saving_plan.saved_amount -= transaction.amount
-                db.session.commit()
-                logger.info(
-                    f"Updated saving plan {saving_plan.id} saved_amount after transaction deleted"
-                )
-        except Exception as e:
-            db.session.rollback()
-            logger.error(f"Error updating saving plan on transaction deleted: {str(e)}")
-            raise e
+        LedgerService.apply_saving_plan_deltas(
+            {transaction.saving_plan_id: -transaction.amount}
+        )
+        logger.info(
+            f"Updated saving plan {transaction.saving_plan_id} saved_amount after transaction deleted"
+        )
 
 
 class BudgetTransactionService:
+    """
+    Budget adjustments return the ids of the budgets that changed; callers
+    queue threshold checks for them once the transaction is committed.
+    """
+
     @staticmethod
     def find_matching_budget(transaction):
         # Extract transaction date components
@@ -133,84 +193,403 @@ class BudgetTransactionService:
 
     @staticmethod
     def update_budget_on_transaction_created(transaction):
+        key = LedgerService.budget_key(transaction)
+        if not key:
+            return []
 
-        try:
-            budget = BudgetTransactionService.find_matching_budget(transaction)
-            if not budget:
-                logger.debug(f"No budget found for transaction {transaction.id}")
-                return
-            # Add transaction amount to budget spent_amount
-            budget.spent_amount += transaction.amount
-            db.session.commit()
-            logger.info(
-                f"Updated budget {budget.id} spent_amount after transaction created"
-            )
-            # Check if budget thresholds are reached
-            check_budget_thresholds.delay(budget.id)
-        except Exception as e:
-            db.session.rollback()
-            logger.error(f"Error updating budget on transaction created: {str(e)}")
-            raise e
+        budget_ids = LedgerService.apply_budget_deltas({key: transaction.amount})
+        if not budget_ids:
+            logger.debug(f"No budget found for transaction {transaction.id}")
+        return budget_ids
 
     @staticmethod
     def update_budget_on_transaction_updated(transaction, old_transaction):
+        # Check if any relevant fields changed
+        amount_changed = transaction.amount != old_transaction.amount
+        old_key = LedgerService.budget_key(old_transaction)
+        new_key = LedgerService.budget_key(transaction)
+        # Skip if none of the relevant fields changed
+        if old_key == new_key and not amount_changed:
+            return []
+
+        deltas = defaultdict(Decimal)
+        if old_key:
+            deltas[old_key] -= old_transaction.amount
+        if new_key:
+            deltas[new_key] += transaction.amount
+        return LedgerService.apply_budget_deltas(deltas)
+
+    @staticmethod
+    def update_budget_on_transaction_deleted(transaction):
+        key = LedgerService.budget_key(transaction)
+        if not key:
+            return []
+
+        budget_ids = LedgerService.apply_budget_deltas({key: -transaction.amount})
+        if not budget_ids:
+            logger.debug(f"No budget found for deleted transaction {transaction.id}")
+        return budget_ids
+
+
+class TransactionRollupService:
+    """
+    Keeps the monthly transaction_rollups buckets in step with transactions.
+    Delta upserts take shared transaction-scoped advisory locks for their
+    users and rebuilds take exclusive ones, so a rebuild never races a write.
+    """
+
+    LOCK_NAMESPACE = "transaction_rollups"
+
+    @staticmethod
+    def _lock_keys(keys, shared):
+        """Hold advisory locks on the given keys until the transaction ends"""
+        lock = "pg_advisory_xact_lock_shared" if shared else "pg_advisory_xact_lock"
+        db.session.execute(
+            text(
+                f"SELECT {lock}(hashtext(key)) FROM unnest(CAST(:keys AS text[])) AS key"
+            ),
+            {"keys": list(keys)},
+        )
+
+    @staticmethod
+    def lock(user_ids=None, shared=True):
+        """
+        Lock rollups of the given users (every user when None). Writers always
+        hold the global key shared, so a full rebuild can exclude all of them.
+        """
+        namespace = TransactionRollupService.LOCK_NAMESPACE
+        if user_ids is None:
+            TransactionRollupService._lock_keys([namespace], shared)
+            return
+        TransactionRollupService._lock_keys([namespace], shared=True)
+        TransactionRollupService._lock_keys(
+            sorted({f"{namespace}:{user_id}" for user_id in user_ids}), shared
+        )
+
+    @staticmethod
+    def rollup_key(transaction):
+        """Bucket a transaction is counted in"""
+        return (
+            transaction.user_id,
+            transaction.transaction_at.year,
+            transaction.transaction_at.month,
+            transaction.category_id,
+            transaction.saving_plan_id,
+            TransactionType(transaction.type),
+        )
+
+    @staticmethod
+    def apply_deltas(deltas):
+        """
+        Add (amount, count) deltas to their buckets with a single upsert.
+        Args:
+            deltas: Mapping of rollup_key to an (amount, count) pair
+        """
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "year": year,
+                "month": month,
+                "category_id": category_id,
+                "saving_plan_id": saving_plan_id,
+                "type": t_type,
+                "total": amount,
+                "count": count,
+            }
+            for (
+                user_id,
+                year,
+                month,
+                category_id,
+                saving_plan_id,
+                t_type,
+            ), (amount, count) in deltas.items()
+            if amount or count
+        ]
+        if not rows:
+            return
+
+        TransactionRollupService.lock({row["user_id"] for row in rows})
+        statement = pg_insert(TransactionRollup).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[
+                TransactionRollup.user_id,
+                TransactionRollup.year,
+                TransactionRollup.month,
+                TransactionRollup.category_id,
+                TransactionRollup.saving_plan_id,
+                TransactionRollup.type,
+            ],
+            set_={
+                "total": TransactionRollup.total + statement.excluded.total,
+                "count": TransactionRollup.count + statement.excluded.count,
+                "updated_at": get_utc_now(),
+            },
+        )
+        db.session.execute(statement)
+
+    @staticmethod
+    def update_rollup_on_transaction_created(transaction):
+        """Count a new transaction in its bucket"""
+        TransactionRollupService.apply_deltas(
+            {
+                TransactionRollupService.rollup_key(transaction): (
+                    transaction.amount,
+                    1,
+                )
+            }
+        )
+
+    @staticmethod
+    def update_rollup_on_transaction_updated(transaction, old_transaction):
+        """Move an updated transaction between buckets or adjust its amount"""
+        old_key = TransactionRollupService.rollup_key(old_transaction)
+        new_key = TransactionRollupService.rollup_key(transaction)
+        if old_key == new_key and transaction.amount == old_transaction.amount:
+            return
+
+        deltas = defaultdict(lambda: (Decimal("0"), 0))
+        amount, count = deltas[old_key]
+        deltas[old_key] = (amount - old_transaction.amount, count - 1)
+        amount, count = deltas[new_key]
+        deltas[new_key] = (amount + transaction.amount, count + 1)
+        TransactionRollupService.apply_deltas(deltas)
+
+    @staticmethod
+    def update_rollup_on_transaction_deleted(transaction):
+        """Remove a deleted transaction from its bucket"""
+        TransactionRollupService.apply_deltas(
+            {
+                TransactionRollupService.rollup_key(transaction): (
+                    -transaction.amount,
+                    -1,
+                )
+            }
+        )
+
+    @staticmethod
+    def rebuild(user_id=None):
+        """
+        Recompute rollups from the transactions table, for one user or everyone.
+        Used for backfills and to repair drift. Concurrent transaction writes
+        wait on the rollup lock until the rebuild commits.
+        """
+        rollups = TransactionRollup.query
+        bucket = (
+            Transaction.user_id,
+            cast(extract("year", Transaction.transaction_at), Integer),
+            cast(extract("month", Transaction.transaction_at), Integer),
+            Transaction.category_id,
+            Transaction.saving_plan_id,
+            Transaction.type,
+        )
+        transactions = select(
+            func.gen_random_uuid(),
+            *bucket,
+            func.sum(Transaction.amount),
+            func.count(Transaction.id),
+            func.now(),
+            func.now(),
+            literal(False),
+        ).where(Transaction.is_deleted == False)
+        if user_id:
+            rollups = rollups.filter(TransactionRollup.user_id == user_id)
+            transactions = transactions.where(Transaction.user_id == user_id)
+        transactions = transactions.group_by(*bucket)
 
         try:
-            # Check if any relevant fields changed
-            amount_changed = transaction.amount != old_transaction.amount
-            category_changed = transaction.category_id != old_transaction.category_id
-            date_changed = (
-                transaction.transaction_at.month != old_transaction.transaction_at.month
-                or transaction.transaction_at.year
-                != old_transaction.transaction_at.year
+            TransactionRollupService.lock(
+                None if user_id is None else [user_id], shared=False
             )
-            # Skip if none of the relevant fields changed
-            if not (amount_changed or category_changed or date_changed):
-                return
-            # Find the old budget
-            old_budget = BudgetTransactionService.find_matching_budget(old_transaction)
-            # Update the old budget if found
-            if old_budget:
-                old_budget.spent_amount -= old_transaction.amount
-                logger.info(
-                    f"Reduced old budget {old_budget.id} spent_amount by {old_transaction.amount}"
-                )
-            db.session.flush()
-            # Find the current budget
-            current_budget = BudgetTransactionService.find_matching_budget(transaction)
-            if current_budget:
-                # Add the new transaction amount
-                current_budget.spent_amount += transaction.amount
-                logger.info(
-                    f"Increased current budget {current_budget.id} spent_amount by {transaction.amount}"
+            rollups.delete(synchronize_session=False)
+            db.session.execute(
+                insert(TransactionRollup).from_select(
+                    [
+                        "id",
+                        "user_id",
+                        "year",
+                        "month",
+                        "category_id",
+                        "saving_plan_id",
+                        "type",
+                        "total",
+                        "count",
+                        "created_at",
+                        "updated_at",
+                        "is_deleted",
+                    ],
+                    transactions,
                 )
+            )
             db.session.commit()
-            if current_budget:
-                check_budget_thresholds.delay(current_budget.id)
+            logger.info(f"Rebuilt transaction rollups for {user_id or 'all users'}")
         except Exception as e:
             db.session.rollback()
-            logger.error(f"Error updating budget on transaction updated: {str(e)}")
+            logger.error(f"Error rebuilding transaction rollups: {str(e)}")
             raise e
 
-    @staticmethod
-    def update_budget_on_transaction_deleted(transaction):
 
+class TransactionImportService:
+    """
+    Bulk import of transactions. Rows are validated in batches, their
+    category and saving plan references are resolved with one query per
+    batch, and the ledger deltas are applied once for the whole import.
+    """
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.categories = {}
+        self.saving_plans = {}
+        self.budget_deltas = defaultdict(Decimal)
+        self.saving_plan_deltas = defaultdict(Decimal)
+        self.rollup_deltas = defaultdict(lambda: (Decimal("0"), 0))
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+
+    def run(self, rows):
+        """
+        Import an iterable of raw row dicts in a single database transaction.
+        Returns a compact report with per-row errors.
+        """
+        batch = []
         try:
-            # Find matching budget
-            budget = BudgetTransactionService.find_matching_budget(transaction)
-            if not budget:
-                logger.debug(
-                    f"No budget found for deleted transaction {transaction.id}"
-                )
-                return
-            # Subtract transaction amount from budget spent_amount
-            budget.spent_amount -= transaction.amount
+            for row_number, row in enumerate(rows, start=1):
+                batch.append((row_number, row))
+                if len(batch) >= TRANSACTION_IMPORT_BATCH_SIZE:
+                    self._import_batch(batch)
+                    batch = []
+            if batch:
+                self._import_batch(batch)
+
+            budget_ids = LedgerService.apply_budget_deltas(self.budget_deltas)
+            LedgerService.apply_saving_plan_deltas(self.saving_plan_deltas)
+            TransactionRollupService.apply_deltas(self.rollup_deltas)
             db.session.commit()
-            logger.info(
-                f"Updated budget {budget.id} spent_amount after transaction deleted"
-            )
-            check_budget_thresholds.delay(budget.id)
         except Exception as e:
             db.session.rollback()
-            logger.error(f"Error updating budget on transaction deleted: {str(e)}")
+            logger.error(f"Error importing transactions: {str(e)}")
             raise e
+
+        logger.info(
+            f"Imported {self.imported} transactions for user {self.user_id}, {self.failed} rows failed"
+        )
+        mark_budgets_dirty(*budget_ids)
+        return {
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+    def _import_batch(self, batch):
+        """Validate one batch of rows and insert the valid ones"""
+        schema = TransactionImportRowSchema()
+        loaded = []
+        for row_number, row in batch:
+            try:
+                loaded.append((row_number, schema.load(row)))
+            except ValidationError as err:
+                self._add_error(row_number, err.messages)
+
+        self._resolve_references(loaded)
+
+        values = []
+        for row_number, data in loaded:
+            errors = self._check_row(data)
+            if errors:
+                self._add_error(row_number, errors)
+                continue
+            values.append(self._transaction_values(data))
+
+        if values:
+            db.session.execute(insert(Transaction), values)
+            self.imported += len(values)
+
+    def _resolve_references(self, loaded):
+        """Load every category and saving plan the batch refers to, one query each"""
+        category_ids = {
+            data["category_id"]
+            for _, data in loaded
+            if data.get("category_id") and data["category_id"] not in self.categories
+        }
+        if category_ids:
+            for category in Category.query.filter(
+                Category.id.in_(category_ids),
+                Category.is_deleted == False,
+                or_(Category.user_id == self.user_id, Category.is_predefined == True),
+            ):
+                self.categories[category.id] = category
+            for category_id in category_ids - self.categories.keys():
+                self.categories[category_id] = None
+
+        saving_plan_ids = {
+            data["saving_plan_id"]
+            for _, data in loaded
+            if data.get("saving_plan_id")
+            and data["saving_plan_id"] not in self.saving_plans
+        }
+        if saving_plan_ids:
+            for saving_plan in SavingPlan.query.filter(
+                SavingPlan.id.in_(saving_plan_ids),
+                SavingPlan.is_deleted == False,
+                SavingPlan.user_id == self.user_id,
+            ):
+                self.saving_plans[saving_plan.id] = saving_plan
+            for saving_plan_id in saving_plan_ids - self.saving_plans.keys():
+                self.saving_plans[saving_plan_id] = None
+
+    def _check_row(self, data):
+        """Same reference and business rules as BaseTransactionSchema"""
+        category_id = data.get("category_id")
+        saving_plan_id = data.get("saving_plan_id")
+
+        if category_id and saving_plan_id:
+            return {"error": "Cannot have both category and saving plan"}
+        if not category_id and not saving_plan_id:
+            return {"error": "Must have either category or saving plan"}
+        if category_id and not self.categories.get(category_id):
+            return {"category_id": f"Category with ID {category_id} does not exist"}
+        if saving_plan_id:
+            saving_plan = self.saving_plans.get(saving_plan_id)
+            if not saving_plan:
+                return {
+                    "saving_plan_id": f"Saving plan with ID {saving_plan_id} does not exist"
+                }
+            if data["type"] == TransactionType.DEBIT:
+                return {"type": "Debit transactions cannot use saving plans"}
+            if data["transaction_at"].date() > saving_plan.current_deadline:
+                return {"transaction_at": "Date exceeds saving plan deadline"}
+            if data["transaction_at"].date() < saving_plan.created_at.date():
+                return {"transaction_at": "Date precedes saving plan creation"}
+        return None
+
+    def _transaction_values(self, data):
+        """Column values for a valid row, accumulating its ledger deltas"""
+        transaction = SimpleNamespace(
+            id=uuid.uuid4(),
+            user_id=self.user_id,
+            category_id=data.get("category_id"),
+            saving_plan_id=data.get("saving_plan_id"),
+            type=data["type"],
+            amount=data["amount"],
+            transaction_at=data["transaction_at"],
+            description=data.get("description"),
+        )
+
+        budget_key = LedgerService.budget_key(transaction)
+        if budget_key:
+            self.budget_deltas[budget_key] += transaction.amount
+        if transaction.saving_plan_id:
+            self.saving_plan_deltas[transaction.saving_plan_id] += transaction.amount
+        rollup_key = TransactionRollupService.rollup_key(transaction)
+        amount, count = self.rollup_deltas[rollup_key]
+        self.rollup_deltas[rollup_key] = (amount + transaction.amount, count + 1)
+
+        return vars(transaction)
+
+    def _add_error(self, row_number, messages):
+        """Record a failed row, keeping the report bounded"""
+        self.failed += 1
+        if len(self.errors) < TRANSACTION_IMPORT_MAX_ERRORS:
+            self.errors.append({"row": row_number, "errors": messages})
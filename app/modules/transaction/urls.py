@@ -1,18 +1,25 @@
 from flask import Blueprint
 from flask_restful import Api
+from app.core.representations import use_fast_json
 from app.modules.transaction.resources import (
     TransactionListResource,
     TransactionDetailResource,
     AllTransactionsResource,
+    TransactionImportResource,
 )
 
 
 transaction_bp = Blueprint("transactions", __name__)
-transaction_api = Api(transaction_bp)
+transaction_api = use_fast_json(Api(transaction_bp))
 
 transaction_api.add_resource(
     TransactionListResource, "/<user_id>/transactions", endpoint="transactions"
 )
+transaction_api.add_resource(
+    TransactionImportResource,
+    "/<user_id>/transactions/import",
+    endpoint="transactions_import",
+)
 transaction_api.add_resource(
     AllTransactionsResource, "/transactions", endpoint="all_transactions"
 )
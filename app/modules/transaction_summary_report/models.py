@@ -0,0 +1,43 @@
+from app.core.models import BaseModel
+from app.extensions import db
+from app.core.constants import ReportJobStatus
+
+
+class ReportJob(BaseModel):
+    """A CSV/PDF transaction report rendered in the background."""
+
+    __tablename__ = "report_jobs"
+    start_date = db.Column(db.Date, nullable=False)
+    end_date = db.Column(db.Date, nullable=False)
+    file_format = db.Column(db.String(10), nullable=False)
+    # Report cache version of the user when the job was requested
+    data_version = db.Column(db.String(32), nullable=True)
+    status = db.Column(
+        db.Enum(ReportJobStatus), nullable=False, default=ReportJobStatus.PENDING
+    )
+    artifact_path = db.Column(db.String(255), nullable=True)
+    error = db.Column(db.String(255), nullable=True)
+    completed_at = db.Column(db.DateTime, nullable=True)
+    user_id = db.Column(
+        db.UUID(as_uuid=True),
+        db.ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    user = db.relationship(
+        "User", backref=db.backref("report_jobs", lazy=True, cascade="all, delete")
+    )
+    __table_args__ = (
+        # Identical requests share one pending/running render
+        db.Index(
+            "uq_report_jobs_active",
+            "user_id",
+            "start_date",
+            "end_date",
+            "file_format",
+            unique=True,
+            postgresql_where=db.text("status IN ('PENDING', 'RUNNING')"),
+        ),
+    )
+
+    def __str__(self):
+        return f"ReportJob({self.start_date} to {self.end_date}, {self.file_format}, {self.status.value})"
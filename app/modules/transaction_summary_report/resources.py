@@ -290,16 +290,24 @@
 #             return {"message": "Validation error", "errors": err.messages}, 400
 
 # app/modules/transaction/resources.py
-from flask import g, request
+from flask import g, request, Response, send_file, stream_with_context, url_for
 from flask_restful import Resource
 from marshmallow import ValidationError
 from app.core.authentication import authenticated_user
 from app.core.permissions import permission_required
 from app.core.decorators import handle_errors
+from app.core.logger import logger
 from app.modules.transaction.models import Transaction
-from .schemas import SummaryReportQuerySchema
-from .services import TransactionReportService
-from .tasks import email_transaction_history
+from app.core.constants import ReportJobStatus
+from app.core.storage import get_report_storage
+from .schemas import SummaryReportQuerySchema, ReportJobRequestSchema, ReportJobSchema
+from .services import TransactionReportService, ReportCache, ReportJobService
+from .tasks import email_transaction_history, render_report_job, TransactionReport
+
+report_job_request_schema = ReportJobRequestSchema()
+report_job_schema = ReportJobSchema()
+
+REPORT_MIME_TYPES = {"csv": "text/csv", "pdf": "application/pdf"}
 
 
 class BaseReportResource(Resource):
@@ -310,6 +318,37 @@ class BaseReportResource(Resource):
         data["user_id"] = user_id
         return self.schema.load(data)
 
+    def cached_report(self, user_id, report_type, build):
+        """
+        Serve a report from the report cache, computing it with build on a miss.
+        Clients sending the current ETag in If-None-Match get a 304.
+        """
+        query_params = self.get_base_params(user_id)
+        user_id = query_params["user_id"]
+        start_date = query_params["start_date"]
+        end_date = query_params["end_date"]
+
+        # Read the version first so a concurrent change is never cached as current
+        version = ReportCache.get_version(user_id)
+        if version is None:
+            return build(user_id, start_date, end_date), 200
+
+        cache_args = (user_id, report_type, start_date, end_date, version)
+        etag = ReportCache.etag(*cache_args)
+        headers = {"ETag": f'"{etag}"', "Cache-Control": "private, no-cache"}
+        if request.if_none_match.contains(etag):
+            ReportCache.record(report_type, "not_modified")
+            return Response(status=304, headers=headers)
+
+        report = ReportCache.get(*cache_args)
+        if report is None:
+            ReportCache.record(report_type, "miss")
+            report = build(user_id, start_date, end_date)
+            ReportCache.set(*cache_args, report)
+        else:
+            ReportCache.record(report_type, "hit")
+        return report, 200, headers
+
 
 class TransactionReportResource(BaseReportResource):
     @authenticated_user
@@ -317,13 +356,9 @@ class TransactionReportResource(BaseReportResource):
     @handle_errors
     def get(self, user_id):
         """Get detailed transaction report"""
-        query_params = self.get_base_params(user_id)  # Pass user_id here
-        report = TransactionReportService.get_transaction_report(
-            query_params["user_id"],
-            query_params["start_date"],
-            query_params["end_date"],
+        return self.cached_report(
+            user_id, "summary", TransactionReportService.get_transaction_report
         )
-        return report, 200
 
 
 class TrendsReportResource(BaseReportResource):
@@ -332,13 +367,9 @@ class TrendsReportResource(BaseReportResource):
     @handle_errors
     def get(self, user_id):
         """Get spending trends report"""
-        query_params = self.get_base_params(user_id)
-        trends = TransactionReportService.get_trends_report(
-            query_params["user_id"],
-            query_params["start_date"],
-            query_params["end_date"],
+        return self.cached_report(
+            user_id, "trends", TransactionReportService.get_trends_report
         )
-        return trends, 200
 
 
 class EmailTransactionReportResource(BaseReportResource):
@@ -373,3 +404,122 @@ class EmailTransactionReportResource(BaseReportResource):
         )
 
         return {"message": "Transaction history report will be sent to your email"}, 200
+
+
+class DownloadTransactionReportResource(BaseReportResource):
+    @authenticated_user
+    @permission_required(Transaction)
+    @handle_errors
+    def get(self, user_id):
+        """Stream transaction history report as a CSV download"""
+        query_params = self.get_base_params(user_id)
+        report = TransactionReport(
+            query_params["user_id"],
+            query_params["start_date"],
+            query_params["end_date"],
+        )
+
+        if not report.has_transactions():
+            return {"message": "No transactions found"}, 404
+
+        filename = (
+            f"transactions_{query_params['start_date'].isoformat()}"
+            f"_{query_params['end_date'].isoformat()}.csv"
+        )
+        return Response(
+            stream_with_context(report.iter_csv()),
+            mimetype="text/csv",
+            headers={"Content-Disposition": f"attachment; filename={filename}"},
+        )
+
+
+def _dump_job(job, user_id):
+    data = report_job_schema.dump(job)
+    if job.status == ReportJobStatus.COMPLETED:
+        data["download_url"] = url_for(
+            "transaction-reports.reportjobdownloadresource",
+            user_id=user_id,
+            job_id=job.id,
+        )
+    return data
+
+
+class ReportJobListResource(BaseReportResource):
+    @authenticated_user
+    @permission_required(Transaction)
+    @handle_errors
+    def post(self, user_id):
+        """Request a CSV/PDF report rendered in the background"""
+        data = request.get_json(silent=True) or {}
+        data["user_id"] = user_id
+        params = report_job_request_schema.load(data)
+
+        job, created = ReportJobService.request_job(
+            params["user_id"],
+            params["start_date"],
+            params["end_date"],
+            params["file_format"],
+        )
+        if created:
+            try:
+                render_report_job.delay(str(job.id))
+            except Exception as e:
+                # Do not leave a pending job nothing will ever render
+                logger.error(f"Failed to queue report job {job.id}: {str(e)}")
+                ReportJobService.mark_failed(job, "Could not queue the report job")
+                return {"error": "Report jobs are unavailable, try again later"}, 503
+
+        status_code = 200 if job.status == ReportJobStatus.COMPLETED else 202
+        return (
+            _dump_job(job, user_id),
+            status_code,
+            {
+                "Location": url_for(
+                    "transaction-reports.reportjobresource",
+                    user_id=user_id,
+                    job_id=job.id,
+                )
+            },
+        )
+
+
+class ReportJobResource(BaseReportResource):
+    @authenticated_user
+    @permission_required(Transaction)
+    @handle_errors
+    def get(self, user_id, job_id):
+        """Poll the status of a report job"""
+        job = ReportJobService.get_job(user_id, job_id)
+        if not job:
+            return {"message": "Report job not found"}, 404
+        return _dump_job(job, user_id), 200
+
+
+class ReportJobDownloadResource(BaseReportResource):
+    @authenticated_user
+    @permission_required(Transaction)
+    @handle_errors
+    def get(self, user_id, job_id):
+        """Download the artifact of a completed report job"""
+        job = ReportJobService.get_job(user_id, job_id)
+        if not job:
+            return {"message": "Report job not found"}, 404
+        if job.status != ReportJobStatus.COMPLETED:
+            return {
+                "message": "Report is not ready",
+                "status": job.status.value,
+            }, 409
+
+        storage = get_report_storage()
+        if not job.artifact_path or not storage.exists(job.artifact_path):
+            return {"message": "Report has expired, request it again"}, 410
+
+        return send_file(
+            storage.open_read(job.artifact_path),
+            mimetype=REPORT_MIME_TYPES[job.file_format],
+            as_attachment=True,
+            download_name=(
+                f"transactions_{job.start_date.isoformat()}"
+                f"_{job.end_date.isoformat()}.{job.file_format}"
+            ),
+        )
@@ -2,7 +2,10 @@ from marshmallow import Schema, fields, ValidationError, validates_schema, pre_l
 from app.extensions import ma
 from app.modules.user.models import User
 from marshmallow import EXCLUDE
-from app.core.constants import UserRole
+from marshmallow.validate import OneOf
+from app.core.constants import UserRole, ReportJobStatus
+from app.core.schemas import BaseSchema
+from app.modules.transaction_summary_report.models import ReportJob
 from app.extensions import db
 import uuid
 
@@ -45,3 +48,28 @@ class SummaryReportQuerySchema(ma.Schema):
                     }
                 )
         return data
+
+
+class ReportJobRequestSchema(SummaryReportQuerySchema):
+    """Schema for validating a report job request"""
+
+    file_format = fields.String(
+        load_default="csv", validate=OneOf(["csv", "pdf"])
+    )
+
+
+class ReportJobSchema(BaseSchema):
+    class Meta(BaseSchema.Meta):
+        model = ReportJob
+        fields = (
+            "id",
+            "start_date",
+            "end_date",
+            "file_format",
+            "status",
+            "error",
+            "created_at",
+            "completed_at",
+        )
+
+    status = fields.Enum(ReportJobStatus, by_value=True)
@@ -218,150 +218,250 @@
 
 #         return trends
 
-from sqlalchemy import func
-from app.modules.transaction.models import Transaction
+import json
+import time
+import hashlib
+import calendar
+import redis
+from datetime import timedelta
+from sqlalchemy import func, case
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db, redis_client
+from app.core.models import get_utc_now
+from app.core.storage import get_report_storage
+from app.core.logger import logger
+from app.core.representations import dumps
+from app.modules.transaction.models import Transaction, TransactionRollup
 from app.modules.category.models import Category
 from app.modules.saving_plan.models import SavingPlan
-from app.core.constants import TransactionType
+from app.modules.transaction_summary_report.models import ReportJob
+from app.core.constants import (
+    TransactionType,
+    ReportJobStatus,
+    REPORT_CACHE_TTL,
+    REPORT_JOB_REUSE_TTL,
+    REPORT_JOB_TIMEOUT,
+)
 from datetime import datetime
 
 
-class TransactionReportService:
-    @staticmethod
-    def get_transaction_report(user_id, start_date, end_date):
-        """Generate detailed transaction report"""
-        base_query = Transaction.query.filter(
-            Transaction.user_id == user_id,
-            Transaction.transaction_at.between(start_date, end_date),
-            Transaction.is_deleted == False,
-        )
-
-        # Exclude savings plan transactions from credit/debit calculations
-        regular_transactions = base_query.outerjoin(SavingPlan).filter(
-            SavingPlan.id == None
+def _period_filters(user_id, start_date, end_date):
+    """Filters shared by every report query for a user's date range"""
+    return (
+        Transaction.user_id == user_id,
+        Transaction.transaction_at.between(start_date, end_date),
+        Transaction.is_deleted == False,
+    )
+
+
+def _is_month_aligned(start_date, end_date):
+    """Whether the range starts on the 1st and ends on a month's last day"""
+    return (
+        start_date.day == 1
+        and end_date.day == calendar.monthrange(end_date.year, end_date.month)[1]
+    )
+
+
+def _rollup_period_filters(user_id, start_date, end_date):
+    """Filters selecting a user's monthly rollup buckets for a month range"""
+    month_index = TransactionRollup.year * 12 + TransactionRollup.month
+    return (
+        TransactionRollup.user_id == user_id,
+        month_index.between(
+            start_date.year * 12 + start_date.month,
+            end_date.year * 12 + end_date.month,
+        ),
+        TransactionRollup.is_deleted == False,
+    )
+
+
+def _rollup_sum_of_type(column, t_type):
+    """Conditional SUM of a rollup column for a single transaction type"""
+    return func.coalesce(
+        func.sum(case((TransactionRollup.type == t_type, column))), 0
+    )
+
+
+def _sum_of_type(t_type):
+    """Conditional SUM of amounts for a single transaction type"""
+    return func.coalesce(
+        func.sum(case((Transaction.type == t_type.value, Transaction.amount))), 0
+    )
+
+
+def _count_of_type(t_type):
+    """Conditional COUNT of transactions for a single transaction type"""
+    return func.count(case((Transaction.type == t_type.value, Transaction.id)))
+
+
+def _category_totals(user_id, start_date, end_date):
+    """
+    Credit/debit sums and counts per category for regular (non saving plan)
+    transactions, computed in a single grouped query.
+    Uncategorized transactions come back as the row with category_id None.
+    Month-aligned ranges read the monthly rollups instead of transactions.
+    """
+    if _is_month_aligned(start_date, end_date):
+        return (
+            TransactionRollup.query.outerjoin(
+                Category, TransactionRollup.category_id == Category.id
+            )
+            .filter(
+                *_rollup_period_filters(user_id, start_date, end_date),
+                TransactionRollup.saving_plan_id == None,
+            )
+            .group_by(TransactionRollup.category_id, Category.name, Category.is_deleted)
+            .order_by(Category.name)
+            .with_entities(
+                TransactionRollup.category_id,
+                Category.name.label("category_name"),
+                Category.is_deleted.label("category_deleted"),
+                _rollup_sum_of_type(
+                    TransactionRollup.total, TransactionType.CREDIT
+                ).label("credit_total"),
+                _rollup_sum_of_type(
+                    TransactionRollup.count, TransactionType.CREDIT
+                ).label("credit_count"),
+                _rollup_sum_of_type(
+                    TransactionRollup.total, TransactionType.DEBIT
+                ).label("debit_total"),
+                _rollup_sum_of_type(
+                    TransactionRollup.count, TransactionType.DEBIT
+                ).label("debit_count"),
+            )
+            .all()
         )
 
-        credit_trans = regular_transactions.filter(
-            Transaction.type == TransactionType.CREDIT.value
+    return (
+        Transaction.query.outerjoin(Category, Transaction.category_id == Category.id)
+        .filter(
+            *_period_filters(user_id, start_date, end_date),
+            Transaction.saving_plan_id == None,
         )
-        debit_trans = regular_transactions.filter(
-            Transaction.type == TransactionType.DEBIT.value
+        .group_by(Transaction.category_id, Category.name, Category.is_deleted)
+        .order_by(Category.name)
+        .with_entities(
+            Transaction.category_id,
+            Category.name.label("category_name"),
+            Category.is_deleted.label("category_deleted"),
+            _sum_of_type(TransactionType.CREDIT).label("credit_total"),
+            _count_of_type(TransactionType.CREDIT).label("credit_count"),
+            _sum_of_type(TransactionType.DEBIT).label("debit_total"),
+            _count_of_type(TransactionType.DEBIT).label("debit_count"),
         )
+        .all()
+    )
 
-        # Separate query for savings plan transactions
-        savings_trans = base_query.join(SavingPlan).filter(
-            SavingPlan.is_deleted == False
-        )
 
-        # Get all relevant categories
-        categories = (
-            Category.query.join(Transaction)
+def _saving_plan_totals(user_id, start_date, end_date):
+    """Sum and count of transactions per live saving plan in the range"""
+    if _is_month_aligned(start_date, end_date):
+        return (
+            SavingPlan.query.join(
+                TransactionRollup, TransactionRollup.saving_plan_id == SavingPlan.id
+            )
             .filter(
-                Transaction.user_id == user_id,
-                Transaction.transaction_at.between(start_date, end_date),
-                Transaction.is_deleted == False,
-                Category.is_deleted == False,
+                *_rollup_period_filters(user_id, start_date, end_date),
+                SavingPlan.is_deleted == False,
+            )
+            .group_by(SavingPlan.id, SavingPlan.name)
+            .having(func.sum(TransactionRollup.count) > 0)
+            .with_entities(
+                SavingPlan.id,
+                SavingPlan.name,
+                func.sum(TransactionRollup.total).label("total"),
+                func.sum(TransactionRollup.count).label("count"),
             )
-            .distinct()
             .all()
         )
 
-        # Create category summaries
-        credit_by_category = {}
-        debit_by_category = {}
+    return (
+        SavingPlan.query.join(Transaction)
+        .filter(
+            *_period_filters(user_id, start_date, end_date),
+            SavingPlan.is_deleted == False,
+        )
+        .group_by(SavingPlan.id, SavingPlan.name)
+        .with_entities(
+            SavingPlan.id,
+            SavingPlan.name,
+            func.sum(Transaction.amount).label("total"),
+            func.count(Transaction.id).label("count"),
+        )
+        .all()
+    )
 
-        # Process credit transactions by category
-        for category in categories:
-            credit_amount = float(
-                credit_trans.filter(Transaction.category_id == category.id)
-                .with_entities(func.sum(Transaction.amount))
-                .scalar()
-                or 0
-            )
 
-            if credit_amount > 0:
-                credit_by_category[str(category.id)] = {
-                    "category_id": str(category.id),
-                    "category_name": category.name,
-                    "total_amount": credit_amount,
-                    "transaction_count": credit_trans.filter(
-                        Transaction.category_id == category.id
-                    ).count(),
-                }
+def _percentages(amounts, total):
+    """Share of total for each amount, rounded to two decimals"""
+    if not total:
+        return [0 for _ in amounts]
+    return [round(amount / total * 100, 2) for amount in amounts]
 
-        # Process debit transactions by category
-        for category in categories:
-            debit_amount = float(
-                debit_trans.filter(Transaction.category_id == category.id)
-                .with_entities(func.sum(Transaction.amount))
-                .scalar()
-                or 0
-            )
 
-            if debit_amount > 0:
-                debit_by_category[str(category.id)] = {
-                    "category_id": str(category.id),
-                    "category_name": category.name,
-                    "total_amount": debit_amount,
-                    "transaction_count": debit_trans.filter(
-                        Transaction.category_id == category.id
-                    ).count(),
+class TransactionReportService:
+    @staticmethod
+    def get_transaction_report(user_id, start_date, end_date):
+        """Generate detailed transaction report"""
+        category_rows = _category_totals(user_id, start_date, end_date)
+
+        # Create category summaries, keeping uncategorized buckets last
+        credit_by_category = {}
+        debit_by_category = {}
+        credit_no_category = None
+        debit_no_category = None
+        total_credit = 0
+        total_debit = 0
+
+        for row in category_rows:
+            # Totals include every regular transaction, even deleted categories
+            total_credit += row.credit_total
+            total_debit += row.debit_total
+
+            if row.category_id is None:
+                credit_no_category = row
+                debit_no_category = row
+                continue
+
+            if row.category_deleted:
+                continue
+
+            if float(row.credit_total) > 0:
+                credit_by_category[str(row.category_id)] = {
+                    "category_id": str(row.category_id),
+                    "category_name": row.category_name,
+                    "total_amount": float(row.credit_total),
+                    "transaction_count": row.credit_count,
                 }
 
-        # Handle transactions without categories
-        credit_no_category = float(
-            credit_trans.filter(Transaction.category_id == None)
-            .with_entities(func.sum(Transaction.amount))
-            .scalar()
-            or 0
-        )
+            if float(row.debit_total) > 0:
+                debit_by_category[str(row.category_id)] = {
+                    "category_id": str(row.category_id),
+                    "category_name": row.category_name,
+                    "total_amount": float(row.debit_total),
+                    "transaction_count": row.debit_count,
+                }
 
-        if credit_no_category > 0:
+        # Handle transactions without categories
+        if credit_no_category and float(credit_no_category.credit_total) > 0:
             credit_by_category["no_category"] = {
                 "category_id": None,
                 "category_name": "Uncategorized",
-                "total_amount": credit_no_category,
-                "transaction_count": credit_trans.filter(
-                    Transaction.category_id == None
-                ).count(),
+                "total_amount": float(credit_no_category.credit_total),
+                "transaction_count": credit_no_category.credit_count,
             }
 
-        debit_no_category = float(
-            debit_trans.filter(Transaction.category_id == None)
-            .with_entities(func.sum(Transaction.amount))
-            .scalar()
-            or 0
-        )
-
-        if debit_no_category > 0:
+        if debit_no_category and float(debit_no_category.debit_total) > 0:
             debit_by_category["no_category"] = {
                 "category_id": None,
                 "category_name": "Uncategorized",
-                "total_amount": debit_no_category,
-                "transaction_count": debit_trans.filter(
-                    Transaction.category_id == None
-                ).count(),
+                "total_amount": float(debit_no_category.debit_total),
+                "transaction_count": debit_no_category.debit_count,
             }
 
         # Summarize savings plans
         savings_by_plan = {}
-        saving_plans = (
-            SavingPlan.query.join(Transaction)
-            .filter(
-                Transaction.user_id == user_id,
-                Transaction.transaction_at.between(start_date, end_date),
-                Transaction.is_deleted == False,
-                SavingPlan.is_deleted == False,
-            )
-            .group_by(SavingPlan.id, SavingPlan.name)
-            .with_entities(
-                SavingPlan.id,
-                SavingPlan.name,
-                func.sum(Transaction.amount).label("total"),
-                func.count(Transaction.id).label("count"),
-            )
-            .all()
-        )
+        saving_plans = _saving_plan_totals(user_id, start_date, end_date)
 
         for plan in saving_plans:
             savings_by_plan[str(plan.id)] = {
@@ -371,19 +471,11 @@ class TransactionReportService:
                 "transaction_count": plan.count,
             }
 
-        # Calculate totals for regular transactions only (no saving plans)
-        total_credit = float(
-            credit_trans.with_entities(func.sum(Transaction.amount)).scalar() or 0
-        )
-        total_debit = float(
-            debit_trans.with_entities(func.sum(Transaction.amount)).scalar() or 0
-        )
-
         report = {
             "start_date": start_date.isoformat(),
             "end_date": end_date.isoformat(),
-            "total_credit": total_credit,
-            "total_debit": total_debit,
+            "total_credit": float(total_credit),
+            "total_debit": float(total_debit),
             "summary": {
                 "credit_by_category": list(credit_by_category.values()),
                 "debit_by_category": list(debit_by_category.values()),
@@ -396,105 +488,53 @@ class TransactionReportService:
     @staticmethod
     def get_trends_report(user_id, start_date, end_date):
         """Generate spending trends report"""
-        base_query = Transaction.query.filter(
-            Transaction.user_id == user_id,
-            Transaction.transaction_at.between(start_date, end_date),
-            Transaction.is_deleted == False,
-        )
+        category_rows = _category_totals(user_id, start_date, end_date)
+
+        # Totals cover every regular transaction in the range
+        total_credit = float(sum(row.credit_total for row in category_rows))
+        total_debit = float(sum(row.debit_total for row in category_rows))
 
         trends = {
             "start_date": start_date.isoformat(),
             "end_date": end_date.isoformat(),
-            "total_credit": 0.0,
-            "total_debit": 0.0,
+            "total_credit": total_credit,
+            "total_debit": total_debit,
             "categories": [],
             "savings_plan": [],
         }
 
-        # Calculate totals
-        for t_type in TransactionType:
-            total = float(
-                base_query.filter(Transaction.type == t_type.value)
-                .outerjoin(SavingPlan)
-                .filter(SavingPlan.id == None)
-                .with_entities(func.sum(Transaction.amount))
-                .scalar()
-                or 0
-            )
-            if t_type == TransactionType.CREDIT:
-                trends["total_credit"] = total
-            else:
-                trends["total_debit"] = total
-
-        # Category data
-        categories = (
-            Category.query.join(Transaction)
-            .filter(Transaction.user_id == user_id, Category.is_deleted == False)
-            .distinct()
-            .all()
-        )
-
-        category_data = []
-        for category in categories:
-            credit_amount = float(
-                base_query.filter(
-                    Transaction.type == TransactionType.CREDIT.value,
-                    Transaction.category_id == category.id,
-                )
-                .outerjoin(SavingPlan)
-                .filter(SavingPlan.id == None)
-                .with_entities(func.sum(Transaction.amount))
-                .scalar()
-                or 0
-            )
+        # Category data, computed column-wise over the grouped rows
+        rows = [
+            row
+            for row in category_rows
+            if row.category_id is not None and not row.category_deleted
+        ]
+        credits = [float(row.credit_total) for row in rows]
+        debits = [float(row.debit_total) for row in rows]
+        credit_percentages = _percentages(credits, total_credit)
+        debit_percentages = _percentages(debits, total_debit)
 
-            debit_amount = float(
-                base_query.filter(
-                    Transaction.type == TransactionType.DEBIT.value,
-                    Transaction.category_id == category.id,
-                )
-                .outerjoin(SavingPlan)
-                .filter(SavingPlan.id == None)
-                .with_entities(func.sum(Transaction.amount))
-                .scalar()
-                or 0
+        trends["categories"] = [
+            {
+                "id": str(row.category_id),
+                "name": row.category_name,
+                "credit": round(credit, 2),
+                "debit": round(debit, 2),
+                "credit_percentage": credit_percentage,
+                "debit_percentage": debit_percentage,
+            }
+            for row, credit, debit, credit_percentage, debit_percentage in zip(
+                rows, credits, debits, credit_percentages, debit_percentages
             )
-
-            if credit_amount > 0 or debit_amount > 0:
-                category_data.append(
-                    {
-                        "id": str(category.id),
-                        "name": category.name,
-                        "credit": round(credit_amount, 2),
-                        "debit": round(debit_amount, 2),
-                        "credit_percentage": round(
-                            (
-                                (credit_amount / trends["total_credit"] * 100)
-                                if trends["total_credit"]
-                                else 0
-                            ),
-                            2,
-                        ),
-                        "debit_percentage": round(
-                            (
-                                (debit_amount / trends["total_debit"] * 100)
-                                if trends["total_debit"]
-                                else 0
-                            ),
-                            2,
-                        ),
-                    }
-                )
-
-        trends["categories"] = category_data
+            if credit > 0 or debit > 0
+        ]
 
         # Savings plan data
         savings_total = float(
-            base_query.join(SavingPlan)
-            .filter(SavingPlan.is_deleted == False)
-            .with_entities(func.sum(Transaction.amount))
-            .scalar()
-            or 0
+            sum(
+                plan.total
+                for plan in _saving_plan_totals(user_id, start_date, end_date)
+            )
         )
 
         saving_plans = (
@@ -509,16 +549,249 @@ class TransactionReportService:
             .all()
         )
 
+        plan_amounts = [float(plan.total) for plan in saving_plans]
         trends["savings_plan"] = [
             {
                 "id": str(plan.id),
                 "name": plan.name,
-                "amount": float(plan.total),
-                "percentage": round(
-                    (float(plan.total) / savings_total * 100) if savings_total else 0, 2
-                ),
+                "amount": amount,
+                "percentage": percentage,
             }
-            for plan in saving_plans
+            for plan, amount, percentage in zip(
+                saving_plans,
+                plan_amounts,
+                _percentages(plan_amounts, savings_total),
+            )
         ]
 
         return trends
+
+
+class ReportCache:
+    """
+    Redis cache of computed report results keyed by (user, report type,
+    date range). Every key embeds a per-user version counter that is bumped
+    whenever the user's transactions change, so stale entries are never read
+    and simply expire. Hit/miss counters are kept in a Redis hash.
+    Without Redis, reports are always computed and no ETag is issued.
+    """
+
+    METRICS_KEY = "report_cache:metrics"
+
+    @staticmethod
+    def _version_key(user_id):
+        return f"report_version:{user_id}"
+
+    @staticmethod
+    def _key(user_id, report_type, start_date, end_date, version):
+        return f"report:{user_id}:{report_type}:{start_date.isoformat()}:{end_date.isoformat()}:{version}"
+
+    @staticmethod
+    def get_version(user_id):
+        """Current report version of a user, or None if Redis is unavailable."""
+        if redis_client is None:
+            return None
+        key = ReportCache._version_key(user_id)
+        try:
+            version = redis_client.get(key)
+            if version is None:
+                # Seed with the time so a lost counter never reuses old versions
+                redis_client.set(key, time.time_ns(), nx=True)
+                version = redis_client.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"Report cache unavailable, computing report: {str(e)}")
+            return None
+        return version.decode("utf-8") if isinstance(version, bytes) else version
+
+    @staticmethod
+    def bump(*user_ids):
+        """Invalidate every cached report of the given users."""
+        user_ids = {str(user_id) for user_id in user_ids if user_id}
+        if redis_client is None or not user_ids:
+            return
+        try:
+            pipe = redis_client.pipeline()
+            for user_id in user_ids:
+                pipe.incr(ReportCache._version_key(user_id))
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Failed to invalidate cached reports: {str(e)}")
+
+    @staticmethod
+    def etag(user_id, report_type, start_date, end_date, version):
+        key = ReportCache._key(user_id, report_type, start_date, end_date, version)
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def get(user_id, report_type, start_date, end_date, version):
+        """Cached report for a version, or None on a miss."""
+        key = ReportCache._key(user_id, report_type, start_date, end_date, version)
+        try:
+            report = redis_client.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to read cached report: {str(e)}")
+            return None
+        return json.loads(report) if report else None
+
+    @staticmethod
+    def set(user_id, report_type, start_date, end_date, version, report):
+        key = ReportCache._key(user_id, report_type, start_date, end_date, version)
+        try:
+            redis_client.setex(key, REPORT_CACHE_TTL, dumps(report))
+        except redis.RedisError as e:
+            logger.warning(f"Failed to cache report: {str(e)}")
+
+    @staticmethod
+    def record(report_type, outcome):
+        """Count a cache outcome (hit, miss or not_modified) for a report type."""
+        try:
+            redis_client.hincrby(ReportCache.METRICS_KEY, f"{report_type}:{outcome}", 1)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to record report cache metrics: {str(e)}")
+
+    @staticmethod
+    def metrics():
+        """Hit/miss counters per report type"""
+        if redis_client is None:
+            return {}
+        try:
+            counters = redis_client.hgetall(ReportCache.METRICS_KEY)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to read report cache metrics: {str(e)}")
+            return {}
+        return {
+            (key.decode("utf-8") if isinstance(key, bytes) else key): int(value)
+            for key, value in counters.items()
+        }
+
+
+ACTIVE_REPORT_JOB_STATUSES = (ReportJobStatus.PENDING, ReportJobStatus.RUNNING)
+
+
+class ReportJobService:
+    @staticmethod
+    def artifact_name(job):
+        return f"{job.id}.{job.file_format}"
+
+    @staticmethod
+    def get_job(user_id, job_id):
+        return ReportJob.query.filter_by(
+            id=job_id, user_id=user_id, is_deleted=False
+        ).first()
+
+    @staticmethod
+    def request_job(user_id, start_date, end_date, file_format):
+        """
+        Find or create the job rendering a report.
+        A pending or running job for the same range and format is shared
+        unless it has gone stale, and a completed one is reused while the
+        user's transactions are unchanged.
+        Returns (job, created); created jobs still have to be queued.
+        """
+        jobs = ReportJob.query.filter(
+            ReportJob.user_id == user_id,
+            ReportJob.start_date == start_date,
+            ReportJob.end_date == end_date,
+            ReportJob.file_format == file_format,
+            ReportJob.is_deleted == False,
+        )
+
+        # A job abandoned by a dead worker must not block new requests
+        ReportJobService.fail_stale_jobs(
+            ReportJob.user_id == user_id,
+            ReportJob.start_date == start_date,
+            ReportJob.end_date == end_date,
+            ReportJob.file_format == file_format,
+        )
+        job = jobs.filter(ReportJob.status.in_(ACTIVE_REPORT_JOB_STATUSES)).first()
+        if job:
+            db.session.commit()
+            return job, False
+
+        version = ReportCache.get_version(user_id)
+        if version is not None:
+            job = (
+                jobs.filter(
+                    ReportJob.status == ReportJobStatus.COMPLETED,
+                    ReportJob.data_version == version,
+                    ReportJob.completed_at
+                    >= get_utc_now() - timedelta(seconds=REPORT_JOB_REUSE_TTL),
+                )
+                .order_by(ReportJob.completed_at.desc())
+                .first()
+            )
+            if job and get_report_storage().exists(job.artifact_path):
+                db.session.commit()
+                return job, False
+
+        job = ReportJob(
+            user_id=user_id,
+            start_date=start_date,
+            end_date=end_date,
+            file_format=file_format,
+            data_version=version,
+            status=ReportJobStatus.PENDING,
+        )
+        db.session.add(job)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent identical request created the active job first
+            db.session.rollback()
+            job = jobs.filter(
+                ReportJob.status.in_(ACTIVE_REPORT_JOB_STATUSES)
+            ).first()
+            if job is None:
+                raise
+            return job, False
+
+        logger.info(f"Created report job {job.id} for user: {user_id}")
+        return job, True
+
+    @staticmethod
+    def fail_stale_jobs(*filters):
+        """Mark pending/running jobs untouched for REPORT_JOB_TIMEOUT as failed"""
+        cutoff = get_utc_now() - timedelta(seconds=REPORT_JOB_TIMEOUT)
+        return ReportJob.query.filter(
+            *filters,
+            ReportJob.status.in_(ACTIVE_REPORT_JOB_STATUSES),
+            ReportJob.updated_at < cutoff,
+        ).update(
+            {"status": ReportJobStatus.FAILED, "error": "Report job timed out"},
+            synchronize_session=False,
+        )
+
+    @staticmethod
+    def mark_failed(job, error):
+        """Fail a job that will never run"""
+        job.status = ReportJobStatus.FAILED
+        job.error = error[:255]
+        db.session.commit()
+
+    @staticmethod
+    def remove_expired_artifacts():
+        """
+        Delete artifacts of jobs completed more than REPORT_JOB_REUSE_TTL ago.
+        Returns the number of artifacts removed.
+        """
+        cutoff = get_utc_now() - timedelta(seconds=REPORT_JOB_REUSE_TTL)
+        expired = (
+            db.session.query(ReportJob.id, ReportJob.artifact_path)
+            .filter(
+                ReportJob.status == ReportJobStatus.COMPLETED,
+                ReportJob.artifact_path != None,
+                ReportJob.completed_at < cutoff,
+            )
+            .all()
+        )
+        if not expired:
+            return 0
+
+        storage = get_report_storage()
+        for _, artifact_path in expired:
+            storage.delete(artifact_path)
+        ReportJob.query.filter(ReportJob.id.in_([job_id for job_id, _ in expired])).update(
+            {"artifact_path": None}, synchronize_session=False
+        )
+        db.session.commit()
+        return len(expired)
@@ -1,9 +1,12 @@
 import io
 import os
 import csv
+import tempfile
+from itertools import islice
 from decimal import Decimal
 from datetime import datetime
 from celery import shared_task
+from sqlalchemy import func, case, literal
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
@@ -13,48 +16,122 @@ from reportlab.lib.enums import TA_RIGHT, TA_CENTER
 from app.extensions import db
 from app.core.mail import send_email
 from app.modules.transaction.models import Transaction
+from app.modules.category.models import Category
+from app.modules.saving_plan.models import SavingPlan
 from app.modules.user.models import User
-from app.core.constants import TransactionType
+from app.modules.transaction_summary_report.models import ReportJob
+from app.modules.transaction_summary_report.services import ReportJobService
+from app.core.models import get_utc_now
+from app.core.storage import get_report_storage
+from app.core.logger import logger
+from app.core.constants import (
+    TransactionType,
+    ReportJobStatus,
+    REPORT_EXPORT_CHUNK_SIZE,
+    REPORT_PDF_TABLE_ROWS,
+)
 from flask import current_app
 from app.celery_app import celery
 
 TRANSACTION_SUMMARY_REPORT = os.getenv("TRANSACTION_SUMMARY_REPORT")
 
+SECTION_CREDITS = "credits"
+SECTION_DEBITS = "debits"
+SECTION_SAVINGS = "savings"
+
 
 class TransactionReport:
     """Handles creating transaction reports with savings plans handling"""
 
-    def __init__(self, start_date, end_date, transactions):
+    def __init__(self, user_id, start_date, end_date):
+        self.user_id = user_id
         self.start_date = start_date
         self.end_date = end_date
-        self.transactions = transactions
-
-        self.categorized_credits = [
-            t for t in transactions if t.type == TransactionType.CREDIT and t.category
-        ]
-        self.categorized_debits = [
-            t for t in transactions if t.type == TransactionType.DEBIT and t.category
-        ]
-        self.savings_plans = [
-            t
-            for t in transactions
-            if t.type == TransactionType.CREDIT and not t.category
-        ]
 
-        self.total_credits = Decimal(
-            sum(float(t.amount) for t in self.categorized_credits)
+        totals = (
+            self._base_query()
+            .with_entities(
+                self._section_sum(SECTION_CREDITS),
+                self._section_sum(SECTION_DEBITS),
+                self._section_sum(SECTION_SAVINGS),
+            )
+            .one()
         )
-        self.total_debits = Decimal(
-            sum(float(t.amount) for t in self.categorized_debits)
+        self.total_credits, self.total_debits, self.total_savings = (
+            Decimal(total or 0) for total in totals
         )
-        self.total_savings = Decimal(sum(float(t.amount) for t in self.savings_plans))
         self.net_balance = self.total_credits - self.total_debits
 
-    def generate_csv(self):
-        """Creates CSV report with savings plan names from t.saving_plan"""
+    def _base_query(self):
+        return Transaction.query.filter(
+            Transaction.user_id == self.user_id,
+            Transaction.transaction_at.between(self.start_date, self.end_date),
+            Transaction.is_deleted == False,
+        )
+
+    @staticmethod
+    def _section_filter(section):
+        """Categorized credits, categorized debits, or uncategorized credits (savings)"""
+        if section == SECTION_CREDITS:
+            return (Transaction.type == TransactionType.CREDIT) & (
+                Transaction.category_id != None
+            )
+        if section == SECTION_DEBITS:
+            return (Transaction.type == TransactionType.DEBIT) & (
+                Transaction.category_id != None
+            )
+        return (Transaction.type == TransactionType.CREDIT) & (
+            Transaction.category_id == None
+        )
+
+    @classmethod
+    def _section_sum(cls, section):
+        return func.sum(case((cls._section_filter(section), Transaction.amount)))
+
+    def has_transactions(self):
+        """Check whether the report period contains any transactions"""
+        return db.session.query(self._base_query().exists()).scalar()
+
+    def iter_section_rows(self, section):
+        """
+        Stream a section's rows as (date, category/savings plan, amount, description)
+        using a server-side cursor, with names joined in rather than lazy-loaded.
+        """
+        rows = (
+            self._base_query()
+            .outerjoin(Category, Transaction.category_id == Category.id)
+            .outerjoin(SavingPlan, Transaction.saving_plan_id == SavingPlan.id)
+            .filter(self._section_filter(section))
+            .order_by(Transaction.transaction_at, Transaction.id)
+            .with_entities(
+                Transaction.transaction_at,
+                func.coalesce(
+                    Category.name, SavingPlan.name, literal("Unnamed Savings Plan")
+                ),
+                Transaction.amount,
+                Transaction.description,
+            )
+            .yield_per(REPORT_EXPORT_CHUNK_SIZE)
+        )
+        for transaction_at, name, amount, description in rows:
+            yield [
+                transaction_at.strftime("%Y-%m-%d"),
+                name,
+                f"{float(amount):.2f}",  # No rupee symbol
+                description or "No description",
+            ]
+
+    def iter_csv(self):
+        """Yields the CSV report in bounded chunks of rows"""
         output = io.StringIO()
         writer = csv.writer(output)
 
+        def flush():
+            chunk = output.getvalue()
+            output.seek(0)
+            output.truncate(0)
+            return chunk
+
         writer.writerow(["Transaction History Report"])
         writer.writerow([f"Period: {self.start_date} to {self.end_date}"])
         writer.writerow(
@@ -70,10 +147,10 @@ class TransactionReport:
         writer.writerow(["Net Balance (Excl. Savings)", f"{self.net_balance:.2f}"])
         writer.writerow([])
 
-        for trans_type, transactions in [
-            ("Credit Transactions (Categorized)", self.categorized_credits),
-            ("Debit Transactions (Categorized)", self.categorized_debits),
-            ("Savings Plan Deposits", self.savings_plans),
+        for trans_type, section in [
+            ("Credit Transactions (Categorized)", SECTION_CREDITS),
+            ("Debit Transactions (Categorized)", SECTION_DEBITS),
+            ("Savings Plan Deposits", SECTION_SAVINGS),
         ]:
             writer.writerow([trans_type])
             writer.writerow(
@@ -84,31 +161,70 @@ class TransactionReport:
                     "Description",
                 ]
             )
-            for t in transactions:
-                # Use t.saving_plan for savings plan name, fall back to "Unnamed" if not available
-                savings_name = (
-                    t.saving_plan.name
-                    if (not t.category and hasattr(t, "saving_plan") and t.saving_plan)
-                    else "Unnamed Savings Plan"
-                )
-                writer.writerow(
-                    [
-                        t.transaction_at.strftime("%Y-%m-%d"),
-                        t.category.name if t.category else savings_name,
-                        f"{float(t.amount):.2f}",  # No rupee symbol
-                        t.description or "No description",
-                    ]
-                )
+            for index, row in enumerate(self.iter_section_rows(section), start=1):
+                writer.writerow(row)
+                if index % REPORT_EXPORT_CHUNK_SIZE == 0:
+                    yield flush()
             writer.writerow([])
 
-        output.seek(0)
-        return output.getvalue()
+        yield flush()
+
+    def generate_csv(self):
+        """Creates CSV report with savings plan names from t.saving_plan"""
+        return "".join(self.iter_csv())
+
+    @staticmethod
+    def _section_table_style(color):
+        """Table style shared by every chunk of a report section"""
+        return TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor(color)),
+                ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                ("FONTSIZE", (0, 0), (-1, -1), 9),
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+                (
+                    "BACKGROUND",
+                    (0, 1),
+                    (-1, -1),
+                    colors.HexColor("#F9FAFB"),
+                ),
+                ("TEXTCOLOR", (0, 1), (-1, -1), colors.black),
+                ("ALIGN", (2, 1), (2, -1), "RIGHT"),
+                ("BOX", (0, 0), (-1, -1), 1, colors.black),
+                ("PADDING", (0, 0), (-1, -1), 4),
+            ]
+        )
+
+    def iter_section_tables(self, section, style):
+        """Yields fixed-size Tables for a section so layout never splits huge tables"""
+        header = ["Date", "Category/Savings Plan", "Amount", "Description"]
+        rows = self.iter_section_rows(section)
+        while True:
+            chunk = list(islice(rows, REPORT_PDF_TABLE_ROWS))
+            if not chunk:
+                return
+            table = Table(
+                [header] + chunk,
+                colWidths=[1.5 * inch, 1.5 * inch, 1 * inch, 2 * inch],
+                repeatRows=1,
+            )
+            table.setStyle(style)
+            yield table
 
     def generate_pdf(self):
-        """Creates PDF report with savings plan names from t.saving_plan"""
-        buffer = io.BytesIO()
+        """Creates PDF report, rendered through a temporary file"""
+        with tempfile.TemporaryFile() as output:
+            self.write_pdf(output)
+            output.seek(0)
+            return output.read()
+
+    def write_pdf(self, output):
+        """Renders the PDF report into a file path or binary file object"""
         doc = SimpleDocTemplate(
-            buffer,
+            output,
             pagesize=letter,
             topMargin=0.5 * inch,
             bottomMargin=0.5 * inch,
@@ -178,66 +294,21 @@ class TransactionReport:
         elements.append(summary_table)
         elements.append(Spacer(1, 0.25 * inch))
 
-        for title, transactions, color in [
-            ("Credit Transactions (Categorized)", self.categorized_credits, "#27AE60"),
-            ("Debit Transactions (Categorized)", self.categorized_debits, "#E74C3C"),
-            ("Savings Plan Deposits", self.savings_plans, "#2980B9"),
+        for title, section, color in [
+            ("Credit Transactions (Categorized)", SECTION_CREDITS, "#27AE60"),
+            ("Debit Transactions (Categorized)", SECTION_DEBITS, "#E74C3C"),
+            ("Savings Plan Deposits", SECTION_SAVINGS, "#2980B9"),
         ]:
-            if transactions:
+            style = self._section_table_style(color)
+            tables = self.iter_section_tables(section, style)
+            first_table = next(tables, None)
+            if first_table:
                 elements.append(Paragraph(title, subheader_style))
-
-                data = [["Date", "Category/Savings Plan", "Amount", "Description"]]
-                for t in transactions:
-                    # Use t.saving_plan for savings plan name, fall back to "Unnamed" if not available
-                    savings_name = (
-                        t.saving_plan.name
-                        if (
-                            not t.category
-                            and hasattr(t, "saving_plan")
-                            and t.saving_plan
-                        )
-                        else "Unnamed Savings Plan"
-                    )
-                    data.append(
-                        [
-                            t.transaction_at.strftime("%Y-%m-%d"),
-                            t.category.name if t.category else savings_name,
-                            f"{float(t.amount):.2f}",  # No rupee symbol
-                            t.description or "No description",
-                        ]
-                    )
-
-                t = Table(data, colWidths=[1.5 * inch, 1.5 * inch, 1 * inch, 2 * inch])
-                t.setStyle(
-                    TableStyle(
-                        [
-                            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor(color)),
-                            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-                            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                            ("FONTSIZE", (0, 0), (-1, -1), 9),
-                            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                            (
-                                "BACKGROUND",
-                                (0, 1),
-                                (-1, -1),
-                                colors.HexColor("#F9FAFB"),
-                            ),
-                            ("TEXTCOLOR", (0, 1), (-1, -1), colors.black),
-                            ("ALIGN", (2, 1), (2, -1), "RIGHT"),
-                            ("BOX", (0, 0), (-1, -1), 1, colors.black),
-                            ("PADDING", (0, 0), (-1, -1), 4),
-                        ]
-                    )
-                )
-                elements.append(t)
+                elements.append(first_table)
+                elements.extend(tables)
                 elements.append(Spacer(1, 0.2 * inch))
 
         doc.build(elements)
-        pdf_content = buffer.getvalue()
-        buffer.close()
-        return pdf_content
 
 
 @celery.task(bind=True)
@@ -247,17 +318,11 @@ def email_transaction_history(self, user_id, email, start_date, end_date, file_f
         if not user:
             raise ValueError(f"User not found with id {user_id}")
 
-        transactions = Transaction.query.filter(
-            Transaction.user_id == user_id,
-            Transaction.transaction_at.between(start_date, end_date),
-            Transaction.is_deleted == False,
-        ).all()
+        report = TransactionReport(user_id, start_date, end_date)
 
-        if not transactions:
+        if not report.has_transactions():
             return {"status": "error", "message": "No transactions found"}
 
-        report = TransactionReport(start_date, end_date, transactions)
-
         if file_format.lower() == "csv":
             report_data = report.generate_csv()
             mime_type = "text/csv"
@@ -289,3 +354,66 @@ def email_transaction_history(self, user_id, email, start_date, end_date, file_f
     except Exception as e:
         current_app.logger.error(f"Failed to send transaction report: {str(e)}")
         raise self.retry(exc=e, countdown=60 * 5)
+
+
+@celery.task(name="render_report_job")
+def render_report_job(job_id):
+    """Render a report job's artifact into report storage."""
+    # Claim the job so a duplicate delivery does not render it twice
+    claimed = ReportJob.query.filter(
+        ReportJob.id == job_id, ReportJob.status == ReportJobStatus.PENDING
+    ).update(
+        {"status": ReportJobStatus.RUNNING, "updated_at": get_utc_now()},
+        synchronize_session=False,
+    )
+    db.session.commit()
+    if not claimed:
+        return False
+
+    job = ReportJob.query.get(job_id)
+    artifact_name = ReportJobService.artifact_name(job)
+    try:
+        report = TransactionReport(job.user_id, job.start_date, job.end_date)
+        with get_report_storage().open_write(artifact_name) as output:
+            if job.file_format == "pdf":
+                report.write_pdf(output)
+            else:
+                for chunk in report.iter_csv():
+                    output.write(chunk.encode("utf-8"))
+
+        # A job failed as stale meanwhile keeps its status
+        completed = _finish_job(
+            job_id,
+            status=ReportJobStatus.COMPLETED,
+            artifact_path=artifact_name,
+            completed_at=get_utc_now(),
+        )
+        if not completed:
+            get_report_storage().delete(artifact_name)
+        logger.info(f"Rendered report job {job_id}")
+        return bool(completed)
+
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Failed to render report job {job_id}: {str(e)}")
+        _finish_job(job_id, status=ReportJobStatus.FAILED, error=str(e)[:255])
+        return False
+
+
+def _finish_job(job_id, **values):
+    """Record the outcome of a job this worker is still running"""
+    finished = ReportJob.query.filter(
+        ReportJob.id == job_id, ReportJob.status == ReportJobStatus.RUNNING
+    ).update(values, synchronize_session=False)
+    db.session.commit()
+    return finished
+
+
+@celery.task(name="cleanup_report_jobs")
+def cleanup_report_jobs():
+    """Fail abandoned report jobs and delete expired report artifacts."""
+    stale = ReportJobService.fail_stale_jobs()
+    db.session.commit()
+    removed = ReportJobService.remove_expired_artifacts()
+    logger.info(f"Failed {stale} stale report jobs, removed {removed} artifacts")
+    return removed
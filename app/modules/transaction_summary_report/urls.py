@@ -1,16 +1,21 @@
 from flask import Blueprint
 from flask_restful import Api
+from app.core.representations import use_fast_json
 from app.modules.transaction_summary_report.resources import (
     TransactionReportResource,
     TrendsReportResource,
     EmailTransactionReportResource,
+    DownloadTransactionReportResource,
+    ReportJobListResource,
+    ReportJobResource,
+    ReportJobDownloadResource,
 )
 
 # Create a Blueprint for transaction reports
 transaction_reports_bp = Blueprint("transaction-reports", __name__)
 
 # Create an API instance
-transaction_reports_api = Api(transaction_reports_bp)
+transaction_reports_api = use_fast_json(Api(transaction_reports_bp))
 
 # Register resources with the API
 transaction_reports_api.add_resource(
@@ -22,6 +27,22 @@ transaction_reports_api.add_resource(
 transaction_reports_api.add_resource(
     EmailTransactionReportResource, "/export", endpoint="emailtransactionreportresource"
 )
+transaction_reports_api.add_resource(
+    DownloadTransactionReportResource,
+    "/download",
+    endpoint="downloadtransactionreportresource",
+)
+transaction_reports_api.add_resource(
+    ReportJobListResource, "/jobs", endpoint="reportjoblistresource"
+)
+transaction_reports_api.add_resource(
+    ReportJobResource, "/jobs/<job_id>", endpoint="reportjobresource"
+)
+transaction_reports_api.add_resource(
+    ReportJobDownloadResource,
+    "/jobs/<job_id>/download",
+    endpoint="reportjobdownloadresource",
+)
 
 
 # Function to initialize routes
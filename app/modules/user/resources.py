@@ -21,6 +21,7 @@ from app.core.permissions import (
     admin_only,
     prevent_child_creation,
     admin_or_self,
+    PermissionCache,
 )
 from app.core.decorators import validate_json_request
 from app.core.authentication import authenticated_user
@@ -110,6 +111,7 @@ class UserResource(Resource):
         user_delete_schema.load(get_json_data())
         target_user.is_deleted = True
         db.session.commit()
+        PermissionCache.evict_user(target_user.id)
         delete_associated_data.delay(target_user.id)
         logger.info(f"User account soft deleted successfully: {user_id}")
         return {}, 204
@@ -6,6 +6,7 @@ from app.core.logger import logger
 from flask import abort
 from marshmallow import ValidationError
 from app.modules.auth.models import ActiveAccessToken
+from app.core.tokens import AccessTokenCache
 from app.modules.user.tasks import send_email_change_otp_pair
 from app.core.constants import EmailChangeConstants
 from app.config import (
@@ -41,6 +42,7 @@ class UserService:
         # Delete the tokens
         for token in tokens_to_delete:
             db.session.delete(token)
+            AccessTokenCache.invalidate(token.token)
 
         # No need to commit here - this should be part of a larger transaction
 
@@ -5,11 +5,13 @@ from app.core.logger import logger
 from app.core.mail import send_email
 from app.modules.user.models import User, UserRelationship
 from app.modules.category.models import Category
-from app.modules.transaction.models import Transaction
+from app.modules.transaction.models import Transaction, TransactionRollup
 from app.extensions import db
 from app.modules.budget.models import Budget
 from app.modules.recurring_transaction.models import RecurringTransaction
 from app.modules.saving_plan.models import SavingPlan
+from app.core.permissions import PermissionCache
+from app.modules.transaction_summary_report.services import ReportCache
 
 # Get configuration from environment variables
 CURRENT_EMAIL_TEMPLATE_ID = os.environ.get("CURRENT_EMAIL_TEMPLATE_ID")
@@ -110,6 +112,7 @@ def delete_associated_data(self, user_id):
             models_to_delete = [
                 Category,
                 Transaction,
+                TransactionRollup,
                 Budget,
                 RecurringTransaction,
                 SavingPlan,
@@ -133,6 +136,8 @@ def delete_associated_data(self, user_id):
                 {"is_deleted": True}
             )
         db.session.commit()
+        PermissionCache.evict_user(user_id, *([child.id] if child else []))
+        ReportCache.bump(user_id, *([child.id] if child else []))
         logger.info(f"Deleted associated data for user {user}")
         return True
 
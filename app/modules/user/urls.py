@@ -1,5 +1,6 @@
 from flask import Blueprint
 from flask_restful import Api
+from app.core.representations import use_fast_json
 from app.modules.user.resources import (
     UserListResource,
     UserResource,
@@ -12,7 +13,7 @@ from app.modules.auth.resources import ChildUserResource
 
 # Create a blueprint for the users module
 users_bp = Blueprint("users", __name__)
-users_api = Api(users_bp)
+users_api = use_fast_json(Api(users_bp))
 
 
 # Add resources to the API
@@ -0,0 +1,89 @@
+"""add transaction hot path indexes
+
+Revision ID: 9620928c7752
+Revises: 17716ed2fa20
+Create Date: 2025-03-24 11:02:14.418305
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "9620928c7752"
+down_revision = "17716ed2fa20"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("transactions", schema=None) as batch_op:
+        # Reports, exports and recurring processing filter by user and date range
+        batch_op.create_index(
+            "ix_transactions_user_id_transaction_at",
+            ["user_id", "transaction_at"],
+            unique=False,
+            postgresql_where=sa.text("NOT is_deleted"),
+        )
+        # Transaction listing is ordered by created_at per user
+        batch_op.create_index(
+            "ix_transactions_user_id_created_at",
+            ["user_id", "created_at"],
+            unique=False,
+            postgresql_where=sa.text("NOT is_deleted"),
+        )
+        # Budget spending and per-category report aggregates
+        batch_op.create_index(
+            "ix_transactions_user_id_category_id_type_transaction_at",
+            ["user_id", "category_id", "type", "transaction_at"],
+            unique=False,
+            postgresql_where=sa.text("NOT is_deleted"),
+        )
+        # Saving plan progress and deadline sweeps
+        batch_op.create_index(
+            "ix_transactions_saving_plan_id_transaction_at",
+            ["saving_plan_id", "transaction_at"],
+            unique=False,
+            postgresql_where=sa.text("saving_plan_id IS NOT NULL AND NOT is_deleted"),
+        )
+        # Category deletion checks look up transactions by category only
+        batch_op.create_index(
+            "ix_transactions_category_id",
+            ["category_id"],
+            unique=False,
+            postgresql_where=sa.text("category_id IS NOT NULL AND NOT is_deleted"),
+        )
+
+    with op.batch_alter_table("budgets", schema=None) as batch_op:
+        # find_matching_budget and duplicate budget checks
+        batch_op.create_index(
+            "ix_budgets_user_id_category_id_year_month",
+            ["user_id", "category_id", "year", "month"],
+            unique=False,
+            postgresql_where=sa.text("NOT is_deleted"),
+        )
+
+    with op.batch_alter_table("recurring_transactions", schema=None) as batch_op:
+        # Due-set scan in process_recurring_transactions
+        batch_op.create_index(
+            "ix_recurring_transactions_next_transaction_at",
+            ["next_transaction_at"],
+            unique=False,
+            postgresql_where=sa.text("NOT is_deleted"),
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("recurring_transactions", schema=None) as batch_op:
+        batch_op.drop_index("ix_recurring_transactions_next_transaction_at")
+
+    with op.batch_alter_table("budgets", schema=None) as batch_op:
+        batch_op.drop_index("ix_budgets_user_id_category_id_year_month")
+
+    with op.batch_alter_table("transactions", schema=None) as batch_op:
+        batch_op.drop_index("ix_transactions_category_id")
+        batch_op.drop_index("ix_transactions_saving_plan_id_transaction_at")
+        batch_op.drop_index("ix_transactions_user_id_category_id_type_transaction_at")
+        batch_op.drop_index("ix_transactions_user_id_created_at")
+        batch_op.drop_index("ix_transactions_user_id_transaction_at")
@@ -0,0 +1,79 @@
+"""add transaction rollups
+
+Revision ID: b3e1c5d2a7f4
+Revises: 9620928c7752
+Create Date: 2025-03-25 09:41:37.120954
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "b3e1c5d2a7f4"
+down_revision = "9620928c7752"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "transaction_rollups",
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Integer(), nullable=False),
+        sa.Column(
+            "type",
+            postgresql.ENUM("CREDIT", "DEBIT", name="transactiontype", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("total", sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("category_id", sa.UUID(), nullable=True),
+        sa.Column("saving_plan_id", sa.UUID(), nullable=True),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("is_deleted", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["saving_plan_id"], ["saving_plans.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("transaction_rollups", schema=None) as batch_op:
+        batch_op.create_index(
+            "uq_transaction_rollups_bucket",
+            ["user_id", "year", "month", "category_id", "saving_plan_id", "type"],
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        )
+
+    # Backfill from existing transactions
+    op.execute(
+        """
+        INSERT INTO transaction_rollups (
+            id, user_id, year, month, category_id, saving_plan_id, type,
+            total, count, created_at, updated_at, is_deleted
+        )
+        SELECT
+            gen_random_uuid(), user_id,
+            EXTRACT(YEAR FROM transaction_at)::int,
+            EXTRACT(MONTH FROM transaction_at)::int,
+            category_id, saving_plan_id, type,
+            SUM(amount), COUNT(id), now(), now(), false
+        FROM transactions
+        WHERE NOT is_deleted
+        GROUP BY 2, 3, 4, 5, 6, 7
+        """
+    )
+
+
+def downgrade():
+    with op.batch_alter_table("transaction_rollups", schema=None) as batch_op:
+        batch_op.drop_index("uq_transaction_rollups_bucket")
+
+    op.drop_table("transaction_rollups")
@@ -0,0 +1,59 @@
+"""add report jobs
+
+Revision ID: c4d2e8f1a9b3
+Revises: b3e1c5d2a7f4
+Create Date: 2025-03-27 14:12:08.503116
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c4d2e8f1a9b3"
+down_revision = "b3e1c5d2a7f4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "report_jobs",
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=False),
+        sa.Column("file_format", sa.String(length=10), nullable=False),
+        sa.Column("data_version", sa.String(length=32), nullable=True),
+        sa.Column(
+            "status",
+            sa.Enum(
+                "PENDING", "RUNNING", "COMPLETED", "FAILED", name="reportjobstatus"
+            ),
+            nullable=False,
+        ),
+        sa.Column("artifact_path", sa.String(length=255), nullable=True),
+        sa.Column("error", sa.String(length=255), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("is_deleted", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("report_jobs", schema=None) as batch_op:
+        batch_op.create_index(
+            "uq_report_jobs_active",
+            ["user_id", "start_date", "end_date", "file_format"],
+            unique=True,
+            postgresql_where=sa.text("status IN ('PENDING', 'RUNNING')"),
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("report_jobs", schema=None) as batch_op:
+        batch_op.drop_index("uq_report_jobs_active")
+
+    op.drop_table("report_jobs")
+    sa.Enum(name="reportjobstatus").drop(op.get_bind(), checkfirst=True)
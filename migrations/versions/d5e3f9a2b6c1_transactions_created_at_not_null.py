@@ -0,0 +1,37 @@
+"""transactions created_at not null
+
+Revision ID: d5e3f9a2b6c1
+Revises: c4d2e8f1a9b3
+Create Date: 2025-03-28 10:05:42.881203
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d5e3f9a2b6c1"
+down_revision = "c4d2e8f1a9b3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Cursor pagination orders by created_at; backfill rows missing it
+    op.execute(
+        """
+        UPDATE transactions
+        SET created_at = COALESCE(updated_at, transaction_at)
+        WHERE created_at IS NULL
+        """
+    )
+    with op.batch_alter_table("transactions", schema=None) as batch_op:
+        batch_op.alter_column(
+            "created_at", existing_type=sa.DateTime(), nullable=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("transactions", schema=None) as batch_op:
+        batch_op.alter_column("created_at", existing_type=sa.DateTime(), nullable=True)
@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from app import create_app
+from app.modules.transaction.services import TransactionRollupService
+
+
+def rebuild_transaction_rollups(user_id=None):
+    """Recompute monthly transaction rollups from the transactions table"""
+
+    # Create Flask app context
+    app = create_app()
+
+    with app.app_context():
+        try:
+            TransactionRollupService.rebuild(user_id)
+            print(f"Transaction rollups rebuilt for {user_id or 'all users'}")
+            return True
+
+        except Exception as e:
+            print(f"Error rebuilding transaction rollups: {str(e)}")
+            return False
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Rebuild monthly transaction rollups (backfill or drift repair)"
+    )
+    parser.add_argument(
+        "--user-id", help="Only rebuild rollups for this user (default: all users)"
+    )
+
+    args = parser.parse_args()
+
+    rebuild_transaction_rollups(args.user_id)
@@ -0,0 +1,9 @@
+# Import every model so relationship() names resolve when a test builds one
+from app.modules.auth import models as auth_models  # noqa: F401
+from app.modules.budget import models as budget_models  # noqa: F401
+from app.modules.category import models as category_models  # noqa: F401
+from app.modules.recurring_transaction import models as recurring_models  # noqa: F401
+from app.modules.saving_plan import models as saving_plan_models  # noqa: F401
+from app.modules.transaction import models as transaction_models  # noqa: F401
+from app.modules.transaction_summary_report import models as report_models  # noqa: F401
+from app.modules.user import models as user_models  # noqa: F401
@@ -0,0 +1,120 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.constants import Frequency, TransactionType
+from app.modules.recurring_transaction.models import RecurringTransaction
+
+RULES_PER_FREQUENCY = 2000
+
+# How far past next_transaction_at the run may look, per frequency
+HORIZONS = {
+    Frequency.DAILY: timedelta(days=120),
+    Frequency.WEEKLY: timedelta(days=3 * 365),
+    Frequency.MONTHLY: timedelta(days=12 * 365),
+    Frequency.YEARLY: timedelta(days=30 * 365),
+}
+
+
+def _stepped_run_dates(rule, until):
+    """Run dates produced by stepping get_next_run_date one tick at a time"""
+    run_dates = []
+    current_date = rule.next_transaction_at
+    while current_date <= until and (
+        rule.ends_at is None or current_date <= rule.ends_at
+    ):
+        run_dates.append(current_date)
+        current_date = rule.get_next_run_date(current_date)
+    return run_dates
+
+
+def _random_datetime(rng, start, span):
+    return start + timedelta(seconds=rng.randrange(int(span.total_seconds())))
+
+
+def _random_rule(rng, frequency):
+    starts_at = _random_datetime(rng, datetime(2016, 1, 1), timedelta(days=10 * 365))
+    if rng.random() < 0.2:
+        # Month ends and leap days are where the calendar rules differ
+        starts_at = _edge_start(rng, starts_at)
+
+    rule = RecurringTransaction(
+        amount=10,
+        type=TransactionType.DEBIT,
+        frequency=frequency,
+        starts_at=starts_at,
+        next_transaction_at=starts_at,
+    )
+    # Start from a real schedule point some ticks after starts_at
+    for _ in range(rng.randrange(4)):
+        rule.next_transaction_at = rule.get_next_run_date(rule.next_transaction_at)
+
+    until = _random_datetime(rng, rule.next_transaction_at, HORIZONS[frequency])
+    if rng.random() < 0.1:
+        # Not due yet
+        until = rule.next_transaction_at - timedelta(seconds=rng.randrange(1, 86400))
+    if rng.random() < 0.4:
+        rule.ends_at = _random_datetime(
+            rng, rule.starts_at, HORIZONS[frequency] + timedelta(days=365)
+        )
+    return rule, until
+
+
+def _edge_start(rng, starts_at):
+    """Move a start onto a February 29th or a month end"""
+    if rng.random() < 0.5:
+        return starts_at.replace(year=rng.choice([2016, 2020, 2024]), month=2, day=29)
+    month = rng.choice([1, 3, 5, 7, 8, 10, 12])
+    return starts_at.replace(month=month, day=31)
+
+
+@pytest.mark.parametrize("frequency", list(Frequency))
+def test_due_run_dates_match_stepping(frequency):
+    rng = random.Random(f"run-dates-{frequency.value}")
+    for _ in range(RULES_PER_FREQUENCY):
+        rule, until = _random_rule(rng, frequency)
+        expected = _stepped_run_dates(rule, until)
+
+        assert rule.get_due_run_dates(until) == expected, (
+            f"starts_at={rule.starts_at} next={rule.next_transaction_at} "
+            f"ends_at={rule.ends_at} until={until}"
+        )
+
+
+def test_yearly_leap_day_falls_back_to_february_28th():
+    starts_at = datetime(2024, 2, 29, 9, 30)
+    rule = RecurringTransaction(
+        amount=10,
+        type=TransactionType.DEBIT,
+        frequency=Frequency.YEARLY,
+        starts_at=starts_at,
+        next_transaction_at=starts_at,
+    )
+
+    assert rule.get_due_run_dates(datetime(2029, 1, 1)) == [
+        datetime(2024, 2, 29, 9, 30),
+        datetime(2025, 2, 28, 9, 30),
+        datetime(2026, 2, 28, 9, 30),
+        datetime(2027, 2, 28, 9, 30),
+        datetime(2028, 2, 28, 9, 30),
+    ]
+
+
+def test_no_run_dates_past_ends_at():
+    starts_at = datetime(2024, 1, 31, 8, 0)
+    rule = RecurringTransaction(
+        amount=10,
+        type=TransactionType.DEBIT,
+        frequency=Frequency.MONTHLY,
+        starts_at=starts_at,
+        next_transaction_at=starts_at,
+        ends_at=datetime(2024, 4, 30, 8, 0),
+    )
+
+    assert rule.get_due_run_dates(datetime(2025, 1, 1)) == [
+        datetime(2024, 1, 31, 8, 0),
+        datetime(2024, 2, 29, 8, 0),
+        datetime(2024, 3, 31, 8, 0),
+        datetime(2024, 4, 30, 8, 0),
+    ]
@@ -0,0 +1,248 @@
+import random
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from flask import Flask
+from sqlalchemy import func
+
+from app.core.constants import Frequency, TransactionType
+from app.extensions import db
+from app.modules.category.models import Category
+from app.modules.saving_plan.models import SavingPlan
+from app.modules.transaction.models import Transaction
+from app.modules.transaction_summary_report.services import TransactionReportService
+from app.modules.user.models import User
+
+# Ranges that do not start on the 1st are served from the transactions
+# table, the path the per-category implementation covered
+RANGES = [
+    (date(2024, 1, 2), date(2024, 12, 31)),
+    (date(2024, 3, 15), date(2024, 4, 14)),
+    (date(2024, 6, 10), date(2024, 6, 10)),
+    (date(2023, 12, 20), date(2024, 2, 5)),
+]
+
+
+def per_category_trends_report(user_id, start_date, end_date):
+    """The per-category implementation the grouped report replaced"""
+    base_query = Transaction.query.filter(
+        Transaction.user_id == user_id,
+        Transaction.transaction_at.between(start_date, end_date),
+        Transaction.is_deleted == False,
+    )
+
+    trends = {
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "total_credit": 0.0,
+        "total_debit": 0.0,
+        "categories": [],
+        "savings_plan": [],
+    }
+
+    for t_type in TransactionType:
+        total = float(
+            base_query.filter(Transaction.type == t_type.value)
+            .outerjoin(SavingPlan)
+            .filter(SavingPlan.id == None)
+            .with_entities(func.sum(Transaction.amount))
+            .scalar()
+            or 0
+        )
+        if t_type == TransactionType.CREDIT:
+            trends["total_credit"] = total
+        else:
+            trends["total_debit"] = total
+
+    categories = (
+        Category.query.join(Transaction)
+        .filter(Transaction.user_id == user_id, Category.is_deleted == False)
+        .distinct()
+        .all()
+    )
+
+    category_data = []
+    for category in categories:
+        credit_amount = float(
+            base_query.filter(
+                Transaction.type == TransactionType.CREDIT.value,
+                Transaction.category_id == category.id,
+            )
+            .outerjoin(SavingPlan)
+            .filter(SavingPlan.id == None)
+            .with_entities(func.sum(Transaction.amount))
+            .scalar()
+            or 0
+        )
+
+        debit_amount = float(
+            base_query.filter(
+                Transaction.type == TransactionType.DEBIT.value,
+                Transaction.category_id == category.id,
+            )
+            .outerjoin(SavingPlan)
+            .filter(SavingPlan.id == None)
+            .with_entities(func.sum(Transaction.amount))
+            .scalar()
+            or 0
+        )
+
+        if credit_amount > 0 or debit_amount > 0:
+            category_data.append(
+                {
+                    "id": str(category.id),
+                    "name": category.name,
+                    "credit": round(credit_amount, 2),
+                    "debit": round(debit_amount, 2),
+                    "credit_percentage": round(
+                        (
+                            (credit_amount / trends["total_credit"] * 100)
+                            if trends["total_credit"]
+                            else 0
+                        ),
+                        2,
+                    ),
+                    "debit_percentage": round(
+                        (
+                            (debit_amount / trends["total_debit"] * 100)
+                            if trends["total_debit"]
+                            else 0
+                        ),
+                        2,
+                    ),
+                }
+            )
+
+    trends["categories"] = category_data
+
+    savings_total = float(
+        base_query.join(SavingPlan)
+        .filter(SavingPlan.is_deleted == False)
+        .with_entities(func.sum(Transaction.amount))
+        .scalar()
+        or 0
+    )
+
+    saving_plans = (
+        SavingPlan.query.join(Transaction)
+        .filter(Transaction.user_id == user_id, SavingPlan.is_deleted == False)
+        .group_by(SavingPlan.id, SavingPlan.name)
+        .with_entities(
+            SavingPlan.id,
+            SavingPlan.name,
+            func.sum(Transaction.amount).label("total"),
+        )
+        .all()
+    )
+
+    trends["savings_plan"] = [
+        {
+            "id": str(plan.id),
+            "name": plan.name,
+            "amount": float(plan.total),
+            "percentage": round(
+                (float(plan.total) / savings_total * 100) if savings_total else 0, 2
+            ),
+        }
+        for plan in saving_plans
+    ]
+
+    return trends
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def _user(name):
+    user = User(username=name, email=f"{name}@example.com", password="secret")
+    db.session.add(user)
+    db.session.flush()
+    return user
+
+
+def _seed(rng, user):
+    """Random categories, saving plans and transactions for one user"""
+    categories = [
+        Category(name=f"Category {index}", user_id=user.id, is_deleted=index % 7 == 0)
+        for index in range(15)
+    ]
+    saving_plans = [
+        SavingPlan(
+            name=f"Plan {index}",
+            amount=Decimal("5000"),
+            original_deadline=date(2025, 1, 1),
+            current_deadline=date(2025, 1, 1),
+            frequency=Frequency.MONTHLY,
+            user_id=user.id,
+            is_deleted=index == 2,
+        )
+        for index in range(4)
+    ]
+    db.session.add_all(categories + saving_plans)
+    db.session.flush()
+
+    for _ in range(600):
+        transaction = Transaction(
+            id=uuid.uuid4(),
+            user_id=user.id,
+            type=rng.choice(list(TransactionType)),
+            amount=Decimal(rng.randrange(1, 500000)) / 100,
+            transaction_at=datetime(2023, 12, 1)
+            + timedelta(minutes=rng.randrange(400 * 24 * 60)),
+            is_deleted=rng.random() < 0.05,
+        )
+        target = rng.random()
+        if target < 0.15:
+            transaction.saving_plan_id = rng.choice(saving_plans).id
+        elif target < 0.9:
+            transaction.category_id = rng.choice(categories).id
+        db.session.add(transaction)
+    db.session.commit()
+
+
+@pytest.mark.parametrize("start_date,end_date", RANGES)
+def test_trends_report_matches_per_category_implementation(app, start_date, end_date):
+    rng = random.Random(f"trends-{start_date}")
+    user = _user("reporter")
+    # Another user's data must not leak into the report
+    _seed(rng, _user("neighbour"))
+    _seed(rng, user)
+
+    expected = per_category_trends_report(user.id, start_date, end_date)
+    report = TransactionReportService.get_trends_report(user.id, start_date, end_date)
+
+    assert report["total_credit"] == pytest.approx(expected["total_credit"])
+    assert report["total_debit"] == pytest.approx(expected["total_debit"])
+
+    categories = {category["id"]: category for category in report["categories"]}
+    assert set(categories) == {category["id"] for category in expected["categories"]}
+    for category in expected["categories"]:
+        actual = categories[category["id"]]
+        assert actual["name"] == category["name"]
+        assert actual["credit"] == pytest.approx(category["credit"], abs=0.005)
+        assert actual["debit"] == pytest.approx(category["debit"], abs=0.005)
+        assert actual["credit_percentage"] == pytest.approx(
+            category["credit_percentage"], abs=0.005
+        )
+        assert actual["debit_percentage"] == pytest.approx(
+            category["debit_percentage"], abs=0.005
+        )
+
+    plans = {plan["id"]: plan for plan in report["savings_plan"]}
+    assert set(plans) == {plan["id"] for plan in expected["savings_plan"]}
+    for plan in expected["savings_plan"]:
+        assert plans[plan["id"]]["amount"] == pytest.approx(plan["amount"])
+        assert plans[plan["id"]]["percentage"] == pytest.approx(
+            plan["percentage"], abs=0.005
+        )